@@ -2,7 +2,11 @@ from .ship import Ship
 from .game_board import GameBoard
 from .game_screen import GameScreen
 from .menu_screen import MenuScreen
+from .event_bus import EventBus
+from .latency_monitor import LatencyMonitor
+from .latency_hud import LatencyHud
 from .network_manager import NetworkManager
+from .network_thread import NetworkThread
 from .game_over_screen import GameOverScreen
 from .battleship_client import BattleshipClient
 
@@ -12,7 +16,11 @@ __all__ = [
     'Colors',
     'GameScreen',
     'MenuScreen',
+    'EventBus',
+    'LatencyMonitor',
+    'LatencyHud',
     'NetworkManager',
+    'NetworkThread',
     'GameOverScreen',
     'BattleshipClient'
 ]
\ No newline at end of file
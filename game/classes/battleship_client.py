@@ -1,7 +1,7 @@
 import pygame
 import sys
 import os
-import asyncio
+import queue
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from constants import *
@@ -14,14 +14,19 @@ BACKGROUND_MUSIC_FILE = 'background.mp3'
 from .menu_screen import MenuScreen
 from .game_screen import GameScreen
 from .network_manager import NetworkManager
+from .client_identity import load_client_id
 from .game_over_screen import GameOverScreen
+from .network_thread import NetworkThread
+from .event_bus import EventBus
+from .latency_hud import LatencyHud
 
 class BattleshipClient:
     def __init__(self):
-        self.loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self.loop)
+        self.network = NetworkThread().start()
+        self.loop = self.network.loop
         self.server_host = DEFAULT_SERVER_HOST
         self.server_port = DEFAULT_SERVER_PORT
+        self.unix_path = None
         self._initialize_pygame_systems()
         self._setup_window_configuration()
         self._initialize_game_state()
@@ -29,11 +34,13 @@ class BattleshipClient:
         self._setup_audio_system()
     
 
-    def set_connection_params(self, host=None, port=None):
+    def set_connection_params(self, host=None, port=None, unix_path=None):
         if host:
             self.server_host = host
         if port:
             self.server_port = port
+        if unix_path:
+            self.unix_path = unix_path
 
     def _initialize_pygame_systems(self):
         pygame.init()
@@ -72,9 +79,16 @@ class BattleshipClient:
         self.running = True
     
     def _initialize_screens_and_managers(self):
-        self.network_manager = NetworkManager()
+        self.network_manager = NetworkManager(client_id=load_client_id())
+        self.network_events = queue.SimpleQueue()
+        self.ui_events = EventBus(NETWORK_EVENTS)
+        self._relay_network_events()
+        self.leaderboard = None
+        self.latency_hud = LatencyHud(self.network_manager.latency)
         self.menu_screen = MenuScreen(self.screen)
+        self.menu_screen.latency_hud = self.latency_hud
         self.game_screen = GameScreen(self.screen, self.network_manager, self.loop)
+        self.game_screen.latency_hud = self.latency_hud
         self.game_over_screen = None
         self.setup_network_callbacks()
     
@@ -98,19 +112,26 @@ class BattleshipClient:
     def run(self):
         try:
             while self.running:
-                self._process_tasks()
+                self._drain_network_events()
                 self._process_game_events()
-                self._check_connection_status()
                 self._render_current_state()
                 self._update_display_and_clock()
         finally:
             self._cleanup_and_exit()
     
-    def _process_tasks(self):
-        try:
-            self.loop.run_until_complete(asyncio.sleep(0))
-        except RuntimeError:
-            pass
+    def _relay_network_events(self):
+        # Corre en el hilo de red: solo encola, pygame y las pantallas se tocan al vaciar la cola.
+        for event_type in NETWORK_EVENTS:
+            self.network_manager.events.subscribe(
+                event_type, lambda *args, event_type=event_type: self.network_events.put((event_type, args)))
+
+    def _drain_network_events(self):
+        while True:
+            try:
+                event_type, args = self.network_events.get_nowait()
+            except queue.Empty:
+                return
+            self.ui_events.publish(event_type, *args)
     
     def _process_game_events(self):
         events = pygame.event.get()
@@ -123,6 +144,8 @@ class BattleshipClient:
             self.running = False
         elif event.type == pygame.VIDEORESIZE:
             self._handle_window_resize(event)
+        elif event.type == pygame.KEYDOWN and event.key == KEY_TOGGLE_LATENCY_HUD:
+            self.latency_hud.toggle()
     
     def _handle_window_resize(self, event):
         self._update_window_dimensions(event)
@@ -162,6 +185,7 @@ class BattleshipClient:
             'my_board_shots': self._get_my_board_shots_copy(),
             'enemy_sunk_ships': self.game_screen.enemy_sunk_ships.copy(),
             'enemy_sunk_ships_info': self.game_screen.enemy_sunk_ships_info.copy(),
+            'connection_notice': self.game_screen.connection_notice,
         }
     
     def _get_my_ships_copy(self):
@@ -181,6 +205,7 @@ class BattleshipClient:
     
     def _recreate_game_screen(self):
         self.game_screen = GameScreen(self.screen, self.network_manager, self.loop)
+        self.game_screen.latency_hud = self.latency_hud
     
     def _restore_game_state(self, saved_state):
         self.game_screen.game_phase = saved_state['game_phase']
@@ -192,10 +217,12 @@ class BattleshipClient:
         self.game_screen.my_board.shots = saved_state['my_board_shots']
         self.game_screen.enemy_sunk_ships = saved_state.get('enemy_sunk_ships', [])
         self.game_screen.enemy_sunk_ships_info = saved_state.get('enemy_sunk_ships_info', {})
+        self.game_screen.connection_notice = saved_state.get('connection_notice')
     
     def _recreate_other_screens(self):
         self.menu_screen = MenuScreen(self.screen)
-        self.setup_network_callbacks()
+        self.menu_screen.set_leaderboard(self.leaderboard)
+        self.menu_screen.latency_hud = self.latency_hud
         self._recreate_game_over_screen_if_needed()
     
     def _recreate_game_over_screen_if_needed(self):
@@ -217,35 +244,41 @@ class BattleshipClient:
     
     def _process_menu_action(self, action):
         if action == "connect":
-            self.loop.create_task(self._handle_connect_action())
+            self.network.submit(self._handle_connect_action())
         elif action == "start_game":
-            self.loop.create_task(self._handle_start_game_action())
+            self.network.submit(self._handle_start_game_action())
+        elif action == "play_vs_ai":
+            self.network.submit(self._handle_play_vs_ai_action())
         elif action == "toggle_music":
             self._handle_toggle_music_action()
     
     async def _handle_connect_action(self):
-        await self.connect_to_server(self.server_host, self.server_port)
+        if await self.connect_to_server(self.server_host, self.server_port):
+            await self.network_manager.request_leaderboard(MENU_LEADERBOARD_ROWS)
     
     def _attempt_server_connection(self, config):
         host, port = config['host'], config['port']
         return self.connect_to_server(host, port)
     
     async def connect_to_server(self, host, port):
-        return await self.network_manager.connect_to_server(host, port)
+        return await self.network_manager.connect_to_server(host, port, self.unix_path)
     
     async def _handle_start_game_action(self):
         await self.network_manager.start_game()
     
+    async def _handle_play_vs_ai_action(self):
+        await self.network_manager.play_vs_ai()
+    
     def _handle_toggle_music_action(self):
         self.menu_screen.toggle_music_mute()
     
     def _handle_game_over_events(self, event):
         action = self.game_over_screen.handle_event(event)
         if action == "accept" or self.game_over_screen.auto_return:
-            self.loop.create_task(self._handle_game_over_accept())
+            self._handle_game_over_accept()
     
-    async def _handle_game_over_accept(self):
-        await self._disconnect_after_game()
+    def _handle_game_over_accept(self):
+        self.network.submit(self._disconnect_after_game())
         self._reset_menu_state()
         self._restart_menu_music()
         self._return_to_menu()
@@ -269,16 +302,6 @@ class BattleshipClient:
         self.current_state = "menu"
         self.game_over_screen = None
     
-    def _check_connection_status(self):
-        if self._should_check_connection():
-            if not self.network_manager.connected:
-                self.on_server_disconnect()
-    
-    def _should_check_connection(self):
-        return (self.current_state != "menu" and 
-                hasattr(self.network_manager, 'connected') and
-                self.current_state in ["game", "game_over"])
-    
     def _render_current_state(self):
         if self.current_state == "menu":
             self._render_menu_state()
@@ -306,33 +329,47 @@ class BattleshipClient:
     
     def _cleanup_and_exit(self):
         pygame.mixer.music.stop()
-        
-        # Limpiar tareas asyncio pendientes
-        pending_tasks = [task for task in asyncio.all_tasks(self.loop) if not task.done()]
-        for task in pending_tasks:
-            task.cancel()
-        
-        # Cerrar el loop asyncio
-        if not self.loop.is_closed():
-            self.loop.close()
+        self.network.stop()
+        self.network_manager.tracer.close()
             
         pygame.mixer.quit()
         pygame.quit()
         sys.exit()
     
     def setup_network_callbacks(self):
-        self.network_manager.set_players_ready_callback(self.on_players_ready)
-        self.network_manager.set_game_start_callback(self.on_game_start)
-        self.network_manager.set_game_update_callback(self.on_game_update)
-        self.network_manager.set_shot_result_callback(self.on_shot_result)
-        self.network_manager.set_game_over_callback(self.on_game_over)
-        self.network_manager.set_server_disconnect_callback(self.on_server_disconnect)
+        # Los handlers leen self.menu_screen / self.game_screen al momento de
+        # llamarse, así que recrear pantallas al redimensionar no pide volver a suscribir.
+        # Se suscriben a ui_events: llegan desde la cola, ya en el hilo de pygame.
+        events = self.ui_events
+        events.subscribe(MESSAGE_TYPES['PLAYERS_READY'], self.on_players_ready)
+        events.subscribe(MESSAGE_TYPES['GAME_START'], self.on_game_start)
+        events.subscribe(MESSAGE_TYPES['GAME_UPDATE'], self.on_game_update)
+        events.subscribe(MESSAGE_TYPES['SHOT_RESULT'], self.on_shot_result)
+        events.subscribe(MESSAGE_TYPES['GAME_OVER'], self.on_game_over)
+        events.subscribe(SERVER_DISCONNECT_EVENT, self.on_server_disconnect)
+        events.subscribe(MESSAGE_TYPES['LEADERBOARD'], self.on_leaderboard)
+        events.subscribe(MESSAGE_TYPES['SHIPS_AUTO_PLACED'], self.on_ships_auto_placed)
+        events.subscribe(RECONNECTING_EVENT, self.on_reconnecting)
+        events.subscribe(MESSAGE_TYPES['RESUMED'], self.on_resumed)
     
     def on_players_ready(self, data):
         connected = data.get('connected_players', 0) > 0
         players_ready = data.get('players_ready', False)
         self.menu_screen.set_connection_status(connected, players_ready)
     
+    def on_leaderboard(self, data):
+        self.leaderboard = data
+        self.menu_screen.set_leaderboard(data)
+    
+    def on_ships_auto_placed(self, data):
+        self.game_screen.apply_server_fleet(data.get('ships', []))
+    
+    def on_reconnecting(self, data):
+        self.game_screen.set_connection_notice(GAME_TEXT['RECONNECTING'].format(data.get('attempt', 1)))
+    
+    def on_resumed(self, data):
+        self.game_screen.apply_server_snapshot(data)
+    
     def on_game_start(self, data):
         self._transition_audio_to_game()
         self._reset_game_state_safely("Error reseteando pantalla de juego")
@@ -397,8 +434,8 @@ class BattleshipClient:
         self._return_to_menu_after_disconnect()
     
     def _reset_network_manager_state(self):
-        self.network_manager.connected = False
-        self.network_manager.player_id = None
+        # El NetworkManager solo se modifica en el hilo de red; acá se pide el cierre.
+        self.network.submit(self.network_manager.disconnect())
     
     def _reset_menu_and_restart_music(self):
         self.menu_screen.set_connection_status(False, False)
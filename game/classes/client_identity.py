@@ -0,0 +1,30 @@
+import re
+import secrets
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import CLIENT_ID_FILE, CLIENT_ID_BYTES, CLIENT_ID_PATTERN, NETWORK_ENCODING
+
+
+def load_client_id(path: str = CLIENT_ID_FILE) -> str:
+    """Id fijo de esta instalación, con el que el servidor guarda estadísticas y rating.
+
+    Se genera la primera vez y queda en ``path``. Si el archivo no se puede
+    escribir, el id vale solo para esta ejecución.
+    """
+    try:
+        with open(path, encoding=NETWORK_ENCODING) as id_file:
+            client_id = id_file.read().strip()
+        if re.fullmatch(CLIENT_ID_PATTERN, client_id):
+            return client_id
+    except OSError:
+        pass
+
+    client_id = secrets.token_hex(CLIENT_ID_BYTES)
+    try:
+        with open(path, 'w', encoding=NETWORK_ENCODING) as id_file:
+            id_file.write(client_id)
+    except OSError:
+        pass
+    return client_id
@@ -0,0 +1,42 @@
+from typing import Callable, Any, Dict, Iterable, Tuple
+
+
+class EventBus:
+    """Varios suscriptores por tipo de evento, con la tabla armada de antemano.
+
+    Los tipos válidos se fijan al crear el bus: suscribirse a uno desconocido
+    falla en el momento en vez de quedar mudo. Cada tipo guarda una tupla de
+    callbacks que se reemplaza entera al suscribir o desuscribir, así
+    ``publish`` solo recorre la tupla (sin copiar ni crear nada por mensaje)
+    y un callback puede suscribir a otro mientras se publica.
+    """
+
+    def __init__(self, event_types: Iterable[str]):
+        self._subscribers: Dict[str, Tuple[Callable[..., Any], ...]] = {
+            event_type: () for event_type in event_types
+        }
+
+    def subscribe(self, event_type: str, callback: Callable[..., Any]) -> Callable[[], None]:
+        """Agrega ``callback`` (una sola vez) y devuelve la función para quitarlo."""
+        subscribers = self._subscribers_for(event_type)
+        if callback not in subscribers:
+            self._subscribers[event_type] = subscribers + (callback,)
+        return lambda: self.unsubscribe(event_type, callback)
+
+    def unsubscribe(self, event_type: str, callback: Callable[..., Any]) -> None:
+        subscribers = self._subscribers_for(event_type)
+        self._subscribers[event_type] = tuple(
+            subscriber for subscriber in subscribers if subscriber != callback
+        )
+
+    def publish(self, event_type: str, *args: Any) -> None:
+        for callback in self._subscribers[event_type]:
+            callback(*args)
+
+    def has_subscribers(self, event_type: str) -> bool:
+        return bool(self._subscribers[event_type])
+
+    def _subscribers_for(self, event_type: str) -> Tuple[Callable[..., Any], ...]:
+        if event_type not in self._subscribers:
+            raise ValueError(f"Tipo de evento desconocido: {event_type}")
+        return self._subscribers[event_type]
@@ -6,6 +6,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from constants import *
 
 from .ship import Ship
+from .placement_index import get_placement_index
 
 
 class GameBoard:
@@ -17,6 +18,7 @@ class GameBoard:
         self.width = board_size
         self.height = board_size
         self.cell_size = board_size // self.grid_size
+        self.placement_index = get_placement_index(self.grid_size)
         
         self._initialize_game_state()
         self._initialize_colors()
@@ -25,6 +27,7 @@ class GameBoard:
         self.grid = [['empty' for _ in range(self.grid_size)] for _ in range(self.grid_size)]
         self.ships = []
         self.shots = {}
+        self.pending_shots = {}
     
     def _initialize_colors(self):
         self.colors = {
@@ -45,6 +48,7 @@ class GameBoard:
             self._draw_all_ships(screen)
         
         self._draw_all_shots(screen)
+        self._draw_pending_shots(screen)
         self.draw_coordinates(screen)
     
     def _draw_water_cells(self, screen):
@@ -88,6 +92,54 @@ class GameBoard:
             elif result == 'miss':
                 self.draw_missile(screen, center_x, center_y, (255, 255, 255), 'miss')
     
+    def mark_pending_shot(self, x, y):
+        self.pending_shots[(x, y)] = pygame.time.get_ticks()
+    
+    def resolve_pending_shot(self, x, y):
+        return self.pending_shots.pop((x, y), None) is not None
+    
+    def expire_pending_shots(self, timeout_ms=PENDING_SHOT_TIMEOUT_MS):
+        now = pygame.time.get_ticks()
+        expired = [cell for cell, fired_at in self.pending_shots.items() if now - fired_at > timeout_ms]
+        for cell in expired:
+            del self.pending_shots[cell]
+        return expired
+    
+    def _draw_pending_shots(self, screen):
+        now = pygame.time.get_ticks()
+        for (shot_x, shot_y), fired_at in self.pending_shots.items():
+            center_x = self.x + shot_x * self.cell_size + self.cell_size // BOARD_DIVISION_FACTOR
+            center_y = self.y + shot_y * self.cell_size + self.cell_size // BOARD_DIVISION_FACTOR
+            elapsed = now - fired_at
+            
+            self._draw_pending_target(screen, center_x, center_y, elapsed)
+            fall_progress = min(1.0, elapsed / PENDING_SHOT_FALL_MS)
+            missile_y = center_y - int(self.cell_size * (1.0 - fall_progress))
+            self._draw_falling_missile(screen, center_x, missile_y)
+    
+    def _draw_pending_target(self, screen, center_x, center_y, elapsed):
+        pulse = (elapsed % PENDING_SHOT_PULSE_MS) / PENDING_SHOT_PULSE_MS
+        radius = int(self.cell_size * (0.25 + 0.2 * pulse))
+        pygame.draw.circle(screen, PENDING_SHOT_COLOR, (center_x, center_y), radius, PENDING_SHOT_RING_WIDTH)
+    
+    def _draw_falling_missile(self, screen, center_x, center_y):
+        scale_factor = self.cell_size / BASE_CELL_SIZE
+        body_width = int(MISSILE_BODY_WIDTH * scale_factor)
+        body_height = int(MISSILE_BODY_HEIGHT * scale_factor)
+        body_offset_x = int(MISSILE_BODY_OFFSET_X * scale_factor)
+        body_offset_y = int(MISSILE_BODY_OFFSET_Y * scale_factor)
+        tip_width = int(MISSILE_TIP_WIDTH * scale_factor)
+        tip_offset = int(MISSILE_TIP_OFFSET * scale_factor)
+        
+        body = pygame.Rect(center_x - body_offset_x, center_y - body_offset_y, body_width, body_height)
+        pygame.draw.ellipse(screen, PENDING_SHOT_MISSILE_COLOR, body)
+        # La punta mira hacia abajo: el misil todavía está cayendo.
+        pygame.draw.polygon(screen, PENDING_SHOT_COLOR, [
+            (center_x, center_y + tip_offset),
+            (center_x - tip_width, center_y + body_offset_y - tip_width),
+            (center_x + tip_width, center_y + body_offset_y - tip_width)
+        ])
+    
     def draw_missile(self, screen, center_x, center_y, color, shot_type):
         if shot_type == 'hit':
             self._draw_hit_missile(screen, center_x, center_y, color)
@@ -474,34 +526,18 @@ class GameBoard:
         return None
     
     def can_place_ship(self, ship_size, start_x, start_y, horizontal=True):
-        positions = self._generate_ship_positions(ship_size, start_x, start_y, horizontal)
+        mask = self.placement_index.placement(ship_size, start_x, start_y, horizontal)
         
-        if not positions:
+        if mask is None:
             return False
             
-        return self._check_positions_available(positions)
+        return not mask & self.occupied_mask()
     
-    def _generate_ship_positions(self, ship_size, start_x, start_y, horizontal):
-        positions = []
-        
-        for i in range(ship_size):
-            if horizontal:
-                x, y = start_x + i, start_y
-            else:
-                x, y = start_x, start_y + i
-            
-            if x >= self.grid_size or y >= self.grid_size:
-                return None
-            
-            positions.append((x, y))
-        return positions
-    
-    def _check_positions_available(self, positions):
-        for x, y in positions:
-            for ship in self.ships:
-                if (x, y) in ship.positions:
-                    return False
-        return True
+    def occupied_mask(self):
+        occupied = 0
+        for ship in self.ships:
+            occupied |= self.placement_index.mask_for(ship.positions)
+        return occupied
     
     def place_ship(self, ship_size, start_x, start_y, horizontal=True):
         if not self.can_place_ship(ship_size, start_x, start_y, horizontal):
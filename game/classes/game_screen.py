@@ -11,7 +11,7 @@ from constants import (SHIP_SIZES, FONT_SIZE_NORMAL, COLOR_WHITE, GAME_TITLE_SPA
                       GAME_PHASE_BATTLE, DEFAULT_SHIP_SIZE, SHIP_HORIZONTAL_DEFAULT, INITIAL_SHIP_INDEX,
                       PANEL_PADDING, COORD_SPACE, TITLE_SPACING, GAME_PANEL_ALPHA, MY_PANEL_COLOR,
                       ENEMY_PANEL_COLOR, PANEL_BORDER_WIDTH, OCEAN_COLOR_TOP, OCEAN_COLOR_BOTTOM,
-                      MOUSE_LEFT_BUTTON, MOUSE_RIGHT_BUTTON, KEY_ROTATE, GAME_TEXT,
+                      MOUSE_LEFT_BUTTON, MOUSE_RIGHT_BUTTON, KEY_ROTATE, KEY_AUTO_PLACE, GAME_TEXT,
                       SHIP_STATUS_COLORS, GAME_FONT_SIZES, SPECIAL_ATTACK_BUTTON_WIDTH, 
                       SPECIAL_ATTACK_BUTTON_HEIGHT, SPECIAL_ATTACK_BUTTON_MARGIN, 
                       SPECIAL_ATTACK_BUTTON_Y_OFFSET, COLOR_BUTTON_BOMB, COLOR_BUTTON_BOMB_HOVER,
@@ -22,6 +22,7 @@ from constants import (SHIP_SIZES, FONT_SIZE_NORMAL, COLOR_WHITE, GAME_TITLE_SPA
                       COLOR_BUTTON_SELECTED, COLOR_BUTTON_SELECTED_BORDER, BUTTON_SELECTED_BORDER_WIDTH,
                       COLOR_BUTTON_SELECTED_TEXT)
 from .game_board import GameBoard
+from .latency_hud import LatencyHud
 
 class GameScreen:
     def __init__(self, screen: pygame.Surface, network_manager: Optional[Any] = None, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
@@ -38,6 +39,7 @@ class GameScreen:
         self.height = screen.get_height()
         self.network_manager = network_manager
         self.loop = loop or asyncio.get_event_loop()
+        self.latency_hud: Optional[LatencyHud] = None
         
     def _calculate_board_dimensions(self) -> None:
         available_height = self.height - GAME_TITLE_SPACE - GAME_BOARD_TITLE_SPACE - GAME_INFO_SPACE
@@ -75,6 +77,7 @@ class GameScreen:
         self.air_strike_mode = False
         self.bombs_available = AVAILABLE_BOMBS
         self.air_strikes_available = AVAILABLE_AIR_STRIKES
+        self.connection_notice: Optional[str] = None
         
     def _initialize_ship_tracking(self) -> None:
         self.enemy_sunk_ships: List[str] = []
@@ -133,6 +136,8 @@ class GameScreen:
     def _handle_keyboard_event(self, event: pygame.event.Event) -> None:
         if event.key == KEY_ROTATE:
             self.ship_horizontal = not self.ship_horizontal
+        elif event.key == KEY_AUTO_PLACE and self._is_placement_phase():
+            self.auto_place_ships()
     
     def handle_left_click(self, mouse_pos: Tuple[int, int]) -> None:
         if self._is_placement_phase():
@@ -180,6 +185,67 @@ class GameScreen:
             self._setup_special_attack_buttons()
             self.send_ships_to_server()
             
+    def auto_place_ships(self) -> None:
+        placement_index = self.my_board.placement_index
+        remaining_ships = self.ships_to_place[self.current_ship_index:]
+        
+        try:
+            fleet = placement_index.random_fleet(remaining_ships, occupied=self.my_board.occupied_mask())
+        except ValueError:
+            self.my_board.ships = []
+            self.current_ship_index = INITIAL_SHIP_INDEX
+            remaining_ships = self.ships_to_place
+            fleet = placement_index.random_fleet(remaining_ships)
+            
+        for mask in fleet:
+            self._place_positions(placement_index.positions(mask))
+            self._advance_ship_placement()
+            
+    def apply_server_fleet(self, ships: List[List[List[int]]]) -> None:
+        """Reemplaza la flota propia por la que el servidor colocó al vencer el plazo."""
+        self.my_board.ships = []
+        for positions in ships:
+            self._place_positions([tuple(cell) for cell in positions])
+        self.current_ship_index = len(self.ships_to_place)
+        self.game_phase = GAME_PHASE_WAITING_BATTLE
+        self._setup_special_attack_buttons()
+        
+    def apply_server_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        """Rehace los dos tableros con lo que el servidor mandó al reanudar la partida.
+
+        Si la flota todavía no había llegado al servidor se conserva la
+        colocación local; las bombas y ataques aéreos usados no cambian.
+        """
+        self.connection_notice = None
+        if not snapshot.get('ships_placed'):
+            return
+            
+        self.my_board = GameBoard(self.my_board.x, self.my_board.y, self.my_board.width)
+        self.enemy_board = GameBoard(self.enemy_board.x, self.enemy_board.y, self.enemy_board.width)
+        self._initialize_ship_tracking()
+        self.apply_server_fleet(snapshot.get('ships', []))
+        
+        for x, y, result in snapshot.get('my_board_shots', []):
+            self._handle_opponent_shot_result(x, y, result)
+        for x, y, result in snapshot.get('enemy_shots', []):
+            self.enemy_board.shots[(x, y)] = result
+        for ship_info in snapshot.get('enemy_sunk_ships', []):
+            self._process_enemy_ship_sunk(ship_info)
+            
+        if snapshot.get('phase') == 'battle_phase':
+            self.start_battle_phase()
+            self.set_my_turn(snapshot.get('current_turn') == snapshot.get('player_id'))
+            
+    def set_connection_notice(self, notice: Optional[str]) -> None:
+        self.connection_notice = notice
+        if notice:
+            self.my_turn = False
+        
+    def _place_positions(self, positions: List[Tuple[int, int]]) -> None:
+        start_x, start_y = min(positions)
+        horizontal = all(y == start_y for _, y in positions)
+        self.my_board.place_ship(len(positions), start_x, start_y, horizontal)
+            
     def _handle_battle_shot(self, mouse_pos: Tuple[int, int]) -> None:
             
             cell = self.enemy_board.get_cell_from_mouse(mouse_pos)
@@ -194,15 +260,17 @@ class GameScreen:
 
             
     def _can_shoot_at_cell(self, cell: Optional[Tuple[int, int]]) -> bool:
+        # Con un disparo en vuelo no se dispara otro: si fue agua el turno ya es del rival.
         return (cell is not None and 
                cell not in self.enemy_board.shots and 
+               not self.enemy_board.pending_shots and
                self.network_manager is not None)
                
     def _execute_bomb_attack(self, center_x: int, center_y: int) -> None:
         bomb_targets = self._generate_bomb_targets(center_x, center_y)
 
         if bomb_targets:
-            self.loop.create_task(self._send_bomb_attack_async(bomb_targets))
+            self._submit(self._send_bomb_attack_async(bomb_targets))
             self.bomb_attack_mode = False
             self.bombs_available -= 1
             self._update_attack_buttons_text()
@@ -211,7 +279,7 @@ class GameScreen:
         air_strike_targets = self._generate_air_strike_targets(center_x, center_y)
         
         if air_strike_targets:
-            self.loop.create_task(self._send_air_strike_async(air_strike_targets))
+            self._submit(self._send_air_strike_async(air_strike_targets))
             self.air_strike_mode = False
             self.air_strikes_available -= 1
             self._update_attack_buttons_text()
@@ -233,9 +301,15 @@ class GameScreen:
             pass
 
             
+    def _submit(self, coroutine) -> None:
+        # El loop vive en el hilo de red: crear la tarea desde acá no es seguro.
+        asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
     def _execute_single_shot(self, x: int, y: int) -> None:
         if self._can_shoot_at_cell((x, y)) and self.loop:
-            self.loop.create_task(self.network_manager.make_shot(x, y))
+            # Se marca ya, sin esperar al servidor; el resultado o el timeout lo resuelven.
+            self.enemy_board.mark_pending_shot(x, y)
+            self._submit(self.network_manager.make_shot(x, y))
 
             
     def _generate_bomb_targets(self, center_x: int, center_y: int) -> List[Tuple[int, int]]:
@@ -270,7 +344,7 @@ class GameScreen:
         self.ship_horizontal = not self.ship_horizontal
     
     def update(self) -> None:
-        pass
+        self.enemy_board.expire_pending_shots()
     
     def draw(self) -> None:
         self.draw_ocean_background()
@@ -280,6 +354,8 @@ class GameScreen:
         self._draw_game_boards()
         self._draw_ship_preview_if_needed()
         self._draw_game_info()
+        self._draw_latency_hud()
+        self._mark_traces_drawn()
         
     def draw_without_preview(self) -> None:
         self.draw_ocean_background()
@@ -288,6 +364,16 @@ class GameScreen:
         self._draw_board_titles()
         self._draw_game_boards()
         self._draw_game_info()
+        self._draw_latency_hud()
+        self._mark_traces_drawn()
+        
+    def _draw_latency_hud(self) -> None:
+        if self.latency_hud:
+            self.latency_hud.draw(self.screen)
+        
+    def _mark_traces_drawn(self) -> None:
+        if self.network_manager:
+            self.network_manager.tracer.mark_drawn()
         
     def _draw_game_title(self) -> None:
         title_font = pygame.font.Font(None, GAME_FONT_SIZES['TITLE'])
@@ -356,7 +442,9 @@ class GameScreen:
         self.screen.blit(status_surface, status_rect)
         
     def _get_status_text(self) -> str:
-        if self.game_phase == GAME_PHASE_PLACEMENT:
+        if self.connection_notice:
+            return self.connection_notice
+        elif self.game_phase == GAME_PHASE_PLACEMENT:
             return self._get_placement_status_text()
         elif self.game_phase == GAME_PHASE_BATTLE:
             return self._get_battle_status_text()
@@ -655,7 +743,7 @@ class GameScreen:
                 ships_data.append(ship.positions)
             
             if self.loop:
-                self.loop.create_task(self.network_manager.place_ships(ships_data))
+                self._submit(self.network_manager.place_ships(ships_data))
     
     def handle_shot_result(self, data):
         if not data:
@@ -671,6 +759,8 @@ class GameScreen:
             self._handle_my_shot_result(x, y, result, ship_info)
         else:
             self._handle_opponent_shot_result(x, y, result)
+            
+        self.network_manager.tracer.mark_handled(data.get('trace_id'))
     
     def _extract_shot_data(self, data):
         return (
@@ -691,6 +781,7 @@ class GameScreen:
             self.play_water_splash_sound()
     
     def _handle_my_shot_result(self, x, y, result, ship_info):
+        self.enemy_board.resolve_pending_shot(x, y)
         self.enemy_board.shots[(x, y)] = result
         
         if result == 'sunk' and ship_info:
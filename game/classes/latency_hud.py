@@ -0,0 +1,58 @@
+import pygame
+import sys
+import os
+from typing import Optional, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import (FONT_SIZE_SMALL, COLOR_WHITE, GAME_TEXT, LATENCY_HUD_ENV_VAR, LATENCY_HUD_MARGIN,
+                      LATENCY_HUD_PADDING, LATENCY_HUD_BACKGROUND)
+from .latency_monitor import LatencyMonitor, SECONDS_TO_MS
+
+
+class LatencyHud:
+    """Recuadro chico con el RTT y el jitter, arriba a la izquierda.
+
+    Se prende con F3 o arrancando con ``BATTLESHIP_LATENCY_HUD=1``. El texto
+    se vuelve a renderizar solo cuando cambia lo que muestra.
+    """
+
+    def __init__(self, monitor: LatencyMonitor, visible: Optional[bool] = None):
+        self.monitor = monitor
+        self.visible = bool(os.environ.get(LATENCY_HUD_ENV_VAR)) if visible is None else visible
+        self.font = pygame.font.Font(None, FONT_SIZE_SMALL)
+        self._shown: Optional[Tuple[int, int]] = None
+        self._surface: Optional[pygame.Surface] = None
+
+    def toggle(self) -> None:
+        self.visible = not self.visible
+
+    def draw(self, screen: pygame.Surface) -> None:
+        if not self.visible:
+            return
+
+        shown = self._current_values()
+        if shown != self._shown or self._surface is None:
+            self._surface = self._render(shown)
+            self._shown = shown
+        screen.blit(self._surface, (LATENCY_HUD_MARGIN, LATENCY_HUD_MARGIN))
+
+    def _current_values(self) -> Optional[Tuple[int, int]]:
+        srtt = self.monitor.srtt
+        if srtt is None:
+            return None
+        # En décimas de ms, para no redibujar por ruido que el texto no muestra.
+        return round(srtt * SECONDS_TO_MS), round(self.monitor.jitter * SECONDS_TO_MS * 10)
+
+    def _render(self, shown: Optional[Tuple[int, int]]) -> pygame.Surface:
+        if shown is None:
+            text = GAME_TEXT['LATENCY_HUD_NO_DATA']
+        else:
+            text = GAME_TEXT['LATENCY_HUD'].format(shown[0], shown[1] / 10)
+
+        text_surface = self.font.render(text, True, COLOR_WHITE)
+        width = text_surface.get_width() + 2 * LATENCY_HUD_PADDING
+        height = text_surface.get_height() + 2 * LATENCY_HUD_PADDING
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill(LATENCY_HUD_BACKGROUND)
+        surface.blit(text_surface, (LATENCY_HUD_PADDING, LATENCY_HUD_PADDING))
+        return surface
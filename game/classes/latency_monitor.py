@@ -0,0 +1,58 @@
+import collections
+import sys
+import os
+from typing import Optional, Dict, Any
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import RTT_SMOOTHING_FACTOR, RTT_JITTER_GAIN, LATENCY_MAX_SAMPLES, LATENCY_PERCENTILES
+
+SECONDS_TO_MS = 1000
+
+
+class LatencyMonitor:
+    """RTT suavizado y jitter a partir de los ``pong`` que contesta el servidor.
+
+    ``srtt`` es una media móvil exponencial como la de TCP y ``jitter`` la
+    desviación media entre muestras seguidas, como en RTP. Las muestras crudas
+    de la partida en curso se guardan (con tope) para sacar percentiles al
+    terminar. Se escribe desde el hilo de red y el HUD solo lee dos floats.
+    """
+
+    def __init__(self, max_samples: int = LATENCY_MAX_SAMPLES):
+        self.srtt: Optional[float] = None
+        self.jitter = 0.0
+        self.last_rtt: Optional[float] = None
+        self.match_samples: collections.deque = collections.deque(maxlen=max_samples)
+
+    def record(self, rtt: float) -> None:
+        if self.srtt is None:
+            self.srtt = rtt
+        else:
+            self.srtt += RTT_SMOOTHING_FACTOR * (rtt - self.srtt)
+            self.jitter += RTT_JITTER_GAIN * (abs(rtt - self.last_rtt) - self.jitter)
+        self.last_rtt = rtt
+        self.match_samples.append(rtt)
+
+    def start_match(self) -> None:
+        self.match_samples.clear()
+
+    def reset(self) -> None:
+        self.srtt = None
+        self.jitter = 0.0
+        self.last_rtt = None
+        self.match_samples.clear()
+
+    def match_summary(self) -> Optional[Dict[str, Any]]:
+        """Percentiles de la partida en ms, o ``None`` si no llegó ningún ``pong``."""
+        if not self.match_samples:
+            return None
+
+        samples = sorted(self.match_samples)
+        summary = {'samples': len(samples),
+                   'srtt_ms': round(self.srtt * SECONDS_TO_MS, 2),
+                   'jitter_ms': round(self.jitter * SECONDS_TO_MS, 2),
+                   'max_ms': round(samples[-1] * SECONDS_TO_MS, 2)}
+        for percentile in LATENCY_PERCENTILES:
+            value = samples[min(len(samples) - 1, int(len(samples) * percentile / 100))]
+            summary[f'p{percentile}_ms'] = round(value * SECONDS_TO_MS, 2)
+        return summary
@@ -1,19 +1,22 @@
 import pygame
 import os
 import sys
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, List
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from constants import (COLOR_WHITE, MENU_BUTTON_WIDTH, MENU_BUTTON_HEIGHT, MENU_BUTTON_Y_CONNECT,
-                      MENU_BUTTON_Y_START, COLOR_BUTTON_CONNECT, COLOR_BUTTON_CONNECT_HOVER,
+                      MENU_BUTTON_Y_START, MENU_BUTTON_Y_AI, COLOR_BUTTON_CONNECT, COLOR_BUTTON_CONNECT_HOVER,
                       COLOR_BUTTON_START, COLOR_BUTTON_START_HOVER, COLOR_BUTTON_DISABLED,
+                      COLOR_BUTTON_AI, COLOR_BUTTON_AI_HOVER,
                       MUTE_BUTTON_WIDTH, MUTE_BUTTON_HEIGHT, MUTE_BUTTON_MARGIN, COLOR_BUTTON_MUTE,
                       COLOR_BUTTON_MUTE_HOVER, FONT_SIZE_NORMAL, FONT_SIZE_SMALL, COLOR_BUTTON_CONNECT_ACTIVE,
                       COLOR_GREEN, COLOR_YELLOW, MENU_STATUS_Y, MUTED_VOLUME, MUSIC_VOLUME_MENU,
                       MENU_BUTTON_DIVISION_FACTOR, MENU_BUTTON_BORDER_WIDTH, MUTE_BUTTON_BORDER_WIDTH,
                       MENU_FONT_SIZE_DEFAULT, MOUSE_BUTTON_LEFT, MENU_STATE_DISCONNECTED,
                       MENU_STATE_PLAYERS_NOT_READY, MENU_TEXT, MENU_STATUS_COLOR_DISCONNECTED,
-                      MENU_BACKGROUND_COLOR_DEFAULT, MENU_EVENTS)
+                      MENU_BACKGROUND_COLOR_DEFAULT, MENU_EVENTS, MENU_LEADERBOARD_X, MENU_LEADERBOARD_Y,
+                      MENU_LEADERBOARD_LINE_HEIGHT, MENU_LEADERBOARD_ROWS)
+from .latency_hud import LatencyHud
 
 class MenuScreen:
     def __init__(self, screen: pygame.Surface) -> None:
@@ -31,6 +34,8 @@ class MenuScreen:
         self.server_connected = MENU_STATE_DISCONNECTED
         self.players_ready = MENU_STATE_PLAYERS_NOT_READY
         self.music_muted = MENU_STATE_DISCONNECTED
+        self.leaderboard_lines: List[str] = []
+        self.latency_hud: Optional[LatencyHud] = None
         
     def load_assets(self) -> None:
         try:
@@ -55,6 +60,7 @@ class MenuScreen:
         center_x = self.width // MENU_BUTTON_DIVISION_FACTOR
         self.connect_button = self._create_connect_button(center_x)
         self.start_button = self._create_start_button(center_x)
+        self.ai_button = self._create_ai_button(center_x)
         
     def _create_connect_button(self, center_x: int) -> Dict[str, Any]:
         return {
@@ -79,6 +85,18 @@ class MenuScreen:
             'text_color': COLOR_WHITE
         }
         
+    def _create_ai_button(self, center_x: int) -> Dict[str, Any]:
+        return {
+            'rect': pygame.Rect(center_x - MENU_BUTTON_WIDTH // MENU_BUTTON_DIVISION_FACTOR, 
+                              MENU_BUTTON_Y_AI, MENU_BUTTON_WIDTH, MENU_BUTTON_HEIGHT),
+            'text': MENU_TEXT['PLAY_VS_AI'],
+            'enabled': False,
+            'color': COLOR_BUTTON_AI,
+            'hover_color': COLOR_BUTTON_AI_HOVER,
+            'disabled_color': COLOR_BUTTON_DISABLED,
+            'text_color': COLOR_WHITE
+        }
+        
     def _setup_mute_button(self) -> None:
         self.mute_button = {
             'rect': pygame.Rect(self.width - MUTE_BUTTON_WIDTH - MUTE_BUTTON_MARGIN, 
@@ -91,7 +109,7 @@ class MenuScreen:
         }
         
     def _setup_button_list_and_fonts(self) -> None:
-        self.buttons = [self.connect_button, self.start_button]
+        self.buttons = [self.connect_button, self.start_button, self.ai_button]
         self.font = pygame.font.Font(MENU_FONT_SIZE_DEFAULT, FONT_SIZE_NORMAL)
         self.mute_font = pygame.font.Font(MENU_FONT_SIZE_DEFAULT, FONT_SIZE_SMALL)
         
@@ -112,6 +130,9 @@ class MenuScreen:
         if self._is_button_clicked(self.start_button, mouse_pos):
             return MENU_EVENTS['START_GAME']
             
+        if self._is_button_clicked(self.ai_button, mouse_pos):
+            return MENU_EVENTS['PLAY_VS_AI']
+            
         if self.mute_button['rect'].collidepoint(mouse_pos):
             return MENU_EVENTS['TOGGLE_MUSIC']
             
@@ -154,10 +175,12 @@ class MenuScreen:
         
     def _get_players_ready_status(self) -> Tuple[str, Tuple[int, int, int]]:
         self.start_button['enabled'] = True
+        self.ai_button['enabled'] = False
         return MENU_TEXT['STATUS_READY'], COLOR_GREEN
         
     def _get_waiting_players_status(self) -> Tuple[str, Tuple[int, int, int]]:
         self.start_button['enabled'] = False
+        self.ai_button['enabled'] = True
         return MENU_TEXT['STATUS_CONNECTING'], COLOR_YELLOW
         
     def _get_disconnected_status(self) -> Tuple[str, Tuple[int, int, int]]:
@@ -165,6 +188,7 @@ class MenuScreen:
         self.connect_button['enabled'] = True
         self.connect_button['color'] = COLOR_BUTTON_CONNECT
         self.start_button['enabled'] = False
+        self.ai_button['enabled'] = False
         return MENU_TEXT['STATUS_DISCONNECTED'], MENU_STATUS_COLOR_DISCONNECTED
 
     def render_all_buttons(self, mouse_pos: Tuple[int, int]) -> None:
@@ -185,7 +209,13 @@ class MenuScreen:
         self.render_all_buttons(mouse_pos)
         
         self._draw_connection_status()
+        self._draw_leaderboard()
         self.draw_mute_button(mouse_pos)
+        self._draw_latency_hud()
+        
+    def _draw_latency_hud(self) -> None:
+        if self.latency_hud:
+            self.latency_hud.draw(self.screen)
         
     def _draw_connection_status(self) -> None:
         status_text, status_color = self.update_connection_status()
@@ -196,6 +226,12 @@ class MenuScreen:
         self.screen.blit(status_surface, status_rect)
         
     
+    def _draw_leaderboard(self) -> None:
+        for index, line in enumerate(self.leaderboard_lines):
+            color = COLOR_YELLOW if index == 0 else COLOR_WHITE
+            surface = (self.font if index == 0 else self.mute_font).render(line, True, color)
+            self.screen.blit(surface, (MENU_LEADERBOARD_X, MENU_LEADERBOARD_Y + index * MENU_LEADERBOARD_LINE_HEIGHT))
+    
     def draw_mute_button(self, mouse_pos: Tuple[int, int]) -> None:
         color = self._get_mute_button_color(mouse_pos)
         self._draw_mute_button_rectangle(color)
@@ -233,4 +269,15 @@ class MenuScreen:
     
     def set_connection_status(self, connected: bool, players_ready: bool = False) -> None:
         self.server_connected = connected
-        self.players_ready = players_ready
\ No newline at end of file
+        self.players_ready = players_ready
+        
+    def set_leaderboard(self, data: Optional[Dict[str, Any]]) -> None:
+        if not data:
+            self.leaderboard_lines = []
+            return
+            
+        lines = [MENU_TEXT['LEADERBOARD_TITLE']]
+        lines += [MENU_TEXT['LEADERBOARD_ROW'].format(**entry) for entry in data.get('top', [])[:MENU_LEADERBOARD_ROWS]]
+        if data.get('you'):
+            lines.append(MENU_TEXT['LEADERBOARD_YOU'].format(**data['you']))
+        self.leaderboard_lines = lines
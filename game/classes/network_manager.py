@@ -1,19 +1,32 @@
 import asyncio
 import json
+import random
+import time
 import sys
 import os
-from typing import Optional, Callable, Any, Dict
+from functools import partial
+from typing import Optional, Callable, Any, Dict, Tuple
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from constants import (DEFAULT_SERVER_HOST, DEFAULT_SERVER_PORT, NETWORK_BUFFER_SIZE, 
-                      NETWORK_ENCODING, MESSAGE_BUFFER_SPLIT_LIMIT,
-                      MESSAGE_TYPES, NETWORK_LOG_MESSAGES, JSON_MESSAGE_DELIMITER)
+from constants import (DEFAULT_SERVER_HOST, DEFAULT_SERVER_PORT, MAX_FRAME_SIZE, NETWORK_ENCODING,
+                      MESSAGE_TYPES, NETWORK_LOG_MESSAGES, JSON_MESSAGE_DELIMITER, JSON_MESSAGE_DELIMITER_BYTES,
+                      NETWORK_EVENTS, SERVER_DISCONNECT_EVENT, RECONNECTING_EVENT, RECONNECT_BASE_DELAY,
+                      RECONNECT_MAX_DELAY, RECONNECT_GIVE_UP_AFTER, RECONNECT_ATTEMPT_TIMEOUT, PING_INTERVAL,
+                      SNAPSHOT_REQUEST_TIMEOUT)
+from .event_bus import EventBus
+from .turn_tracer import TurnTracer
+from .latency_monitor import LatencyMonitor
 
 class NetworkManager:
-    def __init__(self):
+    def __init__(self, max_frame_size: int = MAX_FRAME_SIZE, client_id: Optional[str] = None):
+        self.max_frame_size = max_frame_size
+        self.client_id = client_id
+        self.oversized_frames = 0
+        self.tracer = TurnTracer()
+        self.latency = LatencyMonitor()
         self._initialize_connection_attributes()
         self._initialize_server_config()
-        self._initialize_callbacks()
+        self._initialize_events()
         
     def _initialize_connection_attributes(self) -> None:
         self.reader: Optional[asyncio.StreamReader] = None
@@ -21,54 +34,189 @@ class NetworkManager:
         self.connected: bool = False
         self.player_id: Optional[str] = None
         self.receive_task: Optional[asyncio.Task] = None
+        self.ping_task: Optional[asyncio.Task] = None
+        self.latency_report_task: Optional[asyncio.Task] = None
+        self.snapshot_task: Optional[asyncio.Task] = None
+        self._snapshot_arrived = asyncio.Event()
+        self.resume_token: Optional[str] = None
+        self.match_in_progress: bool = False
+        self.reconnecting: bool = False
+        self.reconnect_task: Optional[asyncio.Task] = None
+        self.reconnect_rng = random.Random()
+        self._resume_answer: Optional[asyncio.Future] = None
+        self._reset_game_state_cache()
+        
+    def _reset_game_state_cache(self) -> None:
+        self.game_state: Dict[str, Any] = {}
+        self.state_version: Optional[int] = None
         
     def _initialize_server_config(self) -> None:
         self.server_host: str = DEFAULT_SERVER_HOST
         self.server_port: int = DEFAULT_SERVER_PORT
+        self.unix_path: Optional[str] = None
         
-    def _initialize_callbacks(self) -> None:
-        self.on_players_ready: Optional[Callable[[Dict[str, Any]], None]] = None
-        self.on_game_start: Optional[Callable[[Dict[str, Any]], None]] = None
-        self.on_game_update: Optional[Callable[[Dict[str, Any]], None]] = None
-        self.on_shot_result: Optional[Callable[[Dict[str, Any]], None]] = None
-        self.on_game_over: Optional[Callable[[Dict[str, Any]], None]] = None
-        self.on_server_disconnect: Optional[Callable[[], None]] = None
+    def _initialize_events(self) -> None:
+        self.events = EventBus(NETWORK_EVENTS)
+        self._message_handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {
+            MESSAGE_TYPES['PLAYER_CONNECT']: self._handle_player_connect,
+            MESSAGE_TYPES['GAME_START']: self._handle_game_start,
+            MESSAGE_TYPES['GAME_OVER']: self._handle_game_over,
+            MESSAGE_TYPES['RESUMED']: self._handle_resumed,
+            MESSAGE_TYPES['GAME_UPDATE']: self._handle_game_update,
+            MESSAGE_TYPES['GAME_STATE_DELTA']: self._handle_game_state_delta,
+            MESSAGE_TYPES['SHOT_RESULT']: self._handle_shot_result,
+            MESSAGE_TYPES['PLAYER_DISCONNECT']: self._handle_player_disconnect,
+            MESSAGE_TYPES['PONG']: self._handle_pong,
+            MESSAGE_TYPES['ERROR']: self._handle_error
+        }
+        for message_type in (MESSAGE_TYPES['PLAYERS_READY'], MESSAGE_TYPES['LEADERBOARD'],
+                             MESSAGE_TYPES['SHIPS_AUTO_PLACED']):
+            self._message_handlers[message_type] = partial(self.events.publish, message_type)
     
-    async def connect_to_server(self, host: Optional[str] = None, port: Optional[int] = None) -> bool:
-        self._update_server_config(host, port)
+    async def connect_to_server(self, host: Optional[str] = None, port: Optional[int] = None,
+                                unix_path: Optional[str] = None) -> bool:
+        self._update_server_config(host, port, unix_path)
         
         try:
-            return await self._establish_connection()
+            # join pide la sala; al reanudar no se manda, así el resume llega antes que nada.
+            return await self._establish_connection() and await self.send_message(MESSAGE_TYPES['JOIN'], self._join_data())
         except Exception as e:
             self.connected = False
             return False
             
-    def _update_server_config(self, host: Optional[str], port: Optional[int]) -> None:
+    def _join_data(self) -> Dict[str, Any]:
+        # Sin client_id el servidor lleva las estadísticas por sesión.
+        return {'client_id': self.client_id} if self.client_id else {}
+        
+    def _update_server_config(self, host: Optional[str], port: Optional[int],
+                              unix_path: Optional[str] = None) -> None:
         if host:
             self.server_host = host
         if port:
             self.server_port = port
+        if unix_path:
+            self.unix_path = unix_path
             
     async def _establish_connection(self) -> bool:
-        self.reader, self.writer = await asyncio.open_connection(self.server_host, self.server_port)
+        self.reader, self.writer = await self._open_stream()
         self.connected = True
+        self._reset_game_state_cache()
         
         self._start_receive_task()
+        self._start_ping_task()
         return True
         
+    async def _open_stream(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self.unix_path:
+            return await asyncio.open_unix_connection(self.unix_path, limit=self.max_frame_size)
+        return await asyncio.open_connection(self.server_host, self.server_port, limit=self.max_frame_size)
+        
     def _start_receive_task(self) -> None:
         self.receive_task = asyncio.create_task(self.receive_messages())
+        
+    def _start_ping_task(self) -> None:
+        self.ping_task = asyncio.create_task(self._ping_forever())
+        
+    async def _ping_forever(self) -> None:
+        # El servidor contesta el ping apenas lo lee, sin pasar por la sala: el RTT
+        # mide red y event loop, y lo que tarde un disparo por encima de eso es la partida.
+        while self.connected:
+            await self.send_message(MESSAGE_TYPES['PING'], {'sent': time.perf_counter()})
+            await asyncio.sleep(PING_INTERVAL)
 
     async def disconnect(self) -> None:
+        self._stop_reconnecting()
+        self.match_in_progress = False
+        self.resume_token = None
+        self.player_id = None
+        self.latency.reset()
+        await self._close_connection()
+        
+    async def _close_connection(self) -> None:
         if self.writer:
             self.connected = False
-            if self.receive_task:
-                self.receive_task.cancel()
+            for task in (self.receive_task, self.ping_task, self.latency_report_task, self.snapshot_task):
+                if task and task is not asyncio.current_task():
+                    task.cancel()
             self.writer.close()
-            await self.writer.wait_closed()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
             self.writer = None
             self.reader = None
             
+    def _stop_reconnecting(self) -> None:
+        if self.reconnect_task and self.reconnect_task is not asyncio.current_task():
+            self.reconnect_task.cancel()
+        self.reconnect_task = None
+        self.reconnecting = False
+        
+    def _connection_lost(self) -> None:
+        # ``reconnecting`` se prende antes de bajar ``connected``: nunca queda un
+        # instante en que parezca una desconexión definitiva.
+        if self.reconnecting:
+            self.connected = False
+            self._answer_resume(None)
+        elif self.match_in_progress and self.resume_token:
+            self.reconnecting = True
+            self.connected = False
+            self.reconnect_task = asyncio.create_task(self._reconnect_with_backoff(self.resume_token))
+        else:
+            self.connected = False
+            self.events.publish(SERVER_DISCONNECT_EVENT)
+            
+    async def _reconnect_with_backoff(self, resume_token: str) -> None:
+        """Reintenta con backoff exponencial y jitter completo hasta reanudar la partida.
+
+        Cada espera se sortea entre 0 y ``RECONNECT_BASE_DELAY * 2**intento``
+        (con tope ``RECONNECT_MAX_DELAY``), así muchos clientes cortados a la vez
+        no vuelven todos juntos. Se deja de intentar a los
+        ``RECONNECT_GIVE_UP_AFTER`` segundos, que coinciden con lo que el
+        servidor guarda el lugar, o apenas el servidor rechaza el token.
+        """
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + RECONNECT_GIVE_UP_AFTER
+        attempt = 0
+        resumed = None
+        
+        while resumed is None and loop.time() < give_up_at:
+            delay = min(self.reconnect_rng.uniform(0, min(RECONNECT_MAX_DELAY, RECONNECT_BASE_DELAY * 2 ** attempt)),
+                        give_up_at - loop.time())
+            attempt += 1
+            self.events.publish(RECONNECTING_EVENT, {'attempt': attempt, 'delay': delay})
+            await asyncio.sleep(delay)
+            resumed = await self._try_resume(resume_token)
+            
+        self.reconnect_task = None
+        if resumed:
+            self.reconnecting = False
+        else:
+            await self.disconnect()
+            self.events.publish(SERVER_DISCONNECT_EVENT)
+            
+    async def _try_resume(self, resume_token: str) -> Optional[bool]:
+        """``True`` si se reanudó, ``False`` si el servidor rechazó el token y ``None`` para reintentar."""
+        await self._close_connection()
+        try:
+            await asyncio.wait_for(self._establish_connection(), RECONNECT_ATTEMPT_TIMEOUT)
+        except (OSError, asyncio.TimeoutError):
+            return None
+            
+        self._resume_answer = asyncio.get_running_loop().create_future()
+        try:
+            if not await self.send_message(MESSAGE_TYPES['RESUME'], {'resume_token': resume_token}):
+                return None
+            return await asyncio.wait_for(self._resume_answer, RECONNECT_ATTEMPT_TIMEOUT)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._resume_answer = None
+            
+    def _answer_resume(self, resumed: Optional[bool]) -> None:
+        if self._resume_answer is not None and not self._resume_answer.done():
+            self._resume_answer.set_result(resumed)
+            
     async def send_message(self, message_type: str, data: Optional[Dict[str, Any]] = None) -> bool:
         if not self.connected:
             return False
@@ -82,11 +230,14 @@ class NetworkManager:
             return False
             
     def _create_message(self, message_type: str, data: Optional[Dict[str, Any]]) -> str:
+        trace_id = self.tracer.new_trace_id()
         message = {
             'type': message_type,
             'player_id': self.player_id,
+            'trace_id': trace_id,
             'data': data
         }
+        self.tracer.start(trace_id, message_type)
         return json.dumps(message) + JSON_MESSAGE_DELIMITER
         
     async def _send_raw_message(self, message_json: str) -> bool:
@@ -95,126 +246,148 @@ class NetworkManager:
         return True
         
     async def _handle_connection_error(self) -> bool:
-        self.connected = False
-        if self.on_server_disconnect:
-            self.on_server_disconnect()
+        self._connection_lost()
         return False
     
     async def receive_messages(self) -> None:
-        buffer: str = ""
-        
+        """Lee un frame por vez con ``readuntil`` sobre el buffer de bytes del stream.
+
+        El corte se hace en bytes y cada frame se decodifica entero, así un
+        carácter UTF-8 de varios bytes nunca queda partido entre dos lecturas, y
+        una ráfaga de frames se procesa en tiempo lineal sin concatenar ``str``.
+        """
         while self.connected:
-            buffer = await self._process_incoming_data(buffer)
-            
-    async def _process_incoming_data(self, buffer: str) -> str:
-        try:
-            data = await self._receive_server_data()
-            if not data:
-                return buffer
+            frame = await self._receive_frame()
+            if frame is not None:
+                self._handle_complete_message(frame)
                 
-            buffer += data
-            return self._process_message_buffer(buffer)
-            
-        except Exception as e:
-            await self._handle_receive_error(e)
-            return buffer
-            
-    async def _receive_server_data(self) -> str:
+    async def _receive_frame(self) -> Optional[bytes]:
         try:
-            data = await self.reader.read(NETWORK_BUFFER_SIZE)
-            if not data:
-                await self._handle_server_disconnection()
-                return ""
-                
-            return data.decode(NETWORK_ENCODING)
-            
+            return await self.reader.readuntil(JSON_MESSAGE_DELIMITER_BYTES)
+        except asyncio.IncompleteReadError:
+            await self._handle_server_disconnection()
+        except asyncio.LimitOverrunError:
+            await self._reject_oversized_frame()
         except (ConnectionResetError, ConnectionAbortedError):
             await self._handle_server_disconnection_error()
-            return ""
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await self._handle_receive_error(e)
+        return None
             
     async def _handle_server_disconnection(self) -> None:
-        self.connected = False
-        if self.on_server_disconnect:
-            self.on_server_disconnect()
+        self._connection_lost()
             
     async def _handle_server_disconnection_error(self) -> None:
-        self.connected = False
-        if self.on_server_disconnect:
-            self.on_server_disconnect()
+        self._connection_lost()
+            
+    async def _reject_oversized_frame(self) -> None:
+        # No es un corte de red: se cierra del todo, sin reconectar ni reanudar.
+        self.oversized_frames += 1
+        print(NETWORK_LOG_MESSAGES['FRAME_TOO_LARGE'])
+        await self.disconnect()
+        self.events.publish(SERVER_DISCONNECT_EVENT)
+            
+    def _handle_complete_message(self, frame: bytes) -> None:
+        if not frame.strip():
+            return
             
-    def _process_message_buffer(self, buffer: str) -> str:
-        while JSON_MESSAGE_DELIMITER in buffer:
-            message, buffer = buffer.split(JSON_MESSAGE_DELIMITER, MESSAGE_BUFFER_SPLIT_LIMIT)
-            if message.strip():
-                self._handle_complete_message(message)
-        return buffer
-        
-    def _handle_complete_message(self, message: str) -> None:
         try:
-            parsed_message = json.loads(message)
+            parsed_message = json.loads(frame.decode(NETWORK_ENCODING))
             self.handle_server_message(parsed_message)
-        except json.JSONDecodeError as e:
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
             pass
             
     async def _handle_receive_error(self, error: Exception) -> None:
-        self.connected = False
-        if self.on_server_disconnect:
-            self.on_server_disconnect()
+        self._connection_lost()
     
     def handle_server_message(self, message: Dict[str, Any]) -> None:
-        message_type = message.get('type')
-        data = message.get('data', {})
-        
-        handler_map = {
-            MESSAGE_TYPES['PLAYER_CONNECT']: self._handle_player_connect,
-            MESSAGE_TYPES['PLAYERS_READY']: self._handle_players_ready,
-            MESSAGE_TYPES['GAME_START']: self._handle_game_start,
-            MESSAGE_TYPES['GAME_UPDATE']: self._handle_game_update,
-            MESSAGE_TYPES['SHOT_RESULT']: self._handle_shot_result,
-            MESSAGE_TYPES['GAME_OVER']: self._handle_game_over,
-            MESSAGE_TYPES['PLAYER_DISCONNECT']: self._handle_player_disconnect,
-            MESSAGE_TYPES['ERROR']: self._handle_error
-        }
-        
-        handler = handler_map.get(message_type)
+        handler = self._message_handlers.get(message.get('type'))
         if handler:
-            handler(data)
-        else:
-            pass
+            handler(message.get('data', {}))
             
     def _handle_player_connect(self, data: Dict[str, Any]) -> None:
         self.player_id = data.get('player_id')
-        
-    def _handle_players_ready(self, data: Dict[str, Any]) -> None:
-        if self.on_players_ready:
-            self.on_players_ready(data)
+        if not self.reconnecting:
+            self.resume_token = data.get('resume_token')
             
     def _handle_game_start(self, data: Dict[str, Any]) -> None:
-        if self.on_game_start:
-            self.on_game_start(data)
-        else:
-            pass
-            
+        self.match_in_progress = True
+        self.latency.start_match()
+        self.events.publish(MESSAGE_TYPES['GAME_START'], data)
+        
+    def _handle_game_over(self, data: Dict[str, Any]) -> None:
+        self.match_in_progress = False
+        self.latency_report_task = self._start_background_task(self.report_match_latency())
+        self.events.publish(MESSAGE_TYPES['GAME_OVER'], data)
+        
+    def _start_background_task(self, coroutine) -> asyncio.Task:
+        task = asyncio.create_task(coroutine)
+        task.add_done_callback(self._report_task_failure)
+        return task
+        
+    def _report_task_failure(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            print(f"{NETWORK_LOG_MESSAGES['TASK_FAILED']}: {task.exception()!r}")
+        
+    def _handle_pong(self, data: Dict[str, Any]) -> None:
+        sent = data.get('sent')
+        if isinstance(sent, (int, float)):
+            self.latency.record(time.perf_counter() - sent)
+        
+    def _handle_resumed(self, data: Dict[str, Any]) -> None:
+        if data.get('resumed'):
+            self.player_id = data.get('player_id')
+            self.resume_token = data.get('resume_token')
+            self.events.publish(MESSAGE_TYPES['RESUMED'], data)
+        self._answer_resume(bool(data.get('resumed')))
+        
     def _handle_game_update(self, data: Dict[str, Any]) -> None:
-        if self.on_game_update:
-            self.on_game_update(data)
+        self.game_state = dict(data)
+        self.state_version = self.game_state.pop('version', None)
+        self._snapshot_arrived.set()
+        self._notify_game_update()
             
-    def _handle_shot_result(self, data: Dict[str, Any]) -> None:
-        if self.on_shot_result:
-            self.on_shot_result(data)
+    def _handle_game_state_delta(self, data: Dict[str, Any]) -> None:
+        if self.state_version is None or data.get('base_version') != self.state_version:
+            if self.snapshot_task is None or self.snapshot_task.done():
+                self.snapshot_task = self._start_background_task(self._resync_state())
+            return
             
-    def _handle_game_over(self, data: Dict[str, Any]) -> None:
-        if self.on_game_over:
-            self.on_game_over(data)
+        self._apply_state_changes(self.game_state, data.get('changes', {}))
+        self._apply_state_removals(self.game_state, data.get('removed', []))
+        self.state_version = data.get('version')
+        self._notify_game_update()
+        
+    def _apply_state_changes(self, state: Dict[str, Any], changes: Dict[str, Any]) -> None:
+        for key, value in changes.items():
+            if isinstance(value, dict) and isinstance(state.get(key), dict):
+                self._apply_state_changes(state[key], value)
+            else:
+                state[key] = value
+                
+    def _apply_state_removals(self, state: Dict[str, Any], removed: list) -> None:
+        for path in removed:
+            container = state
+            for key in path[:-1]:
+                container = container.get(key, {})
+            container.pop(path[-1], None)
+            
+    def _notify_game_update(self) -> None:
+        # Copia: quien la reciba puede leerla desde otro hilo mientras llega el próximo delta.
+        self.events.publish(MESSAGE_TYPES['GAME_UPDATE'], dict(self.game_state))
+            
+    def _handle_shot_result(self, data: Dict[str, Any]) -> None:
+        self.tracer.mark_received(data.get('trace_id'))
+        self.events.publish(MESSAGE_TYPES['SHOT_RESULT'], data)
             
     def _handle_player_disconnect(self, data: Dict[str, Any]) -> None:
         disconnected_player = data.get('disconnected_player', NETWORK_LOG_MESSAGES['UNKNOWN_PLAYER'])
         message = data.get('message', NETWORK_LOG_MESSAGES['DEFAULT_DISCONNECT_MESSAGE'])
         
-        if self.on_server_disconnect:
-            self.on_server_disconnect()
-        else:
-            pass
+        self.match_in_progress = False
+        self.events.publish(SERVER_DISCONNECT_EVENT)
             
     def _handle_error(self, data: Dict[str, Any]) -> None:
         error_msg = data.get('error', NETWORK_LOG_MESSAGES['DEFAULT_ERROR_MESSAGE'])
@@ -231,6 +404,29 @@ class NetworkManager:
     async def make_air_strike(self, targets: list) -> bool:
         return await self.send_message(MESSAGE_TYPES['AIR_STRIKE'], {'targets': targets})
     
+    async def request_state_snapshot(self) -> bool:
+        return await self.send_message(MESSAGE_TYPES['STATE_REQUEST'], {})
+    
+    async def _resync_state(self) -> None:
+        """Pide un snapshot y espera el ``game_update``: mientras tanto los deltas descuadrados no piden otro."""
+        self._snapshot_arrived.clear()
+        if not await self.request_state_snapshot():
+            return
+        try:
+            await asyncio.wait_for(self._snapshot_arrived.wait(), SNAPSHOT_REQUEST_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+    
+    async def report_match_latency(self) -> bool:
+        """Manda al servidor los percentiles de RTT de la partida, que los deja en su log."""
+        summary = self.latency.match_summary()
+        if summary is None:
+            return False
+        return await self.send_message(MESSAGE_TYPES['LATENCY_REPORT'], summary)
+    
+    async def request_leaderboard(self, count: Optional[int] = None) -> bool:
+        return await self.send_message(MESSAGE_TYPES['LEADERBOARD_REQUEST'], {'count': count} if count else {})
+    
     async def start_game(self) -> bool:
         if not self._validate_connection():
             return False
@@ -238,6 +434,12 @@ class NetworkManager:
         result = await self.send_message(MESSAGE_TYPES['START_GAME'], {})
         return result
         
+    async def play_vs_ai(self) -> bool:
+        if not self._validate_connection():
+            return False
+            
+        return await self.send_message(MESSAGE_TYPES['PLAY_VS_AI'], {})
+        
     def _log_start_game_info(self) -> None:
         pass
         
@@ -245,21 +447,3 @@ class NetworkManager:
         if not self.connected:
             return False
         return True
-    
-    def set_players_ready_callback(self, callback: Callable[[Dict[str, Any]], None]) -> None:
-        self.on_players_ready = callback
-    
-    def set_game_start_callback(self, callback: Callable[[Dict[str, Any]], None]) -> None:
-        self.on_game_start = callback
-    
-    def set_game_update_callback(self, callback: Callable[[Dict[str, Any]], None]) -> None:
-        self.on_game_update = callback
-    
-    def set_shot_result_callback(self, callback: Callable[[Dict[str, Any]], None]) -> None:
-        self.on_shot_result = callback
-    
-    def set_game_over_callback(self, callback: Callable[[Dict[str, Any]], None]) -> None:
-        self.on_game_over = callback
-    
-    def set_server_disconnect_callback(self, callback: Callable[[], None]) -> None:
-        self.on_server_disconnect = callback
\ No newline at end of file
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+import sys
+import os
+from concurrent.futures import Future
+from typing import Any, Coroutine
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import THREAD_DAEMON_MODE, NETWORK_THREAD_JOIN_TIMEOUT
+
+
+class NetworkThread:
+    """Event loop de asyncio corriendo en un hilo propio, aparte del loop de pygame.
+
+    Así la red lee y responde apenas llegan datos, aunque un frame tarde. El
+    hilo principal nunca toca el loop: le pasa corrutinas con ``submit`` y
+    recibe los eventos por la cola que vacía al empezar cada frame.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, name='network', daemon=THREAD_DAEMON_MODE)
+
+    def start(self) -> 'NetworkThread':
+        self.thread.start()
+        return self
+
+    def submit(self, coroutine: Coroutine[Any, Any, Any]) -> Future:
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def stop(self, timeout: float = NETWORK_THREAD_JOIN_TIMEOUT) -> None:
+        """Cancela las tareas pendientes, frena el loop y espera al hilo."""
+        if self.thread.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout)
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            pending_tasks = asyncio.all_tasks(self.loop)
+            for task in pending_tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*pending_tasks, return_exceptions=True))
+            self.loop.close()
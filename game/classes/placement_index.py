@@ -0,0 +1,126 @@
+import random
+import sys
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Iterable
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import GRID_SIZE
+
+RANDOM_FLEET_MAX_ATTEMPTS = 10000
+
+
+class PlacementIndex:
+    """Todas las ubicaciones legales de cada tamaño de barco, como máscaras de bits.
+
+    La celda ``(x, y)`` es el bit ``y * grid_size + x``. Las ubicaciones de un
+    tamaño se calculan la primera vez que se piden y quedan guardadas, así
+    validar, colocar o sortear una flota se reduce a ``&`` y ``|`` entre enteros.
+    Cliente y servidor comparten la misma instancia por tamaño de tablero a
+    través de ``get_placement_index``.
+    """
+
+    def __init__(self, grid_size: int = GRID_SIZE):
+        self.grid_size = grid_size
+        self._placements: Dict[int, List[int]] = {}
+        self._legal: Dict[int, frozenset] = {}
+        self._by_start: Dict[Tuple[int, int, int, bool], int] = {}
+        self._covering: Dict[int, List[List[int]]] = {}
+
+    def cell_bit(self, x: int, y: int) -> int:
+        if not (0 <= x < self.grid_size and 0 <= y < self.grid_size):
+            raise ValueError(f"Celda fuera del tablero: {(x, y)}")
+        return 1 << (y * self.grid_size + x)
+
+    def mask_for(self, positions: Iterable[Tuple[int, int]]) -> int:
+        mask = 0
+        for x, y in positions:
+            mask |= self.cell_bit(x, y)
+        return mask
+
+    def positions(self, mask: int) -> List[Tuple[int, int]]:
+        cells = []
+        while mask:
+            low_bit = mask & -mask
+            cells.append(tuple(reversed(divmod(low_bit.bit_length() - 1, self.grid_size))))
+            mask ^= low_bit
+        return cells
+
+    def placements(self, size: int) -> List[int]:
+        if size not in self._placements:
+            self._index_size(size)
+        return self._placements[size]
+
+    def placement(self, size: int, x: int, y: int, horizontal: bool = True) -> Optional[int]:
+        self.placements(size)
+        return self._by_start.get((size, x, y, horizontal))
+
+    def compatible(self, size: int, occupancy: int) -> List[int]:
+        return [mask for mask in self.placements(size) if not mask & occupancy]
+
+    def covering(self, size: int, x: int, y: int) -> List[int]:
+        self.placements(size)
+        return self._covering[size][y * self.grid_size + x]
+
+    def is_legal(self, positions: List[Tuple[int, int]]) -> bool:
+        size = len(positions)
+        if size == 0 or size > self.grid_size:
+            return False
+        mask = self.mask_for(positions)
+        self.placements(size)
+        return bin(mask).count('1') == size and mask in self._legal[size]
+
+    def random_fleet(self, ship_sizes: List[int], rng: Optional[random.Random] = None,
+                     occupied: int = 0, max_attempts: int = RANDOM_FLEET_MAX_ATTEMPTS) -> List[int]:
+        """Sortea una flota uniforme entre todas las válidas que no pisan ``occupied``.
+
+        Cada barco se elige al azar entre sus ubicaciones compatibles y la flota
+        entera se descarta si dos barcos se superponen (muestreo por rechazo), así
+        ninguna disposición sale más seguido que otra. Los barcos grandes se
+        sortean primero para descartar antes; la lista devuelta respeta el orden
+        de ``ship_sizes``.
+        """
+        rng = rng or random
+        order = sorted(range(len(ship_sizes)), key=lambda i: -ship_sizes[i])
+        options = [self.compatible(ship_sizes[i], occupied) if occupied else self.placements(ship_sizes[i])
+                   for i in order]
+        if not all(options):
+            raise ValueError("No hay lugar para la flota en el tablero")
+
+        for _ in range(max_attempts):
+            fleet_mask = occupied
+            fleet = [0] * len(ship_sizes)
+            for i, choices in zip(order, options):
+                mask = choices[int(rng.random() * len(choices))]
+                if mask & fleet_mask:
+                    break
+                fleet_mask |= mask
+                fleet[i] = mask
+            else:
+                return fleet
+        raise ValueError("No se encontró una flota válida para el tablero")
+
+    def _index_size(self, size: int) -> None:
+        masks: List[int] = []
+        covering: List[List[int]] = [[] for _ in range(self.grid_size * self.grid_size)]
+
+        for horizontal in (True, False):
+            for y in range(self.grid_size - (0 if horizontal else size - 1)):
+                for x in range(self.grid_size - (size - 1 if horizontal else 0)):
+                    cells = [(x + i, y) if horizontal else (x, y + i) for i in range(size)]
+                    mask = self.mask_for(cells)
+                    self._by_start[(size, x, y, horizontal)] = mask
+                    if size == 1 and not horizontal:
+                        continue
+                    masks.append(mask)
+                    for cell_x, cell_y in cells:
+                        covering[cell_y * self.grid_size + cell_x].append(mask)
+
+        self._placements[size] = masks
+        self._legal[size] = frozenset(masks)
+        self._covering[size] = covering
+
+
+@lru_cache(maxsize=None)
+def get_placement_index(grid_size: int = GRID_SIZE) -> PlacementIndex:
+    return PlacementIndex(grid_size)
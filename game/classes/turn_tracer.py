@@ -0,0 +1,119 @@
+import json
+import queue
+import threading
+import time
+import uuid
+import sys
+import os
+from typing import Optional, Any, Dict, List
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import (TRACE_FILE_ENV_VAR, TRACE_ID_LENGTH, TRACE_PENDING_TIMEOUT, TRACED_MESSAGE_TYPES,
+                       NETWORK_ENCODING, JSON_MESSAGE_DELIMITER)
+
+
+class TurnTracer:
+    """Mide en el cliente cuánto tarda una acción en volver dibujada a la pantalla.
+
+    Cada acción rastreada guarda cuándo se envió, cuándo llegó el resultado,
+    cuándo lo procesó ``GameScreen`` y cuándo se dibujó por primera vez. Los
+    spans se escriben como JSON-lines desde un hilo aparte para no frenar el
+    frame; el archivo se elige con ``BATTLESHIP_TRACE_FILE``. ``start`` y
+    ``mark_received`` corren en el hilo de red y el resto en el de pygame, así
+    que ``pending`` se toca siempre bajo ``_lock``.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path if path is not None else os.environ.get(TRACE_FILE_ENV_VAR)
+        self.enabled = bool(self.path)
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self._handled: List[str] = []
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def new_trace_id(self) -> str:
+        return uuid.uuid4().hex[:TRACE_ID_LENGTH]
+
+    def start(self, trace_id: str, message_type: str) -> None:
+        if not self.enabled or message_type not in TRACED_MESSAGE_TYPES:
+            return
+
+        now = time.perf_counter()
+        with self._lock:
+            self._discard_stale(now)
+            self.pending[trace_id] = {'message_type': message_type, 'sent_at': time.time(), 'sent': now}
+
+    def mark_received(self, trace_id: Optional[str]) -> None:
+        self._mark(trace_id, 'received')
+
+    def mark_handled(self, trace_id: Optional[str]) -> None:
+        if self._mark(trace_id, 'handled'):
+            self._handled.append(trace_id)
+
+    def mark_drawn(self) -> None:
+        if not self._handled:
+            return
+
+        now = time.perf_counter()
+        with self._lock:
+            drawn = [(trace_id, self.pending.pop(trace_id, None)) for trace_id in self._handled]
+        self._handled.clear()
+        for trace_id, entry in drawn:
+            if entry is not None:
+                entry['drawn'] = now
+                self._export(trace_id, entry)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+
+    def _mark(self, trace_id: Optional[str], stage: str) -> bool:
+        if not trace_id:
+            return False
+        with self._lock:
+            entry = self.pending.get(trace_id)
+            if entry is None or stage in entry:
+                return False
+            entry[stage] = time.perf_counter()
+            return True
+
+    def _discard_stale(self, now: float) -> None:
+        stale = [trace_id for trace_id, entry in self.pending.items()
+                 if now - entry['sent'] > TRACE_PENDING_TIMEOUT]
+        for trace_id in stale:
+            del self.pending[trace_id]
+
+    def _export(self, trace_id: str, entry: Dict[str, Any]) -> None:
+        stages = [('client.round_trip', 'sent', 'received'),
+                  ('client.dispatch', 'received', 'handled'),
+                  ('client.render', 'handled', 'drawn'),
+                  ('client.turn', 'sent', 'drawn')]
+
+        for name, begin, end in stages:
+            if begin in entry and end in entry:
+                self._write({
+                    'trace_id': trace_id,
+                    'name': name,
+                    'side': 'client',
+                    'message_type': entry['message_type'],
+                    'start': entry['sent_at'] + (entry[begin] - entry['sent']),
+                    'duration_ms': (entry[end] - entry[begin]) * 1000
+                })
+
+    def _write(self, span: Dict[str, Any]) -> None:
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_forever, daemon=True)
+            self._writer.start()
+        self._queue.put(span)
+
+    def _write_forever(self) -> None:
+        with open(self.path, 'a', encoding=NETWORK_ENCODING) as trace_file:
+            while True:
+                span = self._queue.get()
+                if span is None:
+                    return
+                trace_file.write(json.dumps(span) + JSON_MESSAGE_DELIMITER)
+                trace_file.flush()
@@ -117,6 +117,8 @@ COLOR_BUTTON_START_HOVER = (50, 205, 50)
 COLOR_BUTTON_DISABLED = (100, 100, 100)
 COLOR_BUTTON_CANCEL = (180, 70, 70)
 COLOR_BUTTON_CANCEL_HOVER = (220, 100, 100)
+COLOR_BUTTON_AI = (128, 90, 160)
+COLOR_BUTTON_AI_HOVER = (160, 120, 200)
 COLOR_BUTTON_MUTE = (70, 70, 70)
 COLOR_BUTTON_MUTE_HOVER = (100, 100, 100)
 COLOR_BUTTON_BOMB = (180, 70, 70)
@@ -195,7 +197,12 @@ SOUND_WATER_SPLASH = "assets/sounds/waterSplash.mp3"
 
 MENU_BUTTON_Y_CONNECT = 400
 MENU_BUTTON_Y_START = 500
-MENU_STATUS_Y = 620
+MENU_BUTTON_Y_AI = 600
+MENU_STATUS_Y = 700
+MENU_LEADERBOARD_X = 40
+MENU_LEADERBOARD_Y = 400
+MENU_LEADERBOARD_LINE_HEIGHT = 30
+MENU_LEADERBOARD_ROWS = 5
 
 GAME_TITLE_Y = 35
 GAME_INFO_Y_OFFSET = 75
@@ -235,11 +242,15 @@ MENU_TEXT = {
     'CONNECT_DEFAULT': 'Conectar a Servidor',
     'CONNECT_CONNECTED': 'Conectado',
     'START_GAME': 'Iniciar Partida',
+    'PLAY_VS_AI': 'Jugar contra la IA',
     'MUTE_MUSIC': 'Silenciar',
     'UNMUTE_MUSIC': 'Musica',
     'STATUS_DISCONNECTED': "Desconectado del servidor",
     'STATUS_CONNECTING': "Conectado - Esperando segundo jugador...",
     'STATUS_READY': "¡2 jugadores conectados! Listo para iniciar",
+    'LEADERBOARD_TITLE': "Ranking",
+    'LEADERBOARD_ROW': "{rank}. {player_id}  {rating}",
+    'LEADERBOARD_YOU': "Tu puesto: {rank} ({rating})",
     'MUSIC_MUTED': "Música silenciada",
     'MUSIC_UNMUTED': "Música reactivada",
     'ASSET_ERROR': "No se pudo cargar menu.png, usando fondo de color"
@@ -251,6 +262,7 @@ MENU_BACKGROUND_COLOR_DEFAULT = (30, 30, 60)
 MENU_EVENTS = {
     'CONNECT': "connect",
     'START_GAME': "start_game", 
+    'PLAY_VS_AI': "play_vs_ai",
     'TOGGLE_MUSIC': "toggle_music"
 }
 
@@ -304,6 +316,8 @@ SHIP_PREVIEW_COLOR_INVALID = (255, 50, 50)
 MOUSE_LEFT_BUTTON = 1
 MOUSE_RIGHT_BUTTON = 3
 KEY_ROTATE = pygame.K_r
+KEY_AUTO_PLACE = pygame.K_a
+KEY_TOGGLE_LATENCY_HUD = pygame.K_F3
 
 GAME_TEXT = {
     'TITLE': "BATALLA NAVAL",
@@ -311,12 +325,15 @@ GAME_TEXT = {
     'ENEMY': "ENEMIGO",
     'MY_SHIPS': "MIS BARCOS",
     'ENEMY_SHIPS': "BARCOS ENEMIGOS",
-    'PLACING_SHIP': "Colocando barco de tamaño {} ({}) - Click derecho o R para rotar",
+    'PLACING_SHIP': "Colocando barco de tamaño {} ({}) - Click derecho o R para rotar, A para colocar al azar",
     'ALL_SHIPS_PLACED': "Todos los barcos colocados - Esperando al oponente...",
     'YOUR_TURN': "¡Tu turno! Haz click en el tablero enemigo para disparar",
     'OPPONENT_TURN': "Turno del oponente - Espera tu turno...",
     'WAITING_BATTLE': "Barcos colocados - Esperando que inicie la batalla...",
     'PREPARING': "Preparando juego...",
+    'RECONNECTING': "Conexión perdida - Reconectando (intento {})...",
+    'LATENCY_HUD': "RTT {:.0f} ms | jitter {:.1f} ms",
+    'LATENCY_HUD_NO_DATA': "RTT --",
     'REMAINING_SHIPS': "Barcos restantes: {}",
     'HORIZONTAL': "Horizontal",
     'VERTICAL': "Vertical",
@@ -378,20 +395,57 @@ SHOT_RESULTS = {
 
 DEFAULT_SERVER_HOST = "127.0.0.1"
 DEFAULT_SERVER_PORT = 8888
-NETWORK_BUFFER_SIZE = 1024
 NETWORK_TIMEOUT = 1.0
+MAX_FRAME_SIZE = 64 * 1024
 CONNECTION_CHECK_INTERVAL = 1.0
+RECONNECT_BASE_DELAY = 0.5
+RECONNECT_MAX_DELAY = 8.0
+RECONNECT_GIVE_UP_AFTER = 30.0
+RECONNECT_ATTEMPT_TIMEOUT = 3.0
 
 THREAD_DAEMON_MODE = True
+NETWORK_THREAD_JOIN_TIMEOUT = 2.0
 NETWORK_ENCODING = 'utf-8'
-MESSAGE_BUFFER_SPLIT_LIMIT = 1
 JSON_MESSAGE_DELIMITER = '\n'
+JSON_MESSAGE_DELIMITER_BYTES = JSON_MESSAGE_DELIMITER.encode(NETWORK_ENCODING)
+
+UNIX_SOCKET_ENV_VAR = 'BATTLESHIP_UNIX_SOCKET'
+TRACE_FILE_ENV_VAR = 'BATTLESHIP_TRACE_FILE'
+CLIENT_ID_FILE = os.path.join(os.path.expanduser('~'), '.battleship_client_id')
+CLIENT_ID_BYTES = 16
+CLIENT_ID_PATTERN = r'[A-Za-z0-9_-]{16,64}'
+TRACE_ID_LENGTH = 16
+TRACE_PENDING_TIMEOUT = 10.0
+TRACED_MESSAGE_TYPES = ('shot', 'bomb_attack', 'air_strike')
+
+PING_INTERVAL = 1.0
+SNAPSHOT_REQUEST_TIMEOUT = 2.0
+RTT_SMOOTHING_FACTOR = 1 / 8
+RTT_JITTER_GAIN = 1 / 16
+LATENCY_MAX_SAMPLES = 3600
+LATENCY_PERCENTILES = (50, 95, 99)
+LATENCY_HUD_ENV_VAR = 'BATTLESHIP_LATENCY_HUD'
+LATENCY_HUD_MARGIN = 10
+LATENCY_HUD_PADDING = 4
+LATENCY_HUD_BACKGROUND = (0, 0, 0, 150)
 
 MESSAGE_TYPES = {
     'PLAYER_CONNECT': 'player_connect',
     'PLAYERS_READY': 'players_ready',
     'GAME_START': 'game_start',
     'GAME_UPDATE': 'game_update',
+    'GAME_STATE_DELTA': 'game_state_delta',
+    'STATE_REQUEST': 'state_request',
+    'PLAY_VS_AI': 'play_vs_ai',
+    'JOIN': 'join',
+    'SHIPS_AUTO_PLACED': 'ships_auto_placed',
+    'LEADERBOARD_REQUEST': 'leaderboard_request',
+    'LEADERBOARD': 'leaderboard',
+    'RESUME': 'resume',
+    'RESUMED': 'resumed',
+    'PING': 'ping',
+    'PONG': 'pong',
+    'LATENCY_REPORT': 'latency_report',
     'SHOT_RESULT': 'shot_result',
     'GAME_OVER': 'game_over',
     'PLAYER_DISCONNECT': 'player_disconnect',
@@ -403,6 +457,21 @@ MESSAGE_TYPES = {
     'START_GAME': 'start_game'
 }
 
+SERVER_DISCONNECT_EVENT = 'server_disconnect'
+RECONNECTING_EVENT = 'reconnecting'
+NETWORK_EVENTS = (
+    MESSAGE_TYPES['PLAYERS_READY'],
+    MESSAGE_TYPES['GAME_START'],
+    MESSAGE_TYPES['GAME_UPDATE'],
+    MESSAGE_TYPES['SHOT_RESULT'],
+    MESSAGE_TYPES['GAME_OVER'],
+    MESSAGE_TYPES['LEADERBOARD'],
+    MESSAGE_TYPES['SHIPS_AUTO_PLACED'],
+    MESSAGE_TYPES['RESUMED'],
+    SERVER_DISCONNECT_EVENT,
+    RECONNECTING_EVENT
+)
+
 NETWORK_LOG_MESSAGES = {
     'NOT_CONNECTED': "No conectado al servidor",
     'SEND_SUCCESS': "Mensaje enviado exitosamente",
@@ -416,7 +485,9 @@ NETWORK_LOG_MESSAGES = {
     'UNKNOWN_PLAYER': 'desconocido',
     'DEFAULT_DISCONNECT_MESSAGE': 'Jugador desconectado',
     'DEFAULT_ERROR_MESSAGE': 'Error desconocido',
-    'NO_CONNECTION': "ERROR: No hay conexión al servidor"
+    'NO_CONNECTION': "ERROR: No hay conexión al servidor",
+    'TASK_FAILED': "Falló una tarea de red",
+    'FRAME_TOO_LARGE': "El servidor mandó un mensaje demasiado grande; se cierra la conexión"
 }
 
 MAX_PLAYERS = 2
@@ -555,6 +626,13 @@ MISSILE_FIN_WIDTH = 4
 MISSILE_FIN_HEIGHT = 7
 MISSILE_FIN_OFFSET = 12
 
+PENDING_SHOT_TIMEOUT_MS = 3000
+PENDING_SHOT_FALL_MS = 350
+PENDING_SHOT_PULSE_MS = 600
+PENDING_SHOT_COLOR = (255, 200, 0)
+PENDING_SHOT_MISSILE_COLOR = (90, 90, 90)
+PENDING_SHOT_RING_WIDTH = 2
+
 SHIP_HULL_MARGIN = 6
 SHIP_DECK_MARGIN = 4
 SHIP_DECK_THICKNESS = 8
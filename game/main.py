@@ -45,7 +45,7 @@ if __name__ == "__main__":
     try:
         host, port = get_connection_config()
         client = BattleshipClient()
-        client.set_connection_params(host, port)
+        client.set_connection_params(host, port, os.environ.get(UNIX_SOCKET_ENV_VAR))
         client.run()
     except Exception as e:
         print(f"Error: {e}")
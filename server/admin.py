@@ -0,0 +1,38 @@
+import argparse
+import asyncio
+import json
+import tempfile
+import sys
+import os
+
+sys.dont_write_bytecode = True
+
+from constants import DEFAULT_SERVER_PORT, ADMIN_SOCKET_NAME, UTF8_ENCODING, JSON_MESSAGE_DELIMITER
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Consola de administración del servidor de Batalla Naval")
+    parser.add_argument('command', nargs='+',
+                        help="rooms | connections | kick <player_id> | end <room_id> | profile on|off | stats <player_id>")
+    parser.add_argument('--port', type=int, default=DEFAULT_SERVER_PORT,
+                        help="Puerto del servidor, para encontrar su socket por defecto")
+    parser.add_argument('--socket', default=None, help="Ruta del socket de administración")
+    return parser.parse_args()
+
+async def send_command(path: str, command: str) -> dict:
+    reader, writer = await asyncio.open_unix_connection(path)
+    try:
+        writer.write((command + JSON_MESSAGE_DELIMITER).encode(UTF8_ENCODING))
+        await writer.drain()
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    path = args.socket or os.path.join(tempfile.gettempdir(), ADMIN_SOCKET_NAME.format(port=args.port))
+    response = asyncio.run(send_command(path, ' '.join(args.command)))
+    if response.get('ok') and isinstance(response.get('result'), dict) and 'top' in response['result']:
+        print(response['result'].pop('top'))
+    print(json.dumps(response, indent=2, ensure_ascii=False))
+    sys.exit(0 if response.get('ok') else 1)
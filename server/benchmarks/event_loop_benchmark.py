@@ -0,0 +1,105 @@
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+import os
+import time
+from typing import Dict, Any, List
+
+sys.path.append(os.path.dirname(__file__))
+from load_client import measure_connection_rate, measure_shot_latency, DEFAULT_SHOT_INTERVAL
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import DEFAULT_HOST_LOOPBACK
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(__file__), '..', 'server.py')
+BENCHMARK_PORT = 8890
+SERVER_STARTUP_TIMEOUT = 10.0
+EVENT_LOOPS = ('asyncio', 'uvloop')
+
+
+def start_server(loop_name: str, port: int) -> subprocess.Popen:
+    # Las partidas de los bots no deben llegar a las estadísticas ni al ranking reales.
+    command = [sys.executable, SERVER_SCRIPT, '--host', DEFAULT_HOST_LOOPBACK, '--port', str(port),
+               '--no-admin-socket', '--no-stats-db']
+    if loop_name == 'uvloop':
+        command.append('--uvloop')
+    return subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+
+def read_log_event(process: subprocess.Popen) -> Dict[str, Any]:
+    try:
+        return json.loads(process.stdout.readline())
+    except json.JSONDecodeError:
+        return {}
+
+
+def discard_output(process: subprocess.Popen) -> None:
+    for _ in process.stdout:
+        pass
+
+
+def wait_for_server_loop(process: subprocess.Popen) -> str:
+    deadline = time.monotonic() + SERVER_STARTUP_TIMEOUT
+    loop_name = 'desconocido'
+    while time.monotonic() < deadline:
+        entry = read_log_event(process)
+        if entry.get('event') == 'event_loop_selected':
+            loop_name = entry['event_loop']
+        if entry.get('event') == 'server_started':
+            threading.Thread(target=discard_output, args=(process,), daemon=True).start()
+            return loop_name
+    raise RuntimeError("El servidor no arrancó a tiempo")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=SERVER_STARTUP_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+async def benchmark_loop(loop_name: str, args) -> Dict[str, Any]:
+    process = start_server(loop_name, args.port)
+    try:
+        effective_loop = wait_for_server_loop(process)
+        await asyncio.sleep(0.2)
+        connections = await measure_connection_rate(DEFAULT_HOST_LOOPBACK, args.port, args.connections)
+        latency = await measure_shot_latency(DEFAULT_HOST_LOOPBACK, args.port, args.matches, args.shot_interval)
+        return {'requested': loop_name, 'effective': effective_loop, 'connections': connections, 'latency': latency}
+    finally:
+        stop_server(process)
+
+
+def print_report(results: List[Dict[str, Any]]) -> None:
+    print(f"{'loop':<10}{'conn/s':>10}{'disparos':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for result in results:
+        connections, latency = result['connections'], result['latency']
+        label = result['effective'] if result['effective'] == result['requested'] else f"{result['requested']}*"
+        print(f"{label:<10}{connections['connections_per_second']:>10.0f}{latency['shots']:>10}"
+              f"{latency.get('p50_ms', 0):>10.3f}{latency.get('p95_ms', 0):>10.3f}{latency.get('p99_ms', 0):>10.3f}")
+    if any(result['effective'] != result['requested'] for result in results):
+        print("* uvloop no está instalado; el servidor usó el loop de asyncio")
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Compara asyncio y uvloop con el cliente de carga")
+    parser.add_argument('--port', type=int, default=BENCHMARK_PORT)
+    parser.add_argument('--connections', type=int, default=400)
+    parser.add_argument('--matches', type=int, default=50)
+    parser.add_argument('--shot-interval', type=float, default=DEFAULT_SHOT_INTERVAL)
+    return parser.parse_args()
+
+
+async def main(args) -> None:
+    results = []
+    for loop_name in EVENT_LOOPS:
+        results.append(await benchmark_loop(loop_name, args))
+    print_report(results)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_arguments()))
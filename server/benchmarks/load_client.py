@@ -0,0 +1,356 @@
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import os
+import time
+from typing import Dict, Optional, Any, List
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import (DEFAULT_HOST_LOOPBACK, DEFAULT_SERVER_PORT, GRID_SIZE, MESSAGE_TYPES,
+                       JSON_MESSAGE_DELIMITER, UTF8_ENCODING, SHOT_RESULT_MISS, RATE_LIMIT_MESSAGES_PER_SECOND,
+                       SHIP_SIZES, CHANNEL_OPEN_PER_SECOND, CHANNEL_OPEN_BURST)
+from classes.token_bucket import TokenBucket
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'game', 'classes'))
+from placement_index import get_placement_index
+
+LOAD_TEST_FLEET = [
+    [[0, 0], [1, 0], [2, 0], [3, 0], [4, 0]],
+    [[0, 2], [1, 2], [2, 2], [3, 2]],
+    [[0, 4], [1, 4], [2, 4]],
+    [[0, 6], [1, 6], [2, 6]],
+    [[0, 8], [1, 8]]
+]
+DEFAULT_SHOT_INTERVAL = 1.5 / RATE_LIMIT_MESSAGES_PER_SECOND
+CONNECT_TIMEOUT = 10.0
+MATCH_TIMEOUT = 120.0
+PERCENTILES = (50, 95, 99)
+
+
+def random_load_test_fleet(rng: Optional[random.Random] = None) -> List[List[List[int]]]:
+    placement_index = get_placement_index(GRID_SIZE)
+    return [[list(cell) for cell in placement_index.positions(mask)]
+            for mask in placement_index.random_fleet(SHIP_SIZES, rng)]
+
+
+class MuxConnection:
+    """Una única conexión que lleva los canales de muchos bots a la vez."""
+
+    def __init__(self, host: str, port: int, unix_path: Optional[str] = None):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.bots: Dict[int, 'LoadTestBot'] = {}
+        self._next_channel = 0
+        self._receive_task: Optional[asyncio.Task] = None
+        self.open_budget: Optional[TokenBucket] = None
+
+    async def connect(self) -> None:
+        if self.unix_path:
+            self.reader, self.writer = await asyncio.open_unix_connection(self.unix_path)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self._receive_task = asyncio.create_task(self._receive_loop())
+        # Copia del presupuesto de channel_open del servidor, para no pasarse al abrir muchos.
+        self.open_budget = TokenBucket(CHANNEL_OPEN_PER_SECOND, CHANNEL_OPEN_BURST)
+
+    def attach(self, bot: 'LoadTestBot') -> int:
+        channel = self._next_channel
+        self._next_channel += 1
+        self.bots[channel] = bot
+        return channel
+
+    async def open_channel(self, channel: int) -> None:
+        while not self.open_budget.consume():
+            await asyncio.sleep(1 / CHANNEL_OPEN_PER_SECOND)
+        await self.send({'type': MESSAGE_TYPES['CHANNEL_OPEN'], 'channel': channel})
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        self.writer.write((json.dumps(message) + JSON_MESSAGE_DELIMITER).encode(UTF8_ENCODING))
+        await self.writer.drain()
+
+    async def close(self) -> None:
+        if self._receive_task:
+            self._receive_task.cancel()
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def _receive_loop(self) -> None:
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                for bot in self.bots.values():
+                    bot.mark_disconnected()
+                return
+            message = json.loads(line)
+            bot = self.bots.get(message.get('channel'))
+            if bot is not None:
+                bot._handle_message(message)
+
+
+class LoadTestBot:
+    """Cliente headless que juega una partida completa contra el servidor."""
+
+    def __init__(self, host: str, port: int, shot_interval: float = DEFAULT_SHOT_INTERVAL,
+                 unix_path: Optional[str] = None, mux: Optional[MuxConnection] = None,
+                 fleet: Optional[List[List[List[int]]]] = None):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.mux = mux
+        self.channel: Optional[int] = None
+        self.shot_interval = shot_interval
+        self.fleet = fleet or LOAD_TEST_FLEET
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.player_id: Optional[str] = None
+        self.room_id: Optional[str] = None
+        self.current_turn: Optional[str] = None
+        self.players_ready = False
+        self.game_started = False
+        self.game_over = False
+        self.shot_latencies: List[float] = []
+        self.state_latencies: List[float] = []
+        self._connected = asyncio.Event()
+        self.open_rejected = False
+        self._state_changed = asyncio.Event()
+        self._shot_sent_at: Optional[float] = None
+        self._state_requested_at: Optional[float] = None
+        self._receive_task: Optional[asyncio.Task] = None
+
+    async def connect(self) -> float:
+        started = time.perf_counter()
+        if self.mux is not None:
+            self.channel = self.mux.attach(self)
+            deadline = time.monotonic() + CONNECT_TIMEOUT
+            while not self._connected.is_set():
+                # El reloj del servidor no es el nuestro: si igual rechaza el canal, se vuelve a pedir.
+                self.open_rejected = False
+                await self.mux.open_channel(self.channel)
+                await self.wait_until(lambda: self._connected.is_set() or self.open_rejected,
+                                      timeout=deadline - time.monotonic())
+            return time.perf_counter() - started
+        if self.unix_path:
+            self.reader, self.writer = await asyncio.open_unix_connection(self.unix_path)
+        else:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self._receive_task = asyncio.create_task(self._receive_loop())
+        await self.send(MESSAGE_TYPES['JOIN'])
+        await asyncio.wait_for(self._connected.wait(), timeout=CONNECT_TIMEOUT)
+        return time.perf_counter() - started
+
+    async def close(self) -> None:
+        if self.mux is not None:
+            if self.channel is not None and not self.mux.writer.is_closing():
+                await self.mux.send({'type': MESSAGE_TYPES['CHANNEL_CLOSE'], 'channel': self.channel})
+            return
+        if self._receive_task:
+            self._receive_task.cancel()
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def send(self, message_type: str, data: Optional[Dict[str, Any]] = None) -> None:
+        message = {'type': message_type, 'player_id': self.player_id, 'data': data or {}}
+        if self.mux is not None:
+            message['channel'] = self.channel
+            await self.mux.send(message)
+            return
+        self.writer.write((json.dumps(message) + JSON_MESSAGE_DELIMITER).encode(UTF8_ENCODING))
+        await self.writer.drain()
+
+    async def _receive_loop(self) -> None:
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                self.mark_disconnected()
+                return
+            self._handle_message(json.loads(line))
+
+    def mark_disconnected(self) -> None:
+        self.game_over = True
+        self._state_changed.set()
+
+    def _handle_message(self, message: Dict[str, Any]) -> None:
+        message_type = message.get('type')
+        data = message.get('data') or {}
+
+        if message_type == MESSAGE_TYPES['PLAYER_CONNECT']:
+            self.player_id = data.get('player_id')
+            self.room_id = data.get('room_id')
+            self._connected.set()
+        elif message_type == MESSAGE_TYPES['PLAYERS_READY']:
+            self.players_ready = data.get('players_ready', False)
+        elif message_type == MESSAGE_TYPES['GAME_START']:
+            self.game_started = True
+        elif message_type == MESSAGE_TYPES['GAME_UPDATE']:
+            self.current_turn = data.get('current_turn')
+            self._record_state_latency()
+        elif message_type == MESSAGE_TYPES['GAME_STATE_DELTA']:
+            self.current_turn = data.get('changes', {}).get('current_turn', self.current_turn)
+        elif message_type == MESSAGE_TYPES['SHOT_RESULT']:
+            self._handle_shot_result(data)
+        elif message_type == MESSAGE_TYPES['GAME_OVER']:
+            self.game_over = True
+        elif message_type == MESSAGE_TYPES['ERROR'] and not self._connected.is_set():
+            self.open_rejected = True
+
+        self._state_changed.set()
+
+    def _handle_shot_result(self, data: Dict[str, Any]) -> None:
+        if data.get('shooter') != self.player_id or self._shot_sent_at is None:
+            return
+
+        self.shot_latencies.append(time.perf_counter() - self._shot_sent_at)
+        self._shot_sent_at = None
+        if data.get('result') == SHOT_RESULT_MISS:
+            self.current_turn = None
+
+    def _record_state_latency(self) -> None:
+        if self._state_requested_at is not None:
+            self.state_latencies.append(time.perf_counter() - self._state_requested_at)
+            self._state_requested_at = None
+
+    async def request_state(self) -> None:
+        self._state_requested_at = time.perf_counter()
+        await self.send(MESSAGE_TYPES['STATE_REQUEST'])
+        await self.wait_until(lambda: self._state_requested_at is None)
+
+    async def wait_until(self, predicate, timeout: float = MATCH_TIMEOUT) -> None:
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            self._state_changed.clear()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            await asyncio.wait_for(self._state_changed.wait(), timeout=remaining)
+
+    async def play(self) -> None:
+        await self.send(MESSAGE_TYPES['PLACE_SHIPS'], {'ships': self.fleet})
+        targets = [(x, y) for y in range(GRID_SIZE) for x in range(GRID_SIZE)]
+
+        while not self.game_over and targets:
+            await self.wait_until(lambda: self.game_over or
+                                  (self.current_turn == self.player_id and self._shot_sent_at is None))
+            if self.game_over:
+                break
+
+            x, y = targets.pop(0)
+            self._shot_sent_at = time.perf_counter()
+            await self.send(MESSAGE_TYPES['SHOT'], {'x': x, 'y': y})
+            await asyncio.sleep(self.shot_interval)
+
+
+async def run_match(bots: List[LoadTestBot]) -> List[float]:
+    await bots[0].wait_until(lambda: bots[0].players_ready)
+    await bots[0].send(MESSAGE_TYPES['START_GAME'])
+    await asyncio.gather(*(bot.wait_until(lambda bot=bot: bot.game_started) for bot in bots))
+    await asyncio.gather(*(bot.play() for bot in bots))
+    return [latency for bot in bots for latency in bot.shot_latencies]
+
+
+async def connect_match_bots(host: str, port: int, matches: int, shot_interval: float,
+                             muxes: Optional[List[MuxConnection]] = None,
+                             random_fleets: bool = False,
+                             rng: Optional[random.Random] = None) -> List[List[LoadTestBot]]:
+    rooms: Dict[str, List[LoadTestBot]] = {}
+    for index in range(matches * 2):
+        mux = muxes[index % len(muxes)] if muxes else None
+        fleet = random_load_test_fleet(rng) if random_fleets else None
+        bot = LoadTestBot(host, port, shot_interval, mux=mux, fleet=fleet)
+        await bot.connect()
+        rooms.setdefault(bot.room_id, []).append(bot)
+    return list(rooms.values())
+
+
+async def open_mux_connections(host: str, port: int, count: int) -> List[MuxConnection]:
+    muxes = [MuxConnection(host, port) for _ in range(count)]
+    await asyncio.gather(*(mux.connect() for mux in muxes))
+    return muxes
+
+
+async def measure_connection_rate(host: str, port: int, connections: int) -> Dict[str, float]:
+    bots = [LoadTestBot(host, port) for _ in range(connections)]
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(bot.connect() for bot in bots))
+        elapsed = time.perf_counter() - started
+    finally:
+        await asyncio.gather(*(bot.close() for bot in bots))
+    return {'connections': connections, 'seconds': elapsed, 'connections_per_second': connections / elapsed}
+
+
+async def measure_shot_latency(host: str, port: int, matches: int,
+                               shot_interval: float = DEFAULT_SHOT_INTERVAL,
+                               mux_connections: int = 0, random_fleets: bool = False,
+                               seed: Optional[int] = None) -> Dict[str, float]:
+    muxes = await open_mux_connections(host, port, mux_connections) if mux_connections else []
+    rooms = await connect_match_bots(host, port, matches, shot_interval, muxes, random_fleets,
+                                     random.Random(seed))
+    started = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(run_match(bots) for bots in rooms))
+    finally:
+        await asyncio.gather(*(bot.close() for bots in rooms for bot in bots))
+        await asyncio.gather(*(mux.close() for mux in muxes))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(latency for match in results for latency in match)
+    summary = summarize_latencies(latencies, len(rooms), elapsed)
+    summary['connections'] = len(muxes) or matches * 2
+    return summary
+
+
+def summarize_latencies(latencies: List[float], matches: int, elapsed: float) -> Dict[str, float]:
+    summary = {'matches': matches, 'shots': len(latencies), 'seconds': elapsed}
+    if not latencies:
+        return summary
+
+    summary['mean_ms'] = statistics.fmean(latencies) * 1000
+    for percentile in PERCENTILES:
+        index = min(len(latencies) - 1, int(len(latencies) * percentile / 100))
+        summary[f'p{percentile}_ms'] = latencies[index] * 1000
+    return summary
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Cliente de carga para el servidor de Batalla Naval")
+    parser.add_argument('--host', default=DEFAULT_HOST_LOOPBACK)
+    parser.add_argument('--port', type=int, default=DEFAULT_SERVER_PORT)
+    parser.add_argument('--connections', type=int, default=200)
+    parser.add_argument('--matches', type=int, default=20)
+    parser.add_argument('--shot-interval', type=float, default=DEFAULT_SHOT_INTERVAL)
+    parser.add_argument('--mux', type=int, default=0,
+                        help="Multiplexar las partidas sobre esta cantidad de conexiones (canales)")
+    parser.add_argument('--random-fleets', action='store_true',
+                        help="Cada bot coloca una flota al azar en lugar de la flota fija")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Semilla de las flotas al azar, para repetir una corrida")
+    return parser.parse_args()
+
+
+async def main(args) -> None:
+    connection_stats = await measure_connection_rate(args.host, args.port, args.connections)
+    print(f"Conexiones: {connection_stats['connections_per_second']:.0f}/s "
+          f"({connection_stats['connections']} en {connection_stats['seconds']:.2f}s)")
+
+    latency_stats = await measure_shot_latency(args.host, args.port, args.matches, args.shot_interval,
+                                               args.mux, args.random_fleets, args.seed)
+    print(f"Disparos: {latency_stats['shots']} en {latency_stats['matches']} partidas "
+          f"sobre {latency_stats['connections']} conexiones, "
+          f"p50 {latency_stats.get('p50_ms', 0):.2f} ms, p99 {latency_stats.get('p99_ms', 0):.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_arguments()))
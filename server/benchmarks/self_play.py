@@ -0,0 +1,279 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Any, List, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import (GRID_SIZE, SHIP_SIZES, BOMB_ATTACK_AREA_SIZE, AIR_STRIKE_WIDTH, AVAILABLE_BOMBS,
+                       AVAILABLE_AIR_STRIKES, MESSAGE_TYPES, ROOM_SEED_BITS)
+from classes.enums import GameState, MessageType
+from classes.game_room import GameRoom
+from classes.player import Player
+from classes.ai_targeting import ProbabilityTargeting, NUMPY_AVAILABLE
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'game', 'classes'))
+from placement_index import get_placement_index
+
+DEFAULT_GAMES = 10000
+DEFAULT_BATCH_SIZE = 250
+ATTACK_TYPES = ('shot', 'bomb', 'air_strike')
+ATTACK_MESSAGES = {
+    'shot': MESSAGE_TYPES['SHOT'],
+    'bomb': MESSAGE_TYPES['BOMB_ATTACK'],
+    'air_strike': MESSAGE_TYPES['AIR_STRIKE']
+}
+AREA_SHAPES = {
+    'bomb': (BOMB_ATTACK_AREA_SIZE, BOMB_ATTACK_AREA_SIZE),
+    'air_strike': (1, AIR_STRIKE_WIDTH)
+}
+PERCENTILES = (50, 95, 99)
+
+
+class RandomTargeting:
+    """Estrategia de referencia: dispara a celdas no repetidas al azar."""
+
+    def __init__(self, grid_size: int = GRID_SIZE, rng: Optional[random.Random] = None):
+        self.grid_size = grid_size
+        self.rng = rng or random.Random()
+        self.pending = [(x, y) for y in range(grid_size) for x in range(grid_size)]
+        self.rng.shuffle(self.pending)
+        self.shots = set()
+
+    def record(self, x: int, y: int, result: str, ship_info: Optional[Dict[str, Any]] = None) -> None:
+        self.shots.add((x, y))
+
+    def next_target(self) -> Tuple[int, int]:
+        while self.pending:
+            cell = self.pending.pop()
+            if cell not in self.shots:
+                return cell
+        return self.rng.randrange(self.grid_size), self.rng.randrange(self.grid_size)
+
+    def is_hunting(self) -> bool:
+        return True
+
+    def best_area_target(self, height: int, width: int) -> List[Tuple[int, int]]:
+        x = self.rng.randrange(self.grid_size - width + 1)
+        y = self.rng.randrange(self.grid_size - height + 1)
+        return [(x + dx, y + dy) for dy in range(height) for dx in range(width)]
+
+
+STRATEGIES = {
+    'density': ProbabilityTargeting,
+    'random': RandomTargeting
+}
+
+
+class SimulatedSide(Player):
+    """Un jugador simulado sentado en una ``GameRoom`` real, sin conexión.
+
+    De lo que le manda la sala solo mira sus propios ``shot_result`` (para la
+    estrategia) y el ``game_over``. Mientras no tenga un barco herido a medio
+    hundir usa primero el ataque aéreo y después las bombas sobre la zona de
+    más densidad; el resto del tiempo dispara de a una celda.
+    """
+
+    def __init__(self, name: str, strategy: str, bombs: int, air_strikes: int, rng: random.Random):
+        super().__init__(name, writer=None)
+        placement_index = get_placement_index(GRID_SIZE)
+        self.fleet = [[list(cell) for cell in placement_index.positions(mask)]
+                      for mask in placement_index.random_fleet(SHIP_SIZES, rng)]
+        self.targeting = STRATEGIES[strategy](rng=rng)
+        self.specials = {'bomb': bombs, 'air_strike': air_strikes}
+        self.won = False
+
+    def is_connection_closed(self) -> bool:
+        return False
+
+    async def send_message(self, message_type: MessageType, data: Optional[Any] = None) -> bool:
+        if message_type == MessageType.SHOT_RESULT and data['shooter'] == self.player_id:
+            self.targeting.record(data['x'], data['y'], data['result'], data.get('ship_info'))
+        elif message_type == MessageType.GAME_OVER:
+            self.won = data['is_winner']
+        return True
+
+    async def send_bounded_error(self, error_message: str) -> bool:
+        # La sala rechazó el ataque: el turno no avanzaría nunca.
+        raise RuntimeError(f"{self.player_id}: {error_message}")
+
+    def choose_attack(self) -> Tuple[str, List[Tuple[int, int]]]:
+        if self.targeting.is_hunting():
+            for attack in ('air_strike', 'bomb'):
+                if self.specials[attack] > 0:
+                    self.specials[attack] -= 1
+                    return attack, self.targeting.best_area_target(*AREA_SHAPES[attack])
+        return 'shot', [self.targeting.next_target()]
+
+
+def attack_message(attack: str, cells: List[Tuple[int, int]]) -> Dict[str, Any]:
+    if attack == 'shot':
+        data = {'x': cells[0][0], 'y': cells[0][1]}
+    else:
+        data = {'targets': [list(cell) for cell in cells]}
+    return {'type': ATTACK_MESSAGES[attack], 'data': data}
+
+
+async def play_game(config: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    """Juega una partida completa en una ``GameRoom`` del servidor.
+
+    Los mensajes entran por ``process_message`` como los de un cliente, así
+    turnos, resultado de cada disparo, conteo de aciertos y fin de partida
+    son los de la sala; acá solo se elige qué atacar.
+    """
+    room = GameRoom(seed=rng.getrandbits(ROOM_SEED_BITS))
+    sides = [SimulatedSide(name, config[f'strategy_{name}'], config[f'bombs_{name}'],
+                           config[f'air_strikes_{name}'], rng) for name in ('a', 'b')]
+    by_id = {side.player_id: side for side in sides}
+    for side in sides:
+        await room.add_player(side)
+    await room.process_message(sides[0].player_id, {'type': MESSAGE_TYPES['START_GAME'], 'data': {}})
+    for side in sides:
+        await room.process_message(side.player_id, {'type': MESSAGE_TYPES['PLACE_SHIPS'],
+                                                     'data': {'ships': side.fleet}})
+
+    attacks = {attack: Counter() for attack in ATTACK_TYPES}
+    first = sides.index(by_id[room.current_turn])
+    turns = 0
+
+    while room.game_state == GameState.BATTLE_PHASE:
+        turns += 1
+        shooter = by_id[room.current_turn]
+        attack, cells = shooter.choose_attack()
+        fired, hit = shooter.shots_fired, shooter.shots_hit
+        await room.process_message(shooter.player_id, attack_message(attack, cells))
+        attacks[attack]['uses'] += 1
+        attacks[attack]['cells'] += shooter.shots_fired - fired
+        attacks[attack]['hits'] += shooter.shots_hit - hit
+
+    winner = next(index for index, side in enumerate(sides) if side.won)
+    return {'winner': winner, 'first': first, 'shots': sides[winner].shots_fired,
+            'turns': turns, 'attacks': attacks}
+
+
+def new_stats() -> Dict[str, Any]:
+    return {
+        'games': 0,
+        'wins': [0, 0],
+        'first_mover_wins': 0,
+        'shots_to_win': Counter(),
+        'turns': Counter(),
+        'attacks': {attack: Counter() for attack in ATTACK_TYPES}
+    }
+
+
+def merge_stats(total: Dict[str, Any], partial: Dict[str, Any]) -> Dict[str, Any]:
+    total['games'] += partial['games']
+    total['wins'] = [a + b for a, b in zip(total['wins'], partial['wins'])]
+    total['first_mover_wins'] += partial['first_mover_wins']
+    total['shots_to_win'].update(partial['shots_to_win'])
+    total['turns'].update(partial['turns'])
+    for attack in ATTACK_TYPES:
+        total['attacks'][attack].update(partial['attacks'][attack])
+    return total
+
+
+def run_batch(job: Tuple[Dict[str, Any], int, int]) -> Dict[str, Any]:
+    return asyncio.run(play_batch(*job))
+
+
+async def play_batch(config: Dict[str, Any], seed: int, games: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    stats = new_stats()
+
+    for _ in range(games):
+        game = await play_game(config, rng)
+        stats['games'] += 1
+        stats['wins'][game['winner']] += 1
+        stats['first_mover_wins'] += game['winner'] == game['first']
+        stats['shots_to_win'][game['shots']] += 1
+        stats['turns'][game['turns']] += 1
+        for attack in ATTACK_TYPES:
+            stats['attacks'][attack].update(game['attacks'][attack])
+    return stats
+
+
+def simulate(config: Dict[str, Any], games: int, batch_size: int, workers: int, seed: int) -> Dict[str, Any]:
+    jobs = []
+    for index, start in enumerate(range(0, games, batch_size)):
+        jobs.append((config, seed + index, min(batch_size, games - start)))
+
+    total = new_stats()
+    if workers <= 1:
+        for job in jobs:
+            merge_stats(total, run_batch(job))
+        return total
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for partial in pool.map(run_batch, jobs):
+            merge_stats(total, partial)
+    return total
+
+
+def histogram_percentile(histogram: Counter, percentile: int) -> int:
+    target = sum(histogram.values()) * percentile / 100
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen >= target:
+            return value
+    return 0
+
+
+def histogram_mean(histogram: Counter) -> float:
+    count = sum(histogram.values())
+    return sum(value * times for value, times in histogram.items()) / count if count else 0.0
+
+
+def print_report(stats: Dict[str, Any], config: Dict[str, Any], elapsed: float) -> None:
+    games = stats['games']
+    print(f"Partidas: {games} en {elapsed:.1f}s ({games / elapsed:.0f}/s)")
+    for index, name in enumerate(('a', 'b')):
+        print(f"Jugador {name} ({config[f'strategy_{name}']}, bombas {config[f'bombs_{name}']}, "
+              f"ataques aéreos {config[f'air_strikes_{name}']}): gana {stats['wins'][index] / games:.1%}")
+    print(f"Ventaja de quien empieza: gana {stats['first_mover_wins'] / games:.1%}")
+
+    shots = stats['shots_to_win']
+    percentiles = ', '.join(f"p{p} {histogram_percentile(shots, p)}" for p in PERCENTILES)
+    print(f"Disparos para ganar: media {histogram_mean(shots):.1f}, {percentiles}")
+    print(f"Turnos por partida: media {histogram_mean(stats['turns']):.1f}")
+
+    print(f"{'ataque':<12}{'usos':>10}{'celdas':>10}{'impactos':>10}{'% acierto':>11}{'imp/uso':>9}")
+    for attack in ATTACK_TYPES:
+        counts = stats['attacks'][attack]
+        if not counts['uses']:
+            continue
+        print(f"{attack:<12}{counts['uses']:>10}{counts['cells']:>10}{counts['hits']:>10}"
+              f"{counts['hits'] / counts['cells']:>11.1%}{counts['hits'] / counts['uses']:>9.2f}")
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Simula partidas IA contra IA sin sockets, en varios procesos")
+    parser.add_argument('--games', type=int, default=DEFAULT_GAMES)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=0)
+    for name in ('a', 'b'):
+        parser.add_argument(f'--strategy-{name}', choices=sorted(STRATEGIES), default='density')
+        parser.add_argument(f'--bombs-{name}', type=int, default=AVAILABLE_BOMBS)
+        parser.add_argument(f'--air-strikes-{name}', type=int, default=AVAILABLE_AIR_STRIKES)
+    return parser.parse_args()
+
+
+def main(args) -> None:
+    if not NUMPY_AVAILABLE and 'density' in (args.strategy_a, args.strategy_b):
+        sys.exit("La estrategia 'density' necesita NumPy instalado")
+
+    config = {key: value for key, value in vars(args).items()
+              if key.startswith(('strategy_', 'bombs_', 'air_strikes_'))}
+    started = time.perf_counter()
+    stats = simulate(config, args.games, args.batch_size, args.workers, args.seed)
+    print_report(stats, config, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main(parse_arguments())
@@ -0,0 +1,69 @@
+import argparse
+import json
+import statistics
+from collections import defaultdict
+from typing import Dict, Any, List
+
+PERCENTILES = (50, 95, 99)
+
+
+def load_spans(paths: List[str]) -> List[Dict[str, Any]]:
+    spans = []
+    for path in paths:
+        with open(path, encoding='utf-8') as trace_file:
+            for line in trace_file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if 'trace_id' in entry and 'duration_ms' in entry:
+                    spans.append(entry)
+    return spans
+
+
+def group_by_trace(spans: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    traces: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for span in spans:
+        traces[span['trace_id']].append(span)
+    return traces
+
+
+def summarize_by_name(spans: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    durations: Dict[str, List[float]] = defaultdict(list)
+    for span in spans:
+        durations[span['name']].append(span['duration_ms'])
+
+    summary = {}
+    for name, values in durations.items():
+        values.sort()
+        row = {'count': len(values), 'mean': statistics.fmean(values)}
+        for percentile in PERCENTILES:
+            row[f'p{percentile}'] = values[min(len(values) - 1, int(len(values) * percentile / 100))]
+        summary[name] = row
+    return summary
+
+
+def print_report(summary: Dict[str, Dict[str, float]], complete_traces: int) -> None:
+    print(f"{'span':<28}{'n':>8}{'media':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for name in sorted(summary, key=lambda name: (not name.startswith('client.'), name)):
+        row = summary[name]
+        print(f"{name:<28}{row['count']:>8}{row['mean']:>10.2f}{row['p50']:>10.2f}"
+              f"{row['p95']:>10.2f}{row['p99']:>10.2f}")
+    print(f"Trazas con spans de cliente y servidor: {complete_traces}")
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Resume los spans exportados por cliente y servidor (ms)")
+    parser.add_argument('paths', nargs='+', help="Archivos JSON-lines de --trace-file y BATTLESHIP_TRACE_FILE")
+    return parser.parse_args()
+
+
+def main(args) -> None:
+    spans = load_spans(args.paths)
+    traces = group_by_trace(spans)
+    complete = sum(1 for trace in traces.values() if {span.get('side') for span in trace} >= {'client', 'server'})
+    print_report(summarize_by_name(spans), complete)
+
+
+if __name__ == "__main__":
+    main(parse_arguments())
@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import subprocess
+import tempfile
+import time
+import sys
+import os
+from typing import Dict, Any, Optional
+
+sys.path.append(os.path.dirname(__file__))
+from load_client import LoadTestBot, summarize_latencies
+from event_loop_benchmark import SERVER_SCRIPT, wait_for_server_loop, stop_server
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import DEFAULT_HOST_LOOPBACK, RATE_LIMIT_MESSAGES_PER_SECOND
+
+BENCHMARK_PORT = 8891
+DEFAULT_REQUEST_INTERVAL = 1.5 / RATE_LIMIT_MESSAGES_PER_SECOND
+
+
+def start_server(port: int, unix_path: str) -> subprocess.Popen:
+    command = [sys.executable, SERVER_SCRIPT, '--host', DEFAULT_HOST_LOOPBACK, '--port', str(port),
+               '--unix-socket', unix_path, '--no-admin-socket', '--no-stats-db']
+    return subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+
+async def measure_round_trip(port: int, unix_path: Optional[str], connections: int, requests: int,
+                             interval: float) -> Dict[str, Any]:
+    bots = [LoadTestBot(DEFAULT_HOST_LOOPBACK, port, unix_path=unix_path) for _ in range(connections)]
+    await asyncio.gather(*(bot.connect() for bot in bots))
+
+    async def ping(bot: LoadTestBot) -> None:
+        for _ in range(requests):
+            await bot.request_state()
+            await asyncio.sleep(interval)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(ping(bot) for bot in bots))
+    finally:
+        await asyncio.gather(*(bot.close() for bot in bots))
+    latencies = sorted(latency for bot in bots for latency in bot.state_latencies)
+    return summarize_latencies(latencies, connections, time.perf_counter() - started)
+
+
+def print_report(results: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'transporte':<12}{'muestras':>10}{'media ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for transport, stats in results.items():
+        print(f"{transport:<12}{stats['shots']:>10}{stats.get('mean_ms', 0):>10.3f}{stats.get('p50_ms', 0):>10.3f}"
+              f"{stats.get('p95_ms', 0):>10.3f}{stats.get('p99_ms', 0):>10.3f}")
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Compara la latencia de ida y vuelta por TCP y por socket Unix")
+    parser.add_argument('--port', type=int, default=BENCHMARK_PORT)
+    parser.add_argument('--connections', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--interval', type=float, default=DEFAULT_REQUEST_INTERVAL)
+    return parser.parse_args()
+
+
+async def main(args) -> None:
+    unix_path = os.path.join(tempfile.gettempdir(), f"battleship-bench-{args.port}.sock")
+    process = start_server(args.port, unix_path)
+    try:
+        wait_for_server_loop(process)
+        results = {}
+        for transport, path in (('tcp', None), ('unix', unix_path)):
+            results[transport] = await measure_round_trip(args.port, path, args.connections,
+                                                          args.requests, args.interval)
+        print_report(results)
+    finally:
+        stop_server(process)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_arguments()))
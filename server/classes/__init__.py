@@ -4,13 +4,38 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'game', 'cla
 from ship import Ship
 
 from .player import Player
+from .ai_player import AIPlayer
+from .ai_targeting import ProbabilityTargeting
+from .client_connection import ClientConnection
 from .battleship_server import BattleshipServer
+from .game_room import GameRoom
+from .room_sweeper import RoomSweeper
+from .timer_wheel import TimerWheel
+from .admin_server import AdminServer
+from .stats_store import StatsStore
+from .leaderboard import Leaderboard
 from .enums import MessageType, GameState
+from .game_state_tracker import GameStateTracker
+from .token_bucket import TokenBucket
+from .structured_logging import LoggingPipeline, setup_logging
 
 __all__ = [
     'Ship',
     'Player',
+    'AIPlayer',
+    'ProbabilityTargeting',
+    'ClientConnection',
     'BattleshipServer',
+    'GameRoom',
+    'RoomSweeper',
+    'TimerWheel',
+    'AdminServer',
+    'StatsStore',
+    'Leaderboard',
     'MessageType',
-    'GameState'
+    'GameState',
+    'GameStateTracker',
+    'TokenBucket',
+    'LoggingPipeline',
+    'setup_logging'
 ]
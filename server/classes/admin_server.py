@@ -0,0 +1,208 @@
+import asyncio
+import cProfile
+import io
+import json
+import logging
+import pstats
+import sys
+import os
+import time
+from typing import Dict, Optional, Any, List, Tuple, Callable, Awaitable
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import *
+from classes.structured_logging import get_logger, log_event
+
+logger = get_logger('admin')
+
+
+class AdminServer:
+    """Socket Unix de administración que corre en el mismo event loop del servidor.
+
+    Cada línea recibida es un comando (``rooms``, ``connections``, ``kick <id>``,
+    ``end <room_id>``, ``profile on|off``, ``stats <player_id>``) y cada
+    respuesta es una línea JSON. Los recorridos de salas y conexiones ceden el
+    loop cada ``ADMIN_TRAVERSAL_BATCH`` elementos para no frenar el tráfico de
+    juego.
+    """
+
+    def __init__(self, server: Any, path: str, batch_size: int = ADMIN_TRAVERSAL_BATCH):
+        self.server = server
+        self.path = path
+        self.batch_size = batch_size
+        self.listener: Optional[asyncio.AbstractServer] = None
+        self.profiler: Optional[cProfile.Profile] = None
+        self.commands: Dict[str, Callable[[List[str]], Awaitable[Any]]] = {
+            'help': self.handle_help,
+            'rooms': self.handle_rooms,
+            'connections': self.handle_connections,
+            'kick': self.handle_kick,
+            'end': self.handle_end_room,
+            'profile': self.handle_profile,
+            'stats': self.handle_stats
+        }
+
+    async def start(self) -> bool:
+        if not hasattr(asyncio, 'start_unix_server'):
+            log_event(logger, logging.WARNING, 'admin_socket_unsupported')
+            return False
+
+        self._remove_stale_socket()
+        self.listener = await asyncio.start_unix_server(self.handle_admin_client, path=self.path)
+        os.chmod(self.path, ADMIN_SOCKET_MODE)
+        log_event(logger, logging.INFO, 'admin_socket_listening', path=self.path)
+        return True
+
+    async def stop(self) -> None:
+        if self.listener is None:
+            return
+
+        self.listener.close()
+        await self.listener.wait_closed()
+        self.listener = None
+        self._remove_stale_socket()
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.profiler = None
+
+    def _remove_stale_socket(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    async def handle_admin_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode(UTF8_ENCODING).strip()
+                if command:
+                    response = await self.execute(command)
+                    writer.write((json.dumps(response, default=str) + JSON_MESSAGE_DELIMITER).encode(UTF8_ENCODING))
+                    await writer.drain()
+        except (ConnectionResetError, BrokenPipeError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def execute(self, command_line: str) -> Dict[str, Any]:
+        name, *args = command_line.split()
+        handler = self.commands.get(name.lower())
+        if handler is None:
+            return {'ok': False, 'error': f"Comando desconocido: {name}"}
+
+        log_event(logger, logging.INFO, 'admin_command', command=name, args=args)
+        try:
+            return {'ok': True, 'result': await handler(args)}
+        except (LookupError, ValueError) as e:
+            return {'ok': False, 'error': str(e)}
+
+    async def handle_help(self, args: List[str]) -> List[str]:
+        return sorted(self.commands)
+
+    async def handle_rooms(self, args: List[str]) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        return await self._collect(list(self.server.rooms.values()), lambda room: {
+            'room_id': room.room_id,
+            'seed': room.seed,
+            'phase': room.game_state.value,
+            'players': list(room.players),
+            'current_turn': room.current_turn,
+            'state_version': room.state_tracker.version,
+            'idle_seconds': round(now - room.last_activity, 1)
+        })
+
+    async def handle_connections(self, args: List[str]) -> List[Dict[str, Any]]:
+        now = time.monotonic()
+        return await self._collect(list(self.server.players.values()), lambda player: {
+            'player_id': player.player_id,
+            'room_id': getattr(self.server.player_rooms.get(player.player_id), 'room_id', None),
+            'peer': player.writer.get_extra_info('peername'),
+            'queue_bytes': player.write_queue_depth(),
+            'last_drain_ms': round(player.last_drain_latency * 1000, 3),
+            'max_drain_ms': round(player.max_drain_latency * 1000, 3),
+            'channel': player.channel,
+            'dropped_messages': getattr(self.server.player_connections.get(player.player_id),
+                                        'dropped_messages', 0),
+            'suspended': player.player_id in self.server.suspended_players,
+            'idle_seconds': round(now - player.last_activity, 1)
+        })
+
+    async def handle_kick(self, args: List[str]) -> Dict[str, str]:
+        player_id = self._require_argument(args, 'kick <player_id>')
+        if player_id not in self.server.players:
+            raise LookupError(f"Jugador inexistente: {player_id}")
+
+        await self.server.evict_player(player_id, CONNECTION_ERROR_MESSAGES['ADMIN_KICKED'])
+        return {'kicked': player_id}
+
+    async def handle_end_room(self, args: List[str]) -> Dict[str, Any]:
+        room_id = self._require_argument(args, 'end <room_id>')
+        room = self.server.rooms.get(room_id)
+        if room is None:
+            raise LookupError(f"Sala inexistente: {room_id}")
+
+        players = list(room.players)
+        await self.server.evict_room(room, CONNECTION_ERROR_MESSAGES['ROOM_CLOSED_BY_ADMIN'])
+        return {'ended': room_id, 'players': players}
+
+    async def handle_profile(self, args: List[str]) -> Dict[str, Any]:
+        action = self._require_argument(args, 'profile on|off')
+        if action == 'on':
+            return self._start_profiling()
+        if action == 'off':
+            return await self._stop_profiling()
+        raise ValueError("Uso: profile on|off")
+
+    async def handle_stats(self, args: List[str]) -> Dict[str, Any]:
+        player_id = self._require_argument(args, 'stats <player_id>')
+        if self.server.stats_store is None:
+            raise LookupError("El servidor corre sin base de estadísticas")
+
+        # Un jugador conectado se busca por su id fijo; si no, el argumento ya es esa clave.
+        player = self.server.players.get(player_id)
+        stats_id = player.stats_id if player is not None else player_id
+        stats = await asyncio.get_running_loop().run_in_executor(
+            None, self.server.stats_store.player_stats, stats_id)
+        if stats is None:
+            raise LookupError(f"Sin partidas registradas: {player_id}")
+        return stats
+
+    def _start_profiling(self) -> Dict[str, Any]:
+        if self.profiler is None:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        return {'profiling': True}
+
+    async def _stop_profiling(self) -> Dict[str, Any]:
+        if self.profiler is None:
+            return {'profiling': False}
+
+        profiler, self.profiler = self.profiler, None
+        profiler.disable()
+        path, top = await asyncio.get_running_loop().run_in_executor(None, self._write_profile, profiler)
+        return {'profiling': False, 'path': path, 'top': top}
+
+    def _write_profile(self, profiler: cProfile.Profile) -> Tuple[str, str]:
+        os.makedirs(LOG_DUMP_DIR, exist_ok=True)
+        path = os.path.join(LOG_DUMP_DIR, f"profile-{time.strftime('%Y%m%d-%H%M%S')}.prof")
+        profiler.dump_stats(path)
+
+        report = io.StringIO()
+        pstats.Stats(path, stream=report).sort_stats('cumulative').print_stats(ADMIN_PROFILE_TOP)
+        return path, report.getvalue()
+
+    async def _collect(self, items: List[Any], describe: Callable[[Any], Dict[str, Any]]) -> List[Dict[str, Any]]:
+        collected = []
+        for index, item in enumerate(items, start=1):
+            collected.append(describe(item))
+            if index % self.batch_size == 0:
+                await asyncio.sleep(0)
+        return collected
+
+    def _require_argument(self, args: List[str], usage: str) -> str:
+        if not args:
+            raise ValueError(f"Uso: {usage}")
+        return args[0]
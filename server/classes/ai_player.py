@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import random
+import time
+import uuid
+import sys
+import os
+from typing import Dict, Optional, Any, List, Set
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'game', 'classes'))
+from placement_index import get_placement_index
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import *
+from classes.enums import GameState, MessageType
+from classes.player import Player
+from classes.ai_targeting import ProbabilityTargeting
+from classes.structured_logging import get_logger, log_event
+
+logger = get_logger('ai')
+
+
+class AIPlayer(Player):
+    """Oponente controlado por el servidor que ocupa el segundo lugar de una sala.
+
+    No tiene conexión: recibe los mismos mensajes que un jugador a través de
+    ``send_message`` y responde con ``place_ships`` y ``shot`` por
+    ``GameRoom.process_message``, así juega con las mismas reglas que un humano.
+    """
+
+    is_ai = True
+
+    def __init__(self, room: Any, move_delay: float = AI_MOVE_DELAY, rng: Optional[random.Random] = None):
+        super().__init__(AI_PLAYER_ID_PREFIX + str(uuid.uuid4())[:UUID_SHORT_LENGTH], writer=None)
+        self.room = room
+        self.move_delay = move_delay
+        self.rng = rng or random.Random()
+        self.targeting = ProbabilityTargeting(rng=self.rng)
+        self.move_times: List[float] = []
+        self._move_task: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def is_connection_closed(self) -> bool:
+        return False
+
+    def write_queue_depth(self) -> int:
+        return 0
+
+    def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        self._tasks.clear()
+
+    async def send_message(self, message_type: MessageType, data: Optional[Any] = None) -> bool:
+        data = data or {}
+        if message_type == MessageType.GAME_START:
+            self._schedule(self._place_fleet())
+        elif message_type == MessageType.SHOT_RESULT:
+            self._record_shot_result(data)
+        elif message_type == MessageType.GAME_OVER:
+            self._log_move_times()
+        if message_type in (MessageType.SHOT_RESULT, MessageType.GAME_UPDATE, MessageType.GAME_STATE_DELTA):
+            self._schedule_move_if_my_turn()
+        return True
+
+    async def send_bounded_error(self, error_message: str) -> bool:
+        log_event(logger, logging.WARNING, 'ai_error_received', room_id=self.room.room_id,
+                  player_id=self.player_id, error=error_message)
+        return True
+
+    def _schedule(self, coroutine) -> asyncio.Task:
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _place_fleet(self) -> None:
+        await self.room.process_message(self.player_id, {
+            'type': MessageType.PLACE_SHIPS.value,
+            'data': {'ships': self._random_fleet()}
+        })
+
+    def _random_fleet(self) -> List[List[List[int]]]:
+        placement_index = get_placement_index(GRID_SIZE)
+        return [[list(cell) for cell in placement_index.positions(mask)]
+                for mask in placement_index.random_fleet(SHIP_SIZES, self.rng)]
+
+    def _record_shot_result(self, data: Dict[str, Any]) -> None:
+        if data.get('shooter') == self.player_id:
+            self.targeting.record(data['x'], data['y'], data['result'], data.get('ship_info'))
+
+    def _log_move_times(self) -> None:
+        if self.move_times:
+            log_event(logger, logging.INFO, 'ai_match_finished', room_id=self.room.room_id,
+                      player_id=self.player_id, moves=len(self.move_times),
+                      mean_move_ms=sum(self.move_times) / len(self.move_times) * 1000,
+                      max_move_ms=max(self.move_times) * 1000)
+
+    def _is_my_turn(self) -> bool:
+        return self.room.game_state == GameState.BATTLE_PHASE and self.room.current_turn == self.player_id
+
+    def _schedule_move_if_my_turn(self) -> None:
+        if self._is_my_turn() and (self._move_task is None or self._move_task.done()):
+            self._move_task = self._schedule(self._play_turn())
+
+    async def _play_turn(self) -> None:
+        while self._is_my_turn():
+            await asyncio.sleep(self.move_delay)
+            if not self._is_my_turn():
+                return
+
+            started = time.perf_counter()
+            x, y = self.targeting.next_target()
+            self.move_times.append(time.perf_counter() - started)
+            await self.room.process_message(self.player_id, {
+                'type': MessageType.SHOT.value,
+                'data': {'x': x, 'y': y}
+            })
@@ -0,0 +1,130 @@
+import random
+import sys
+import os
+from collections import Counter
+from typing import Dict, Optional, Any, List, Tuple, Iterable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import *
+
+NUMPY_AVAILABLE = np is not None
+
+
+class ProbabilityTargeting:
+    """Elige el próximo disparo de la IA con un mapa de densidad de probabilidad.
+
+    Para cada barco que sigue a flote se cuentan todas las ubicaciones que
+    todavía son posibles (sin agua ni barcos hundidos encima) y cada celda suma
+    las ubicaciones que la cubren. Las que pasan por impactos sin hundir pesan
+    ``AI_HIT_WEIGHT`` veces más, así la IA remata un barco herido antes de
+    seguir buscando. Las ventanas de todos los tamaños y ambas orientaciones
+    salen de dos productos de matrices de NumPy, sin recorrer ubicaciones.
+    """
+
+    def __init__(self, grid_size: int = GRID_SIZE, ship_sizes: Optional[List[int]] = None,
+                 rng: Optional[random.Random] = None):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("La IA necesita NumPy instalado")
+
+        self.grid_size = grid_size
+        self.remaining_ships = sorted(ship_sizes or SHIP_SIZES, reverse=True)
+        self.rng = rng or random.Random()
+        self.shots = np.zeros((grid_size, grid_size), dtype=bool)
+        self.misses = np.zeros((grid_size, grid_size), dtype=bool)
+        self.hits = np.zeros((grid_size, grid_size), dtype=bool)
+        self.sunk = np.zeros((grid_size, grid_size), dtype=bool)
+        self._window_matrix, self._column_sizes = _window_matrix(grid_size, set(self.remaining_ships))
+        self._column_counts = self._count_columns()
+
+    def _count_columns(self) -> 'np.ndarray':
+        counts = Counter(self.remaining_ships)
+        return np.array([counts[size] for size in self._column_sizes], dtype=np.float64)
+
+    def record(self, x: int, y: int, result: str, ship_info: Optional[Dict[str, Any]] = None) -> None:
+        self.shots[y, x] = True
+        if result == SHOT_RESULT_MISS:
+            self.misses[y, x] = True
+        elif result == SHOT_RESULT_SUNK and ship_info:
+            self._record_sunk_ship(ship_info)
+        else:
+            self.hits[y, x] = True
+
+    def _record_sunk_ship(self, ship_info: Dict[str, Any]) -> None:
+        for x, y in ship_info.get('positions', []):
+            self.sunk[y, x] = True
+            self.hits[y, x] = False
+            self.shots[y, x] = True
+
+        size = ship_info.get('size')
+        if size in self.remaining_ships:
+            self.remaining_ships.remove(size)
+            self._column_counts = self._count_columns()
+
+    def next_target(self) -> Tuple[int, int]:
+        density = self.density()
+        best = density.max()
+        if best <= 0:
+            candidates = np.flatnonzero(~self.shots)
+        else:
+            candidates = np.flatnonzero(density == best)
+
+        if candidates.size == 0:
+            return self.rng.randrange(self.grid_size), self.rng.randrange(self.grid_size)
+        y, x = divmod(int(candidates[self.rng.randrange(candidates.size)]), self.grid_size)
+        return x, y
+
+    def is_hunting(self) -> bool:
+        return not self.hits.any()
+
+    def best_area_target(self, height: int, width: int) -> List[Tuple[int, int]]:
+        """Celdas del rectángulo ``height`` x ``width`` con más densidad acumulada."""
+        windows = _window_sum(_window_sum(self.density(), height, 0), width, 1)
+        candidates = np.flatnonzero(windows == windows.max())
+        y, x = divmod(int(candidates[self.rng.randrange(candidates.size)]), windows.shape[1])
+        return [(x + dx, y + dy) for dy in range(height) for dx in range(width)]
+
+    def density(self) -> 'np.ndarray':
+        boards = np.stack((self.misses | self.sunk, self.hits)).astype(np.float64)
+        oriented = np.concatenate((boards, boards.transpose(0, 2, 1)))
+        sums = oriented @ self._window_matrix
+
+        valid = sums[0::2] == 0
+        weight = valid * (1 + AI_HIT_WEIGHT * sums[1::2]) * self._column_counts
+        spread = weight @ self._window_matrix.T
+        density = spread[0] + spread[1].T
+        density[self.shots] = 0
+        return density
+
+
+def _window_matrix(grid_size: int, sizes: Iterable[int]) -> Tuple['np.ndarray', List[int]]:
+    """Matriz 0/1 cuya columna ``j`` marca las celdas de una ventana de un tamaño.
+
+    ``fila @ matriz`` suma cada ventana de cada tamaño a la vez y
+    ``pesos @ matriz.T`` devuelve a cada celda el peso de las ventanas que la cubren.
+    """
+    columns = []
+    column_sizes = []
+    for size in sorted(size for size in sizes if 0 < size <= grid_size):
+        for start in range(grid_size - size + 1):
+            column = np.zeros(grid_size)
+            column[start:start + size] = 1
+            columns.append(column)
+            column_sizes.append(size)
+    return np.array(columns).T, column_sizes
+
+
+def _window_sum(values: 'np.ndarray', size: int, axis: int) -> 'np.ndarray':
+    """Suma de cada ventana de ``size`` celdas a lo largo de ``axis``."""
+    cumulative = np.cumsum(values, axis=axis)
+    if axis == 0:
+        windows = cumulative[size - 1:].copy()
+        windows[1:] -= cumulative[:-size]
+    else:
+        windows = cumulative[:, size - 1:].copy()
+        windows[:, 1:] -= cumulative[:, :-size]
+    return windows
@@ -1,430 +1,628 @@
 import asyncio
+import hashlib
 import json
+import logging
 import random
+import re
+import socket
+import time
 import uuid
+from contextlib import AsyncExitStack
 import sys
 import os
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, List
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from constants import *
-from classes.enums import GameState, MessageType
+from classes.enums import MessageType
 from classes.player import Player
+from classes.client_connection import ClientConnection
+from classes.game_room import GameRoom
+from classes.room_sweeper import RoomSweeper
+from classes.admin_server import AdminServer
+from classes.stats_store import StatsStore
+from classes.timer_wheel import TimerWheel, TimerHandle
+from classes.structured_logging import get_logger, log_event
+from classes.tracing import extract_trace_id, trace_span
+
+logger = get_logger('server')
 
 class BattleshipServer:
     
-    def __init__(self, host: str = DEFAULT_HOST_ALL_INTERFACES, port: int = DEFAULT_SERVER_PORT):
+    def __init__(self, host: str = DEFAULT_HOST_ALL_INTERFACES, port: int = DEFAULT_SERVER_PORT,
+                 max_rooms: int = MAX_ROOMS, max_frame_size: int = MAX_FRAME_SIZE,
+                 admin_socket_path: Optional[str] = None, unix_path: Optional[str] = None,
+                 seed: Optional[int] = None, stats_path: Optional[str] = None,
+                 resume_grace: float = RESUME_GRACE_PERIOD):
         self.host = host
         self.port = port
+        self.unix_path = unix_path
+        self.max_rooms = max_rooms
+        self.max_frame_size = max_frame_size
+        self.oversized_frames = 0
+        self.seed = seed
+        self.room_seeds = random.Random(seed) if seed is not None else None
+        self.rooms: Dict[str, GameRoom] = {}
         self.players: Dict[str, Player] = {}
-        self.max_players = MAX_PLAYERS
-        self.game_state = GameState.WAITING_PLAYERS
-        self.current_turn: Optional[str] = None
+        self.player_rooms: Dict[str, GameRoom] = {}
+        self.player_connections: Dict[str, ClientConnection] = {}
+        self.resume_grace = resume_grace
+        self.resume_tokens: Dict[str, str] = {}
+        self.suspended_players: Dict[str, TimerHandle] = {}
+        self.sweeper = RoomSweeper(self)
+        self.timer_wheel = TimerWheel()
+        self.admin = AdminServer(self, admin_socket_path) if admin_socket_path else None
+        self.stats_store = StatsStore(stats_path) if stats_path else None
+        self.draining = False
+        self.drain_task: Optional[asyncio.Task] = None
+        self._listeners: List[asyncio.AbstractServer] = []
+        self._shutdown_event: Optional[asyncio.Event] = None
+        self._drain_deadline = 0.0
         
     async def start_server(self) -> None:
-        print(f"Starting Battleship server on {self.host}:{self.port}...")
-        server = await asyncio.start_server(
-            self.handle_client, self.host, self.port
+        log_event(logger, logging.INFO, 'server_starting', host=self.host, port=self.port)
+        self._shutdown_event = asyncio.Event()
+        self._listeners = [await asyncio.start_server(
+            self.handle_client, self.host, self.port, limit=self.max_frame_size,
+            backlog=SERVER_LISTEN_BACKLOG
+        )]
+        if self.unix_path and hasattr(asyncio, 'start_unix_server'):
+            self._listeners.append(await self._start_unix_listener())
+        elif self.unix_path:
+            log_event(logger, logging.WARNING, 'unix_socket_unsupported', path=self.unix_path)
+            self.unix_path = None
+        
+        self.sweeper.start()
+        self.timer_wheel.start()
+        if self.stats_store is not None:
+            self.stats_store.start()
+        if self.admin is not None:
+            await self.admin.start()
+        log_event(logger, logging.INFO, 'server_started', host=self.host, port=self.port,
+                  unix_path=self.unix_path, max_rooms=self.max_rooms, max_frame_size=self.max_frame_size,
+                  seed=self.seed, stats_path=getattr(self.stats_store, 'path', None))
+        try:
+            async with AsyncExitStack() as listeners:
+                for listener in self._listeners:
+                    await listeners.enter_async_context(listener)
+                await self._shutdown_event.wait()
+        finally:
+            self._remove_unix_socket()
+            await self.sweeper.stop()
+            await self.timer_wheel.stop()
+            if self.admin is not None:
+                await self.admin.stop()
+            if self.stats_store is not None:
+                await asyncio.get_running_loop().run_in_executor(None, self.stats_store.stop)
+            
+    async def _start_unix_listener(self) -> asyncio.AbstractServer:
+        self._remove_unix_socket()
+        return await asyncio.start_unix_server(
+            self.handle_client, path=self.unix_path, limit=self.max_frame_size,
+            backlog=SERVER_LISTEN_BACKLOG
         )
         
-        async with server:
-            await server.serve_forever()
-
-    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
-        writer.get_extra_info('peername')
-        player_id = self._generate_player_id()
+    def _remove_unix_socket(self) -> None:
+        if not self.unix_path:
+            return
+        try:
+            os.unlink(self.unix_path)
+        except FileNotFoundError:
+            pass
+            
+    def request_drain(self, deadline: float = DRAIN_DEADLINE) -> None:
+        if self.drain_task is not None:
+            log_event(logger, logging.INFO, 'drain_already_running')
+            return
+            
+        self.drain_task = asyncio.create_task(self.drain(deadline))
+        self.drain_task.add_done_callback(self._finish_drain_task)
         
-        if not await self._validate_new_connection(writer):
+    def _finish_drain_task(self, task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is None:
             return
+        logger.error('drain_failed', exc_info=task.exception())
+        # Sin esto el proceso quedaría esperando un cierre que ya no va a llegar.
+        if self._shutdown_event is not None:
+            self._shutdown_event.set()
+        
+    async def drain(self, deadline: float = DRAIN_DEADLINE) -> Dict[str, Any]:
+        self.draining = True
+        started = time.monotonic()
+        self._drain_deadline = started + deadline
+        log_event(logger, logging.WARNING, 'drain_started', deadline=deadline,
+                  rooms=len(self.rooms), players=len(self.players))
+        
+        for listener in self._listeners:
+            listener.close()
+        await self._close_rooms(self._idle_rooms(), CONNECTION_ERROR_MESSAGES['SERVER_DRAINING'])
+        
+        finished_rooms = await self._wait_for_active_rooms()
+        snapshot_path = self._snapshot_rooms(self._active_rooms())
+        summary = {
+            'finished_rooms': finished_rooms,
+            'snapshotted_rooms': len(self._active_rooms()),
+            'disconnected_players': len(self.players),
+            'snapshot_path': snapshot_path,
+            'seconds': time.monotonic() - started
+        }
+        
+        await self._close_rooms(list(self.rooms.values()), CONNECTION_ERROR_MESSAGES['SERVER_DRAINING'])
+        self._log_drain_summary(summary)
+        
+        if self._shutdown_event is not None:
+            self._shutdown_event.set()
+        return summary
+        
+    def _active_rooms(self) -> List[GameRoom]:
+        return [room for room in self.rooms.values() if room.is_match_in_progress()]
+        
+    def _idle_rooms(self) -> List[GameRoom]:
+        return [room for room in self.rooms.values() if not room.is_match_in_progress()]
+        
+    async def _wait_for_active_rooms(self) -> int:
+        initial_rooms = {room.room_id for room in self._active_rooms()}
+        
+        while self._active_rooms() and time.monotonic() < self._drain_deadline:
+            await asyncio.sleep(DRAIN_POLL_INTERVAL)
             
-        await self._create_and_register_player(player_id, writer)
-        await self._handle_client_communication(player_id, reader)
+        still_active = {room.room_id for room in self._active_rooms()}
+        return len(initial_rooms - still_active)
+        
+    async def _close_rooms(self, rooms: List[GameRoom], reason: str) -> None:
+        for room in rooms:
+            await self.evict_room(room, reason)
+            
+    def _snapshot_rooms(self, rooms: List[GameRoom]) -> Optional[str]:
+        if not rooms:
+            return None
+            
+        os.makedirs(DRAIN_SNAPSHOT_DIR, exist_ok=True)
+        path = os.path.join(DRAIN_SNAPSHOT_DIR, f"drain-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        with open(path, 'w', encoding=UTF8_ENCODING) as snapshot_file:
+            json.dump([room.to_snapshot() for room in rooms], snapshot_file)
+        return path
+        
+    def _log_drain_summary(self, summary: Dict[str, Any]) -> None:
+        log_event(logger, logging.WARNING, 'drain_finished', **summary)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # La conexión no entra a ninguna sala hasta su primer mensaje (ver _seat_default_session).
+        self._enable_keepalive(writer)
+        connection = ClientConnection(writer)
+        await self._handle_client_communication(connection, reader)
+        
+    async def _open_session(self, connection: ClientConnection, channel: Optional[int],
+                            stats_id: Optional[str] = None) -> Player:
+        player_id = self._generate_player_id()
+        connection.open_session(channel, player_id)
+        self.player_connections[player_id] = connection
+        return await self._create_and_register_player(player_id, connection.writer, channel, stats_id)
         
     def _generate_player_id(self) -> str:
         return str(uuid.uuid4())[:UUID_SHORT_LENGTH]
         
-    async def _validate_new_connection(self, writer: asyncio.StreamWriter) -> bool:
-        if len(self.players) >= self.max_players:
-            await self.send_error(writer, CONNECTION_ERROR_MESSAGES['SERVER_FULL'])
-            writer.close()
-            await writer.wait_closed()
-            return False
+    async def _seat_default_session(self, connection: ClientConnection, channel: Optional[int],
+                                    message: Dict[str, Any]) -> bool:
+        """Abre la sesión sin canal con el primer mensaje que no es de conexión (``join`` o cualquier otro).
+
+        Hasta entonces el cliente no está en ninguna sala: un ``resume`` vuelve
+        directo a su partida sin emparejarse con quien esté esperando, sin
+        avisos del lobby y sin pasar por el límite de salas. El ``client_id``
+        del ``join``, si es válido, identifica al jugador en estadísticas y ranking.
+        """
+        if channel is not None or channel in connection.sessions or connection.multiplexed:
+            return True
+            
+        rejection = self._admission_error()
+        if rejection is not None:
+            return await self._reject_connection(connection.writer, rejection)
+        await self._open_session(connection, None, self._stats_id(message))
         return True
         
-    async def _create_and_register_player(self, player_id: str, writer: asyncio.StreamWriter) -> Player:
-        player = Player(player_id, writer)
-        self.players[player_id] = player
+    def _stats_id(self, message: Dict[str, Any]) -> Optional[str]:
+        # Se guarda un hash: el ranking es público y con el id crudo cualquiera jugaría a nombre de otro.
+        data = message.get('data')
+        if message.get('type') != MessageType.JOIN.value or not isinstance(data, dict):
+            return None
+        client_id = data.get('client_id')
+        if not isinstance(client_id, str) or not re.fullmatch(CLIENT_ID_PATTERN, client_id):
+            return None
+        return hashlib.sha256(client_id.encode(UTF8_ENCODING)).hexdigest()[:STATS_ID_LENGTH]
+        
+    def _admission_error(self) -> Optional[str]:
+        if self.draining:
+            return CONNECTION_ERROR_MESSAGES['SERVER_DRAINING']
+        if self._find_open_room() is None and len(self.rooms) >= self.max_rooms:
+            return CONNECTION_ERROR_MESSAGES['SERVER_FULL']
+        return None
+        
+    async def _reject_connection(self, writer: asyncio.StreamWriter, error_message: str) -> bool:
+        await self.send_error(writer, error_message)
+        writer.close()
+        await writer.wait_closed()
+        return False
+        
+    def _enable_keepalive(self, writer: asyncio.StreamWriter) -> None:
+        sock = writer.get_extra_info('socket')
+        if sock is None or sock.family not in (socket.AF_INET, socket.AF_INET6):
+            return
+            
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            if hasattr(socket, 'TCP_KEEPIDLE'):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, TCP_KEEPALIVE_IDLE)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, TCP_KEEPALIVE_INTERVAL)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, TCP_KEEPALIVE_PROBES)
+        except OSError as e:
+            log_event(logger, logging.DEBUG, 'keepalive_unavailable', error=str(e))
+        
+    def _find_open_room(self) -> Optional[GameRoom]:
+        for room in self.rooms.values():
+            if room.is_open():
+                return room
+        return None
+        
+    def _get_or_create_room(self) -> GameRoom:
+        room = self._find_open_room()
+        if room is None:
+            room = GameRoom(seed=self._next_room_seed(), stats_store=self.stats_store,
+                            timer_wheel=self.timer_wheel)
+            self.rooms[room.room_id] = room
+            log_event(logger, logging.INFO, 'room_created', room_id=room.room_id, seed=room.seed)
+        return room
+        
+    def _next_room_seed(self) -> Optional[int]:
+        if self.room_seeds is None:
+            return None
+        return self.room_seeds.getrandbits(ROOM_SEED_BITS)
+        
+    async def _create_and_register_player(self, player_id: str, writer: asyncio.StreamWriter,
+                                          channel: Optional[int] = None, stats_id: Optional[str] = None) -> Player:
+        player = Player(player_id, writer, channel, stats_id)
+        room = self._get_or_create_room()
         
-        await player.send_message(MessageType.PLAYER_CONNECT, {'player_id': player_id})
-        await self.broadcast_players_status()
+        self.players[player_id] = player
+        self.player_rooms[player_id] = room
+        self.resume_tokens[player.resume_token] = player_id
+        log_event(logger, logging.INFO, 'player_connected', player_id=player_id, room_id=room.room_id,
+                  channel=channel, peer=writer.get_extra_info('peername'))
+        await room.add_player(player)
         
         return player
         
-    async def _handle_client_communication(self, player_id: str, reader: asyncio.StreamReader) -> None:
+    async def _handle_client_communication(self, connection: ClientConnection,
+                                           reader: asyncio.StreamReader) -> None:
         try:
-            await self._client_message_loop(player_id, reader)
+            await self._client_message_loop(connection, reader)
         except asyncio.CancelledError:
             pass
-        except Exception as e:
-            pass
+        except Exception:
+            logger.exception('client_communication_failed',
+                             extra={'fields': {'players': connection.player_ids()}})
         finally:
-            await self._cleanup_client_connection(player_id)
+            await self._cleanup_client_connection(connection)
             
-    async def _client_message_loop(self, player_id: str, reader: asyncio.StreamReader) -> None:
-        while self.players.get(player_id) is not None:
+    async def _client_message_loop(self, connection: ClientConnection, reader: asyncio.StreamReader) -> None:
+        while not connection.is_closing():
             try:
-                line = await asyncio.wait_for(reader.readline(), timeout=SERVER_READ_TIMEOUT)
+                line = await self._read_frame(connection, reader)
                 
                 if not line:
                     break
                     
-                await self._process_client_message(player_id, line)
+                if not await self._admit_client_message(connection):
+                    if connection.dropped_messages >= RATE_LIMIT_MAX_DROPPED:
+                        break
+                    continue
+                    
+                await self._process_client_message(connection, line)
                 
             except asyncio.TimeoutError:
-                continue
+                if connection.sessions:
+                    continue
+                log_event(logger, logging.INFO, 'handshake_timeout', peer=connection.writer.get_extra_info('peername'))
+                break
             except ConnectionResetError:
+                log_event(logger, logging.INFO, 'connection_reset', players=connection.player_ids())
                 break
-            except Exception as e:
+            except Exception:
+                logger.exception('client_read_failed', extra={'fields': {'players': connection.player_ids()}})
                 break
                 
-    async def _process_client_message(self, player_id: str, line: bytes) -> None:
-        raw_data = line.decode(UTF8_ENCODING).strip()
-        
-        if not raw_data:
-            return
-            
+    async def _read_frame(self, connection: ClientConnection, reader: asyncio.StreamReader) -> Optional[bytes]:
+        # Solo readline avisa el frame demasiado grande con ValueError: UnicodeDecodeError
+        # también lo es, así que este except no puede envolver al resto del procesamiento.
+        time_left = connection.handshake_time_left()
+        if time_left is not None and time_left <= 0:
+            raise asyncio.TimeoutError()
+        timeout = SERVER_READ_TIMEOUT if time_left is None else time_left
         try:
-            message = json.loads(raw_data)
-            await self.process_message(player_id, message)
-        except json.JSONDecodeError as e:
-            return
-        except Exception as e:
-            return
-            
-    async def _cleanup_client_connection(self, player_id: str) -> None:
-        await self.disconnect_player(player_id)
-        
-        if player_id in self.players:
-            try:
-                writer = self.players[player_id].writer
-                writer.close()
-                await writer.wait_closed()
-            except Exception as e:
-                pass
-
-    async def send_error(self, writer: asyncio.StreamWriter, error_message: str) -> None:
-        try:
-            message = self._create_error_message(error_message)
-            await self._send_raw_error_message(writer, message)
-        except Exception as e:
-            pass
+            return await asyncio.wait_for(reader.readline(), timeout=timeout)
+        except ValueError:
+            await self._reject_oversized_frame(connection)
+            return None
             
-    def _create_error_message(self, error_message: str) -> str:
-        message = {
-            'type': MessageType.ERROR.value,
-            'data': {'error': error_message}
-        }
-        return json.dumps(message) + JSON_MESSAGE_DELIMITER
-        
-    async def _send_raw_error_message(self, writer: asyncio.StreamWriter, message: str) -> None:
-        writer.write(message.encode(UTF8_ENCODING))
-        await writer.drain()
-
-    async def disconnect_player(self, player_id: str) -> None:
-        if player_id not in self.players:
-            return
+    async def _reject_oversized_frame(self, connection: ClientConnection) -> None:
+        self.oversized_frames += 1
+        log_event(logger, logging.WARNING, 'frame_too_large', players=connection.player_ids(),
+                  max_frame_size=self.max_frame_size)
+        await connection.send_bounded_error(CONNECTION_ERROR_MESSAGES['FRAME_TOO_LARGE'])
             
-        if self._should_notify_opponent(player_id):
-            await self._notify_opponent_disconnection(player_id)
+    async def _admit_client_message(self, connection: ClientConnection) -> bool:
+        if connection.allow_message():
+            return True
             
-        self._remove_player_and_reset_game(player_id)
-        await self.broadcast_players_status()
-        
-    def _should_notify_opponent(self, player_id: str) -> bool:
-        active_game_states = [GameState.PLACEMENT_PHASE, GameState.BATTLE_PHASE]
-        return (self.game_state in active_game_states and 
-                len(self.players) == MAX_PLAYERS)
+        if connection.dropped_messages == 1:
+            log_event(logger, logging.WARNING, 'rate_limited', players=connection.player_ids())
+        await connection.send_bounded_error(CONNECTION_ERROR_MESSAGES['RATE_LIMITED'])
+        return False
                 
-    async def _notify_opponent_disconnection(self, player_id: str) -> None:
-        opponent_id = self._find_opponent_id(player_id)
-        if opponent_id:
-            await self._send_disconnection_message(opponent_id, player_id)
-            
-    def _find_opponent_id(self, player_id: str) -> Optional[str]:
-        for pid in self.players:
-            if pid != player_id:
-                return pid
-        return None
-        
-    async def _send_disconnection_message(self, opponent_id: str, disconnected_player_id: str) -> None:
-        opponent = self.players[opponent_id]
-        
-        success = await opponent.send_message(MessageType.PLAYER_DISCONNECT, {
-            'disconnected_player': disconnected_player_id,
-            'message': CONNECTION_ERROR_MESSAGES['OPPONENT_DISCONNECTED'],
-            'return_to_menu': True
-        })
+    async def _process_client_message(self, connection: ClientConnection, line: bytes) -> None:
+        try:
+            raw_data = line.decode(UTF8_ENCODING).strip()
+            if not raw_data:
+                return
+                
+            message = json.loads(raw_data)
+            await self._dispatch_to_channel(connection, message)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            log_event(logger, logging.WARNING, 'invalid_json', players=connection.player_ids(), error=str(e))
+        except Exception:
+            logger.exception('message_processing_failed', extra={'fields': {'players': connection.player_ids()}})
             
-    def _remove_player_and_reset_game(self, player_id: str) -> None:
-        del self.players[player_id]
-        
-        if len(self.players) < MAX_PLAYERS:
-            self.game_state = GameState.WAITING_PLAYERS
-            self.current_turn = None
-
-    async def broadcast_players_status(self) -> None:
-        message_data = self._create_players_status_message()
-        
-        for player in self.players.values():
-            await player.send_message(MessageType.PLAYERS_READY, message_data)
-            
-    def _create_players_status_message(self) -> Dict[str, Any]:
-        players_ready = len(self.players) >= MAX_PLAYERS
-        return {
-            'connected_players': len(self.players),
-            'max_players': self.max_players,
-            'players_ready': players_ready,
-            'game_state': self.game_state.value
-        }
-
-    async def process_message(self, player_id: str, message: Dict[str, Any]) -> None:
-        message_type = message.get('type')
-        data = message.get('data', {})
-
-        if player_id not in self.players:
+    async def _dispatch_to_channel(self, connection: ClientConnection, message: Dict[str, Any]) -> None:
+        if not isinstance(message, dict):
             return
+            
+        channel = message.get('channel')
+        message_type = message.get('type')
         
-        player = self.players[player_id]
-        
-        message_handlers = {
-            'place_ships': lambda: self.handle_place_ships(player, data),
-            'shot': lambda: self.handle_shot(player_id, data),
-            'bomb_attack': lambda: self.handle_bomb_attack(player_id, data),
-            'air_strike': lambda: self.handle_air_strike(player_id, data),
-            'start_game': lambda: self.handle_start_game()
-        }
-        
-        handler = message_handlers.get(message_type)
-        if handler:
-            await handler()
-
-    async def handle_place_ships(self, player: Player, data: Dict[str, Any]) -> None:
-        try:
-            ships_data = data.get('ships', [])
-            self._clear_player_ships(player)
-            self._place_player_ships(player, ships_data)
+        if message_type == MessageType.CHANNEL_OPEN.value:
+            await self.open_channel(connection, channel)
+        elif message_type == MessageType.CHANNEL_CLOSE.value:
+            await self.close_channel(connection, channel)
+        elif message_type == MessageType.RESUME.value:
+            await self.resume_session(connection, channel, message.get('data'))
+        elif message_type == MessageType.PING.value:
+            await self._answer_ping(connection, channel, message.get('data'))
+        elif message_type == MessageType.LATENCY_REPORT.value:
+            self._log_latency_report(connection.sessions.get(channel), message.get('data'))
+        elif await self._seat_default_session(connection, channel, message) and message_type != MessageType.JOIN.value:
+            await self._dispatch_to_session(connection, channel, message)
             
-            player.ships_placed = True
+    async def _dispatch_to_session(self, connection: ClientConnection, channel: Optional[int],
+                                   message: Dict[str, Any]) -> None:
+        if channel in connection.sessions:
+            await self.process_message(connection.sessions[channel], message)
+        else:
+            await connection.send_bounded_error(CONNECTION_ERROR_MESSAGES['UNKNOWN_CHANNEL'], channel)
             
-            await self._check_and_start_battle_if_ready()
+    async def _answer_ping(self, connection: ClientConnection, channel: Optional[int], data: Any) -> None:
+        # Se contesta acá, sin pasar por la sala ni tocar la actividad del jugador:
+        # el RTT del cliente mide solo red y event loop.
+        sent = data.get('sent') if isinstance(data, dict) else None
+        message = {'type': MessageType.PONG.value, 'data': {'sent': sent}}
+        if channel is not None:
+            message['channel'] = channel
+        await connection.send_raw(message)
+        
+    def _log_latency_report(self, player_id: Optional[str], data: Any) -> None:
+        if player_id is None or not isinstance(data, dict):
+            return
+        fields = {name: data[name] for name in LATENCY_REPORT_FIELDS
+                  if isinstance(data.get(name), (int, float))}
+        room = self.player_rooms.get(player_id)
+        log_event(logger, logging.INFO, 'client_latency', player_id=player_id,
+                  room_id=room.room_id if room else None, **fields)
+        
+    async def open_channel(self, connection: ClientConnection, channel: Any) -> None:
+        if not connection.can_open_channel(channel):
+            await connection.send_bounded_error(CONNECTION_ERROR_MESSAGES['INVALID_CHANNEL'])
+            return
             
-        except Exception as e:
-            await player.send_message(MessageType.ERROR, 
-                                    {'error': CONNECTION_ERROR_MESSAGES['SHIPS_PLACEMENT_ERROR']})
+        if not connection.channel_open_bucket.consume():
+            await connection.send_bounded_error(CONNECTION_ERROR_MESSAGES['RATE_LIMITED'], channel)
+            return
             
-    def _clear_player_ships(self, player: Player) -> None:
-        player.ships = []
-        player.grid = [[CELL_EMPTY for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-        
-    def _place_player_ships(self, player: Player, ships_data: list) -> None:
-        for ship_positions in ships_data:
-            if isinstance(ship_positions, list) and len(ship_positions) > 0:
-                player.place_ship(ship_positions)
-                
-    async def _check_and_start_battle_if_ready(self) -> None:
-        players_ready = self.all_players_ready()
-        
-        if players_ready:
-            await self.start_battle_phase()
-
-    async def handle_bomb_attack(self, shooter_id: str, data: Dict[str, Any]) -> None:
-        if not self._validate_shot_conditions(shooter_id):
+        rejection = self._admission_error()
+        if rejection is not None:
+            await connection.send_bounded_error(rejection, channel)
             return
             
-        targets = data.get('targets', [])
-        opponent_id = self._find_opponent_id(shooter_id)
-        bomb_results = []
-        for target in targets:
-            x, y = target[FIRST_COORDINATE], target[SECOND_COORDINATE]
-            if self._validate_shot_coordinates(x, y):
-                shot_result = await self._process_shot_result(shooter_id, opponent_id, x, y)
-                if shot_result is None:
-                    return
-                
-                bomb_results.append(shot_result)
-        self.current_turn = opponent_id
-        await self.broadcast_game_state()
-
-    async def handle_air_strike(self, shooter_id: str, data: Dict[str, Any]) -> None:
-        if not self._validate_shot_conditions(shooter_id):
+        await self._open_session(connection, channel)
+        
+    async def close_channel(self, connection: ClientConnection, channel: Any) -> None:
+        player_id = connection.sessions.get(channel)
+        if player_id is None:
+            await connection.send_bounded_error(CONNECTION_ERROR_MESSAGES['UNKNOWN_CHANNEL'], channel)
             return
             
-        targets = data.get('targets', [])
-        opponent_id = self._find_opponent_id(shooter_id)
-        air_strike_results = []
-        for target in targets:
-            if len(target) >= 2:
-                x, y = target[FIRST_COORDINATE], target[SECOND_COORDINATE]
-                if self._validate_shot_coordinates(x, y):
-                    shot_result = await self._process_shot_result(shooter_id, opponent_id, x, y)
-                    
-                    if shot_result is None:
-                        return
-                    
-                    air_strike_results.append(shot_result)
-        self.current_turn = opponent_id
-        await self.broadcast_game_state()
+        await self.disconnect_player(player_id)
+        await connection.send_raw({'type': MessageType.CHANNEL_CLOSED.value, 'channel': channel, 'data': {}})
+            
+    async def resume_session(self, connection: ClientConnection, channel: Optional[int], data: Any) -> None:
+        """Vuelve a sentar en su partida al jugador dueño del token, sobre esta conexión.
 
-    async def handle_shot(self, shooter_id: str, data: Dict[str, Any]) -> None:
-        if not self._validate_shot_conditions(shooter_id):
+        Si esta conexión ya tenía una sesión sin canal (mandó otra cosa antes
+        del ``resume``), esa sesión se descarta. Si la conexión vieja
+        todavía no se había dado por caída (un corte sin FIN tarda en notarse), se
+        le quita el jugador y se cierra: el token alcanza para probar que es él.
+        """
+        token = data.get('resume_token') if isinstance(data, dict) else None
+        player_id = self.resume_tokens.get(token) if isinstance(token, str) else None
+        room = self.player_rooms.get(player_id)
+        if room is None or not room.is_match_in_progress():
+            await self._reject_resume(connection, channel)
             return
             
-        x, y = data.get('x'), data.get('y')
-        if not self._validate_shot_coordinates(x, y):
-            return
+        replaced_id = connection.sessions.get(channel)
+        if replaced_id is not None and replaced_id != player_id:
+            await self.disconnect_player(replaced_id)
+        await self._release_previous_connection(player_id, connection)
+        self.timer_wheel.cancel(self.suspended_players.pop(player_id, None))
         
-        opponent_id = self._find_opponent_id(shooter_id)
-        if not opponent_id:
-            return
- 
-        shot_result = await self._process_shot_result(shooter_id, opponent_id, x, y)
+        player = self.players[player_id]
+        player.writer = connection.writer
+        player.channel = channel
+        connection.open_session(channel, player_id)
+        self.player_connections[player_id] = connection
+        log_event(logger, logging.INFO, 'session_resumed', player_id=player_id, room_id=room.room_id,
+                  replaced_player=replaced_id, peer=connection.writer.get_extra_info('peername'))
+        await room.resume_player(player)
+        
+    async def _reject_resume(self, connection: ClientConnection, channel: Optional[int]) -> None:
+        message = {'type': MessageType.RESUMED.value,
+                   'data': {'resumed': False, 'error': CONNECTION_ERROR_MESSAGES['RESUME_REJECTED']}}
+        if channel is not None:
+            message['channel'] = channel
+        await connection.send_raw(message)
+        
+    async def _release_previous_connection(self, player_id: str, connection: ClientConnection) -> None:
+        previous = self._detach_from_connection(player_id)
+        if previous is not None and previous is not connection and previous.should_close():
+            await self._close_writer(previous.writer)
+            
+    def _can_suspend(self, player_id: str) -> bool:
+        player = self.players.get(player_id)
+        room = self.player_rooms.get(player_id)
+        return (self.resume_grace > 0 and not self.draining and player is not None and
+                not player.is_ai and room is not None and room.is_match_in_progress())
+        
+    def suspend_player(self, player_id: str) -> None:
+        """Guarda el lugar de un jugador que perdió la conexión durante ``resume_grace`` segundos."""
+        self._detach_from_connection(player_id)
+        self.suspended_players[player_id] = self.timer_wheel.schedule(
+            self.resume_grace, lambda: self._expire_suspension(player_id)
+        )
+        log_event(logger, logging.INFO, 'player_suspended', player_id=player_id,
+                  room_id=self.player_rooms[player_id].room_id, grace=self.resume_grace)
         
-        if shot_result is None:
+    async def _expire_suspension(self, player_id: str) -> None:
+        if self.suspended_players.pop(player_id, None) is None:
             return
+        log_event(logger, logging.INFO, 'resume_expired', player_id=player_id)
+        await self.disconnect_player(player_id)
+            
+    async def process_message(self, player_id: str, message: Dict[str, Any]) -> None:
+        player = self.players.get(player_id)
+        room = self.player_rooms.get(player_id)
         
-        should_change_turn = shot_result == SHOT_RESULT_MISS
-        
-        if should_change_turn:
-            self.current_turn = opponent_id
-        await self.broadcast_game_state()
-        
-    def _validate_shot_conditions(self, shooter_id: str) -> bool:
-        if self.game_state != GameState.BATTLE_PHASE:
-            return False
+        if player is None or room is None:
+            return
             
-        if self.current_turn != shooter_id:
-            asyncio.create_task(self.players[shooter_id].send_message(
-                MessageType.ERROR, {'error': CONNECTION_ERROR_MESSAGES['NOT_YOUR_TURN']}
-            ))
-            return False
+        if not player.message_bucket.consume():
+            await player.send_bounded_error(CONNECTION_ERROR_MESSAGES['RATE_LIMITED'])
+            return
             
-        return True
-        
-    def _validate_shot_coordinates(self, x: Any, y: Any) -> bool:
-        return isinstance(x, int) and isinstance(y, int)
-        
-    async def _process_shot_result(self, shooter_id: str, opponent_id: str, x: int, y: int) -> Optional[str]:
-        opponent = self.players[opponent_id]
-        shot_result = opponent.receive_shot(x, y)
-        result = shot_result['result']
-        
-        shot_data = self._create_shot_data(x, y, result, shooter_id, opponent_id, shot_result)
-        
-        await self._broadcast_shot_result(shot_data)
-        
-        if opponent.all_ships_sunk():
-            await self.end_game(shooter_id)
-            return None
+        player.touch()
+        room.touch()
+        log_event(logger, logging.DEBUG, 'message_received', player_id=player_id,
+                  room_id=room.room_id, message_type=message.get('type'))
+        with trace_span(extract_trace_id(message), 'server.process_message',
+                        message_type=message.get('type'), room_id=room.room_id):
+            await room.process_message(player_id, message)
             
-        return result
+    async def _cleanup_client_connection(self, connection: ClientConnection) -> None:
+        for player_id in connection.player_ids():
+            if self._can_suspend(player_id):
+                self.suspend_player(player_id)
+            else:
+                await self.disconnect_player(player_id)
+        await self._close_writer(connection.writer)
+        
+    async def _release_connection(self, player: Player, connection: Optional[ClientConnection]) -> None:
+        if connection is None or connection.should_close():
+            await self._close_writer(player.writer)
             
-    def _create_shot_data(self, x: int, y: int, result: str, shooter_id: str, 
-                         opponent_id: str, shot_result: Dict[str, Any]) -> Dict[str, Any]:
-        shot_data = {
-            'x': x, 'y': y, 'result': result,
-            'shooter': shooter_id, 'target': opponent_id
-        }
-        
-        if result == SHOT_RESULT_SUNK and 'ship_info' in shot_result:
-            shot_data['ship_info'] = shot_result['ship_info']
+    async def _close_writer(self, writer: asyncio.StreamWriter) -> None:
+        try:
+            writer.close()
+            await asyncio.wait_for(writer.wait_closed(), timeout=SERVER_CLOSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            log_event(logger, logging.INFO, 'close_timeout', peer=writer.get_extra_info('peername'))
+            writer.transport.abort()
+        except Exception as e:
+            log_event(logger, logging.DEBUG, 'close_failed', peer=writer.get_extra_info('peername'), error=str(e))
             
-        return shot_data
-        
-    async def _broadcast_shot_result(self, shot_data: Dict[str, Any]) -> None:
-        for player in self.players.values():
-            await player.send_message(MessageType.SHOT_RESULT, shot_data)
+    def _detach_from_connection(self, player_id: str) -> Optional[ClientConnection]:
+        connection = self.player_connections.pop(player_id, None)
+        if connection is not None:
+            connection.discard_player(player_id)
+        return connection
             
-    async def _handle_turn_change(self, result: str, opponent_id: str) -> None:
-        if result == SHOT_RESULT_MISS:
-            self.current_turn = opponent_id
-        await self.broadcast_game_state()
-
-    async def handle_start_game(self) -> None:
-        if len(self.players) == MAX_PLAYERS:
-            await self._start_game_for_all_players()
+    def _forget_resume(self, player_id: str, player: Optional[Player]) -> None:
+        self.timer_wheel.cancel(self.suspended_players.pop(player_id, None))
+        if player is not None:
+            self.resume_tokens.pop(player.resume_token, None)
             
-    async def _start_game_for_all_players(self) -> None:
-        self.game_state = GameState.PLACEMENT_PHASE
-        
-        start_message = self._create_game_start_message()
-        
-        for player_id, player in self.players.items():
-            await self._send_game_start_to_player(player_id, player, start_message)
-        
-    def _create_game_start_message(self) -> Dict[str, Any]:
-        return {
-            'phase': 'placement',
-            'message': GAME_MESSAGES['GAME_STARTED'],
-            'redirect_to_game': True
-        }
-        
-    async def _send_game_start_to_player(self, player_id: str, player: Player, 
-                                       start_message: Dict[str, Any]) -> None:
-        await player.send_message(MessageType.GAME_START, start_message)
-
-    async def start_battle_phase(self) -> None:
-        self.game_state = GameState.BATTLE_PHASE
-        
-        player_ids = list(self.players.keys())
+    async def disconnect_player(self, player_id: str) -> None:
+        room = self.player_rooms.pop(player_id, None)
+        self._forget_resume(player_id, self.players.pop(player_id, None))
+        self._detach_from_connection(player_id)
         
-        if not self._validate_battle_start(player_ids):
+        if room is None:
             return
             
-        self.current_turn = self._choose_starting_player(player_ids)
-        
-        await self.broadcast_game_state()
-        
-    def _validate_battle_start(self, player_ids: list) -> bool:
-        if len(player_ids) < MAX_PLAYERS:
-            return False
-        return True
+        log_event(logger, logging.INFO, 'player_disconnected', player_id=player_id, room_id=room.room_id)
+        await room.disconnect_player(player_id)
+        self._discard_room_if_empty(room)
         
-    def _choose_starting_player(self, player_ids: list) -> str:
-        return random.choice(player_ids)
-        
-    async def broadcast_game_state(self) -> None:
-        game_data = self._create_game_state_data()
+    def _discard_room_if_empty(self, room: GameRoom) -> None:
+        if room.is_empty():
+            self.rooms.pop(room.room_id, None)
+            
+    async def evict_player(self, player_id: str, reason: Optional[str] = None) -> None:
+        player = self.players.get(player_id)
+        connection = self.player_connections.get(player_id)
+        await self.disconnect_player(player_id)
         
-        for player_id, player in self.players.items():
-            await self._send_game_state_to_player(player_id, player, game_data)
+        if player is not None:
+            if reason:
+                await self._notify_eviction(player, reason)
+            await self._release_connection(player, connection)
             
-    def _create_game_state_data(self) -> Dict[str, Any]:
-        return {
-            'phase': self.game_state.value,
-            'current_turn': self.current_turn,
-            'players': {pid: {'ready': p.ships_placed} for pid, p in self.players.items()}
-        }
+    async def evict_room(self, room: GameRoom, reason: str) -> None:
+        self.rooms.pop(room.room_id, None)
+        evicted_players = list(room.players.values())
+        log_event(logger, logging.INFO, 'room_evicted', room_id=room.room_id,
+                  phase=room.game_state.value, players=len(evicted_players), reason=reason)
+        
+        for player in evicted_players:
+            if player.is_ai:
+                player.stop()
+                continue
+            self.player_rooms.pop(player.player_id, None)
+            self.players.pop(player.player_id, None)
+            self._forget_resume(player.player_id, player)
+            connection = self._detach_from_connection(player.player_id)
+            await self._notify_eviction(player, reason)
+            await self._release_connection(player, connection)
+            
+        room.players.clear()
         
-    async def _send_game_state_to_player(self, player_id: str, player: Player, 
-                                       game_data: Dict[str, Any]) -> None:
-        await player.send_message(MessageType.GAME_UPDATE, game_data)
+    async def _notify_eviction(self, player: Player, reason: str) -> None:
+        try:
+            await asyncio.wait_for(player.send_message(MessageType.ERROR, {'error': reason}),
+                                   timeout=SERVER_CLOSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            log_event(logger, logging.INFO, 'eviction_notice_timeout', player_id=player.player_id)
 
-    async def end_game(self, winner_id: str) -> None:
-        self.game_state = GameState.GAME_OVER
-        
-        for player_id, player in self.players.items():
-            await self._send_game_over_message(player_id, player, winner_id)
+    async def send_error(self, writer: asyncio.StreamWriter, error_message: str) -> None:
+        try:
+            message = self._create_error_message(error_message)
+            await self._send_raw_error_message(writer, message)
+        except Exception as e:
+            log_event(logger, logging.DEBUG, 'raw_error_send_failed', error=str(e))
             
-    async def _send_game_over_message(self, player_id: str, player: Player, winner_id: str) -> None:
-        is_winner = player_id == winner_id
-        message = GAME_MESSAGES['WINNER'] if is_winner else GAME_MESSAGES['LOSER']
+    def _create_error_message(self, error_message: str) -> str:
+        message = {
+            'type': MessageType.ERROR.value,
+            'data': {'error': error_message}
+        }
+        return json.dumps(message) + JSON_MESSAGE_DELIMITER
         
-        await player.send_message(MessageType.GAME_OVER, {
-            'winner': winner_id,
-            'is_winner': is_winner,
-            'message': message
-        })
+    async def _send_raw_error_message(self, writer: asyncio.StreamWriter, message: str) -> None:
+        writer.write(message.encode(UTF8_ENCODING))
+        await writer.drain()
 
-    def all_players_ready(self) -> bool:
-        return (len(self.players) == MAX_PLAYERS and 
-                all(player.ships_placed for player in self.players.values()))
\ No newline at end of file
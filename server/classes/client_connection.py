@@ -0,0 +1,112 @@
+import asyncio
+import json
+import time
+import sys
+import os
+from typing import Dict, Optional, Any, List
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import *
+from classes.enums import MessageType
+from classes.token_bucket import TokenBucket
+
+
+class ClientConnection:
+    """Conexión física de un cliente, que puede llevar varias sesiones de jugador.
+
+    Cada sesión se identifica por su ``channel``; los clientes de siempre usan
+    una única sesión sin canal (``None``). El límite de mensajes de la conexión
+    crece con la cantidad de sesiones abiertas y se aplica antes de decodificar
+    el JSON; además cada sesión tiene el suyo (``Player.message_bucket``), así
+    abrir canales no suma capacidad para una sola sala. Abrir canales gasta su
+    propio presupuesto, más chico.
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.sessions: Dict[Optional[int], str] = {}
+        self.multiplexed = False
+        self.message_bucket = TokenBucket(RATE_LIMIT_MESSAGES_PER_SECOND, RATE_LIMIT_BURST)
+        self.error_bucket = TokenBucket(ERROR_REPLIES_PER_SECOND, ERROR_REPLY_BURST)
+        self.channel_open_bucket = TokenBucket(CHANNEL_OPEN_PER_SECOND, CHANNEL_OPEN_BURST)
+        self.dropped_messages = 0
+        self.peak_sessions = 1
+        self.unseated_since: Optional[float] = time.monotonic()
+
+    def open_session(self, channel: Optional[int], player_id: str) -> None:
+        self.sessions[channel] = player_id
+        self.unseated_since = None
+        if channel is not None:
+            self.multiplexed = True
+        self._rescale_rate_limit()
+
+    def close_session(self, channel: Optional[int]) -> Optional[str]:
+        player_id = self.sessions.pop(channel, None)
+        if not self.sessions and self.unseated_since is None:
+            self.unseated_since = time.monotonic()
+        self._rescale_rate_limit()
+        return player_id
+
+    def discard_player(self, player_id: str) -> None:
+        for channel, session_player_id in list(self.sessions.items()):
+            if session_player_id == player_id:
+                self.close_session(channel)
+
+    def player_ids(self) -> List[str]:
+        return list(self.sessions.values())
+
+    def can_open_channel(self, channel: Any) -> bool:
+        return (isinstance(channel, int) and not isinstance(channel, bool) and
+                0 <= channel < MAX_CHANNEL_ID and channel not in self.sessions and
+                len(self.sessions) < MAX_CHANNELS_PER_CONNECTION)
+
+    def handshake_time_left(self) -> Optional[float]:
+        """Segundos que puede seguir sin ninguna sesión, o ``None`` si tiene alguna.
+
+        El plazo corre desde que se aceptó (o desde que cerró su última sesión)
+        y no se renueva con ``ping`` ni con nada que no abra una sesión.
+        """
+        if self.unseated_since is None:
+            return None
+        return self.unseated_since + HANDSHAKE_TIMEOUT - time.monotonic()
+
+    def should_close(self) -> bool:
+        return not self.sessions and not self.multiplexed
+
+    def is_closing(self) -> bool:
+        return self.writer.is_closing()
+
+    def allow_message(self) -> bool:
+        if self.message_bucket.consume():
+            self.dropped_messages = 0
+            return True
+        self.dropped_messages += 1
+        return False
+
+    async def send_bounded_error(self, error_message: str, channel: Optional[int] = None) -> bool:
+        if not self.error_bucket.consume():
+            return False
+
+        message = {'type': MessageType.ERROR.value, 'data': {'error': error_message}}
+        if channel is not None:
+            message['channel'] = channel
+        return await self.send_raw(message)
+
+    async def send_raw(self, message: Dict[str, Any]) -> bool:
+        try:
+            self.writer.write((json.dumps(message) + JSON_MESSAGE_DELIMITER).encode(UTF8_ENCODING))
+            await self.writer.drain()
+            return True
+        except (ConnectionResetError, BrokenPipeError):
+            return False
+
+    def _rescale_rate_limit(self) -> None:
+        sessions = max(1, len(self.sessions))
+        self.message_bucket.rate = RATE_LIMIT_MESSAGES_PER_SECOND * sessions
+        self.message_bucket.capacity = RATE_LIMIT_BURST * sessions
+        # Cada sesión nueva trae su ráfaga (la de la sala la limita su propio bucket), pero
+        # solo al superar el máximo histórico: abrir y cerrar canales en bucle no regala fichas.
+        if sessions > self.peak_sessions:
+            self.message_bucket.tokens += RATE_LIMIT_BURST * (sessions - self.peak_sessions)
+            self.peak_sessions = sessions
+        self.message_bucket.tokens = min(self.message_bucket.tokens, self.message_bucket.capacity)
@@ -15,5 +15,20 @@ class MessageType(Enum):
     SHOT_RESULT = "shot_result"
     GAME_START = "game_start"
     GAME_UPDATE = "game_update"
+    GAME_STATE_DELTA = "game_state_delta"
+    STATE_REQUEST = "state_request"
+    PLAY_VS_AI = "play_vs_ai"
+    SHIPS_AUTO_PLACED = "ships_auto_placed"
+    LEADERBOARD_REQUEST = "leaderboard_request"
+    LEADERBOARD = "leaderboard"
+    JOIN = "join"
+    RESUME = "resume"
+    RESUMED = "resumed"
+    PING = "ping"
+    PONG = "pong"
+    LATENCY_REPORT = "latency_report"
+    CHANNEL_OPEN = "channel_open"
+    CHANNEL_CLOSE = "channel_close"
+    CHANNEL_CLOSED = "channel_closed"
     GAME_OVER = "game_over"
     ERROR = "error"
\ No newline at end of file
@@ -0,0 +1,589 @@
+import logging
+import random
+import time
+import uuid
+import sys
+import os
+from typing import Dict, Optional, Any, List, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import *
+from classes.enums import GameState, MessageType
+from classes.player import Player
+from classes.ai_player import AIPlayer
+from classes.ai_targeting import NUMPY_AVAILABLE
+from classes.game_state_tracker import GameStateTracker
+from classes.stats_store import StatsStore
+from classes.timer_wheel import TimerWheel, TimerHandle
+from classes.structured_logging import get_logger, log_event
+from classes.tracing import extract_trace_id, trace_span
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'game', 'classes'))
+from placement_index import get_placement_index
+
+logger = get_logger('room')
+
+class GameRoom:
+    
+    def __init__(self, room_id: Optional[str] = None, max_players: int = MAX_PLAYERS,
+                 seed: Optional[int] = None, stats_store: Optional[StatsStore] = None,
+                 timer_wheel: Optional[TimerWheel] = None):
+        self.room_id = room_id or str(uuid.uuid4())[:UUID_SHORT_LENGTH]
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(ROOM_SEED_BITS)
+        self.rng = random.Random(self.seed)
+        self.stats_store = stats_store
+        self.timer_wheel = timer_wheel
+        self.deadline: Optional[TimerHandle] = None
+        self.players: Dict[str, Player] = {}
+        self.max_players = max_players
+        self.game_state = GameState.WAITING_PLAYERS
+        self.current_turn: Optional[str] = None
+        self.state_tracker = GameStateTracker()
+        self.created_at = time.monotonic()
+        self.last_activity = self.created_at
+        self.match_started_at = self.created_at
+        
+    def derive_rng(self, label: str) -> random.Random:
+        """Generador propio de ``label`` que depende solo de la semilla de la sala.
+
+        Así lo que sortea cada parte (por ejemplo la IA) no depende del orden en
+        que el event loop intercale sus tareas al repetir una semilla.
+        """
+        return random.Random(f"{self.seed}:{label}")
+        
+    def touch(self) -> None:
+        self.last_activity = time.monotonic()
+        
+    def _set_deadline(self, delay: float, callback) -> None:
+        self._cancel_deadline()
+        if self.timer_wheel is not None:
+            self.deadline = self.timer_wheel.schedule(delay, callback)
+            
+    def _cancel_deadline(self) -> None:
+        if self.timer_wheel is not None:
+            self.timer_wheel.cancel(self.deadline)
+        self.deadline = None
+        
+    def is_open(self) -> bool:
+        return (self.game_state == GameState.WAITING_PLAYERS and 
+                len(self.players) < self.max_players)
+                
+    def is_empty(self) -> bool:
+        return not self.players
+        
+    def is_match_in_progress(self) -> bool:
+        return self.game_state in (GameState.PLACEMENT_PHASE, GameState.BATTLE_PHASE)
+        
+    def to_snapshot(self) -> Dict[str, Any]:
+        return {
+            'room_id': self.room_id,
+            'seed': self.seed,
+            'phase': self.game_state.value,
+            'current_turn': self.current_turn,
+            'state_version': self.state_tracker.version,
+            'players': {pid: player.to_snapshot() for pid, player in self.players.items()}
+        }
+        
+    async def add_player(self, player: Player) -> None:
+        self.players[player.player_id] = player
+        self.touch()
+        
+        await player.send_message(MessageType.PLAYER_CONNECT, {
+            'player_id': player.player_id,
+            'room_id': self.room_id,
+            'resume_token': player.resume_token
+        })
+        await self.broadcast_players_status()
+
+    async def disconnect_player(self, player_id: str) -> None:
+        if player_id not in self.players:
+            return
+            
+        if self._should_notify_opponent(player_id):
+            await self._notify_opponent_disconnection(player_id)
+            
+        self._remove_player_and_reset_game(player_id)
+        self._release_ai_players()
+        await self.broadcast_players_status()
+        
+    async def resume_player(self, player: Player) -> None:
+        """Manda al jugador que volvió sus dos tableros y, después, el estado completo."""
+        log_event(logger, logging.INFO, 'player_resumed', room_id=self.room_id, player_id=player.player_id,
+                  phase=self.game_state.value)
+        await player.send_message(MessageType.RESUMED, self._create_resume_data(player))
+        player.state_version = None
+        await self.handle_state_request(player)
+        
+    def _create_resume_data(self, player: Player) -> Dict[str, Any]:
+        opponent = self.players.get(self._find_opponent_id(player.player_id))
+        return {
+            'resumed': True,
+            'player_id': player.player_id,
+            'room_id': self.room_id,
+            'resume_token': player.resume_token,
+            'phase': self.game_state.value,
+            'current_turn': self.current_turn,
+            'ships_placed': player.ships_placed,
+            'ships': [[list(position) for position in ship.positions] for ship in player.ships],
+            'my_board_shots': player.shots_received(),
+            'enemy_shots': opponent.shots_received() if opponent else [],
+            'enemy_sunk_ships': opponent.sunk_ships() if opponent else []
+        }
+        
+    def _should_notify_opponent(self, player_id: str) -> bool:
+        active_game_states = [GameState.PLACEMENT_PHASE, GameState.BATTLE_PHASE]
+        return (self.game_state in active_game_states and 
+                len(self.players) == MAX_PLAYERS)
+                
+    async def _notify_opponent_disconnection(self, player_id: str) -> None:
+        opponent_id = self._find_opponent_id(player_id)
+        if opponent_id:
+            await self._send_disconnection_message(opponent_id, player_id)
+            
+    def _find_opponent_id(self, player_id: str) -> Optional[str]:
+        for pid in self.players:
+            if pid != player_id:
+                return pid
+        return None
+        
+    async def _send_disconnection_message(self, opponent_id: str, disconnected_player_id: str) -> None:
+        opponent = self.players[opponent_id]
+        
+        success = await opponent.send_message(MessageType.PLAYER_DISCONNECT, {
+            'disconnected_player': disconnected_player_id,
+            'message': CONNECTION_ERROR_MESSAGES['OPPONENT_DISCONNECTED'],
+            'return_to_menu': True
+        })
+            
+    def _remove_player_and_reset_game(self, player_id: str) -> None:
+        del self.players[player_id]
+        
+        if len(self.players) < MAX_PLAYERS:
+            self._cancel_deadline()
+            self.game_state = GameState.WAITING_PLAYERS
+            self.current_turn = None
+
+    def _release_ai_players(self) -> None:
+        if any(not player.is_ai for player in self.players.values()):
+            return
+            
+        for player in list(self.players.values()):
+            player.stop()
+            del self.players[player.player_id]
+
+    async def broadcast_players_status(self) -> None:
+        message_data = self._create_players_status_message()
+        
+        for player in list(self.players.values()):
+            await player.send_message(MessageType.PLAYERS_READY, message_data)
+            
+    def _create_players_status_message(self) -> Dict[str, Any]:
+        players_ready = len(self.players) >= MAX_PLAYERS
+        return {
+            'connected_players': len(self.players),
+            'max_players': self.max_players,
+            'players_ready': players_ready,
+            'game_state': self.game_state.value
+        }
+
+    async def process_message(self, player_id: str, message: Dict[str, Any]) -> None:
+        message_type = message.get('type')
+        data = message.get('data', {})
+        trace_id = extract_trace_id(message)
+
+        if player_id not in self.players:
+            return
+        
+        player = self.players[player_id]
+        
+        message_handlers = {
+            'place_ships': lambda: self.handle_place_ships(player, data),
+            'shot': lambda: self.handle_shot(player_id, data, trace_id),
+            'bomb_attack': lambda: self.handle_bomb_attack(player_id, data, trace_id),
+            'air_strike': lambda: self.handle_air_strike(player_id, data, trace_id),
+            'start_game': lambda: self.handle_start_game(),
+            'state_request': lambda: self.handle_state_request(player),
+            'play_vs_ai': lambda: self.handle_play_vs_ai(player),
+            'leaderboard_request': lambda: self.handle_leaderboard_request(player, data)
+        }
+        
+        handler = message_handlers.get(message_type)
+        if handler:
+            await handler()
+
+    async def handle_play_vs_ai(self, player: Player) -> None:
+        if not NUMPY_AVAILABLE:
+            await player.send_bounded_error(CONNECTION_ERROR_MESSAGES['AI_UNAVAILABLE'])
+            return
+            
+        if not self.is_open() or len(self.players) != 1:
+            await player.send_bounded_error(CONNECTION_ERROR_MESSAGES['AI_ROOM_BUSY'])
+            return
+            
+        ai_player = AIPlayer(self, rng=self.derive_rng(AI_PLAYER_ID_PREFIX))
+        log_event(logger, logging.INFO, 'ai_opponent_added', room_id=self.room_id,
+                  player_id=player.player_id, ai_player_id=ai_player.player_id)
+        await self.add_player(ai_player)
+
+    async def handle_leaderboard_request(self, player: Player, data: Dict[str, Any]) -> None:
+        if self.stats_store is None:
+            await player.send_bounded_error(CONNECTION_ERROR_MESSAGES['LEADERBOARD_UNAVAILABLE'])
+            return
+            
+        count = data.get('count') if isinstance(data, dict) else None
+        if not isinstance(count, int) or count <= 0:
+            count = LEADERBOARD_TOP_SIZE
+            
+        leaderboard = self.stats_store.leaderboard
+        await player.send_message(MessageType.LEADERBOARD, {
+            'top': leaderboard.top(min(count, LEADERBOARD_MAX_SIZE)),
+            'you': leaderboard.entry(player.stats_id)
+        })
+
+    async def handle_place_ships(self, player: Player, data: Dict[str, Any]) -> None:
+        if self.game_state != GameState.PLACEMENT_PHASE:
+            return
+            
+        try:
+            ships_data = data.get('ships', [])
+            self._clear_player_ships(player)
+            self._place_player_ships(player, ships_data)
+            
+            player.ships_placed = True
+            
+            await self._check_and_start_battle_if_ready()
+            
+        except Exception as e:
+            log_event(logger, logging.WARNING, 'ships_placement_failed', room_id=self.room_id,
+                      player_id=player.player_id, error=str(e))
+            await player.send_bounded_error(CONNECTION_ERROR_MESSAGES['SHIPS_PLACEMENT_ERROR'])
+            
+    def _clear_player_ships(self, player: Player) -> None:
+        player.ships = []
+        player.occupied_mask = 0
+        player.grid = [[CELL_EMPTY for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        
+    def _place_player_ships(self, player: Player, ships_data: list) -> None:
+        for ship_positions in ships_data:
+            if isinstance(ship_positions, list) and len(ship_positions) > 0:
+                player.place_ship(ship_positions)
+                
+    async def _on_placement_timeout(self) -> None:
+        self.deadline = None
+        if self.game_state != GameState.PLACEMENT_PHASE:
+            return
+            
+        for player in list(self.players.values()):
+            if not player.ships_placed:
+                await self._auto_place_ships(player)
+        await self._check_and_start_battle_if_ready()
+        
+    async def _auto_place_ships(self, player: Player) -> None:
+        placement_index = get_placement_index(GRID_SIZE)
+        ships = [[list(cell) for cell in placement_index.positions(mask)]
+                 for mask in placement_index.random_fleet(SHIP_SIZES, self.rng)]
+        self._clear_player_ships(player)
+        self._place_player_ships(player, ships)
+        player.ships_placed = True
+        log_event(logger, logging.INFO, 'placement_timed_out', room_id=self.room_id, player_id=player.player_id)
+        await player.send_message(MessageType.SHIPS_AUTO_PLACED, {'ships': ships})
+        
+    async def _check_and_start_battle_if_ready(self) -> None:
+        players_ready = self.all_players_ready()
+        
+        if players_ready:
+            await self.start_battle_phase()
+
+    async def handle_bomb_attack(self, shooter_id: str, data: Dict[str, Any],
+                                 trace_id: Optional[str] = None) -> None:
+        await self._handle_area_attack(shooter_id, data, MAX_BOMB_TARGETS, trace_id)
+
+    async def handle_air_strike(self, shooter_id: str, data: Dict[str, Any],
+                                trace_id: Optional[str] = None) -> None:
+        await self._handle_area_attack(shooter_id, data, MAX_AIR_STRIKE_TARGETS, trace_id)
+        
+    async def _handle_area_attack(self, shooter_id: str, data: Dict[str, Any], max_targets: int,
+                                  trace_id: Optional[str] = None) -> None:
+        if not await self._validate_shot_conditions(shooter_id):
+            return
+            
+        targets = self._extract_targets(data, max_targets)
+        if targets is None:
+            await self.players[shooter_id].send_bounded_error(CONNECTION_ERROR_MESSAGES['INVALID_TARGETS'])
+            return
+            
+        opponent_id = self._find_opponent_id(shooter_id)
+        for x, y in targets:
+            shot_result = await self._process_shot_result(shooter_id, opponent_id, x, y, trace_id)
+            if shot_result is None:
+                return
+                
+        self.current_turn = opponent_id
+        self._start_turn_timer()
+        with trace_span(trace_id, 'server.broadcast_state', room_id=self.room_id):
+            await self.broadcast_game_state()
+        
+    def _extract_targets(self, data: Dict[str, Any], max_targets: int) -> Optional[List[Tuple[int, int]]]:
+        raw_targets = data.get('targets')
+        if not isinstance(raw_targets, list) or not 0 < len(raw_targets) <= max_targets:
+            return None
+            
+        targets = []
+        for target in raw_targets:
+            if not isinstance(target, (list, tuple)) or len(target) < 2:
+                return None
+            x, y = target[FIRST_COORDINATE], target[SECOND_COORDINATE]
+            if not self._validate_shot_coordinates(x, y):
+                return None
+            if (x, y) not in targets:
+                targets.append((x, y))
+        return targets
+
+    async def handle_shot(self, shooter_id: str, data: Dict[str, Any],
+                          trace_id: Optional[str] = None) -> None:
+        if not await self._validate_shot_conditions(shooter_id):
+            return
+            
+        x, y = data.get('x'), data.get('y')
+        if not self._validate_shot_coordinates(x, y):
+            return
+        
+        opponent_id = self._find_opponent_id(shooter_id)
+        if not opponent_id:
+            return
+ 
+        shot_result = await self._process_shot_result(shooter_id, opponent_id, x, y, trace_id)
+        
+        if shot_result is None:
+            return
+        
+        should_change_turn = shot_result == SHOT_RESULT_MISS
+        
+        if should_change_turn:
+            self.current_turn = opponent_id
+        self._start_turn_timer()
+        with trace_span(trace_id, 'server.broadcast_state', room_id=self.room_id):
+            await self.broadcast_game_state()
+        
+    async def _validate_shot_conditions(self, shooter_id: str) -> bool:
+        if self.game_state != GameState.BATTLE_PHASE:
+            return False
+            
+        if self.current_turn != shooter_id:
+            await self.players[shooter_id].send_bounded_error(CONNECTION_ERROR_MESSAGES['NOT_YOUR_TURN'])
+            return False
+            
+        return True
+        
+    def _validate_shot_coordinates(self, x: Any, y: Any) -> bool:
+        return isinstance(x, int) and isinstance(y, int)
+        
+    async def _process_shot_result(self, shooter_id: str, opponent_id: str, x: int, y: int,
+                                   trace_id: Optional[str] = None) -> Optional[str]:
+        opponent = self.players[opponent_id]
+        self.players[shooter_id].missed_turns = 0
+        with trace_span(trace_id, 'server.resolve_shot', room_id=self.room_id, x=x, y=y):
+            shot_result = opponent.receive_shot(x, y)
+        result = shot_result['result']
+        self._count_shot(self.players[shooter_id], shot_result)
+        
+        shot_data = self._create_shot_data(x, y, result, shooter_id, opponent_id, shot_result, trace_id)
+        log_event(logger, logging.INFO, 'shot_resolved', message_type=MessageType.SHOT.value,
+                  room_id=self.room_id, shooter=shooter_id, x=x, y=y, result=result, trace_id=trace_id)
+        
+        with trace_span(trace_id, 'server.broadcast_shot', room_id=self.room_id, result=result):
+            await self._broadcast_shot_result(shot_data)
+        
+        if opponent.all_ships_sunk():
+            await self.end_game(shooter_id)
+            return None
+            
+        return result
+            
+    def _count_shot(self, shooter: Player, shot_result: Dict[str, Any]) -> None:
+        shooter.shots_fired += 1
+        if shot_result['result'] != SHOT_RESULT_MISS and not shot_result.get('repeat'):
+            shooter.shots_hit += 1
+            
+    def _create_shot_data(self, x: int, y: int, result: str, shooter_id: str, 
+                         opponent_id: str, shot_result: Dict[str, Any],
+                         trace_id: Optional[str] = None) -> Dict[str, Any]:
+        shot_data = {
+            'x': x, 'y': y, 'result': result,
+            'shooter': shooter_id, 'target': opponent_id
+        }
+        
+        if result == SHOT_RESULT_SUNK and 'ship_info' in shot_result:
+            shot_data['ship_info'] = shot_result['ship_info']
+            
+        if trace_id:
+            shot_data['trace_id'] = trace_id
+            
+        return shot_data
+        
+    async def _broadcast_shot_result(self, shot_data: Dict[str, Any]) -> None:
+        for player in list(self.players.values()):
+            await player.send_message(MessageType.SHOT_RESULT, shot_data)
+            
+    async def _handle_turn_change(self, result: str, opponent_id: str) -> None:
+        if result == SHOT_RESULT_MISS:
+            self.current_turn = opponent_id
+        await self.broadcast_game_state()
+
+    async def handle_start_game(self) -> None:
+        if len(self.players) == MAX_PLAYERS:
+            await self._start_game_for_all_players()
+            
+    async def _start_game_for_all_players(self) -> None:
+        self.game_state = GameState.PLACEMENT_PHASE
+        self.match_started_at = time.monotonic()
+        for player in self.players.values():
+            player.shots_fired = player.shots_hit = player.missed_turns = 0
+        self._set_deadline(PLACEMENT_TIMEOUT, self._on_placement_timeout)
+        
+        start_message = self._create_game_start_message()
+        
+        for player_id, player in list(self.players.items()):
+            await self._send_game_start_to_player(player_id, player, start_message)
+        
+    def _create_game_start_message(self) -> Dict[str, Any]:
+        return {
+            'phase': 'placement',
+            'message': GAME_MESSAGES['GAME_STARTED'],
+            'redirect_to_game': True
+        }
+        
+    async def _send_game_start_to_player(self, player_id: str, player: Player, 
+                                       start_message: Dict[str, Any]) -> None:
+        await player.send_message(MessageType.GAME_START, start_message)
+
+    async def start_battle_phase(self) -> None:
+        self.game_state = GameState.BATTLE_PHASE
+        
+        player_ids = list(self.players.keys())
+        
+        if not self._validate_battle_start(player_ids):
+            return
+            
+        self.current_turn = self._choose_starting_player(player_ids)
+        self._start_turn_timer()
+        log_event(logger, logging.INFO, 'battle_started', room_id=self.room_id,
+                  starting_player=self.current_turn, seed=self.seed)
+        
+        await self.broadcast_game_state()
+        
+    def _validate_battle_start(self, player_ids: list) -> bool:
+        if len(player_ids) < MAX_PLAYERS:
+            return False
+        return True
+        
+    def _start_turn_timer(self) -> None:
+        turn_owner = self.current_turn
+        self._set_deadline(TURN_TIMEOUT, lambda: self._on_turn_timeout(turn_owner))
+        
+    async def _on_turn_timeout(self, turn_owner: str) -> None:
+        self.deadline = None
+        if self.game_state != GameState.BATTLE_PHASE or self.current_turn != turn_owner:
+            return
+            
+        player = self.players[turn_owner]
+        opponent_id = self._find_opponent_id(turn_owner)
+        player.missed_turns += 1
+        log_event(logger, logging.INFO, 'turn_timed_out', room_id=self.room_id, player_id=turn_owner,
+                  missed_turns=player.missed_turns)
+        
+        if player.missed_turns >= MAX_MISSED_TURNS:
+            await self.end_game(opponent_id)
+            return
+            
+        self.current_turn = opponent_id
+        self._start_turn_timer()
+        await self.broadcast_game_state()
+        
+    def _choose_starting_player(self, player_ids: list) -> str:
+        return self.rng.choice(player_ids)
+        
+    async def broadcast_game_state(self) -> None:
+        game_data = self._create_game_state_data()
+        delta = self.state_tracker.update(game_data)
+        
+        for player_id, player in list(self.players.items()):
+            await self._send_game_state_to_player(player_id, player, delta)
+            
+    def _create_game_state_data(self) -> Dict[str, Any]:
+        return {
+            'phase': self.game_state.value,
+            'current_turn': self.current_turn,
+            'players': {pid: {'ready': p.ships_placed} for pid, p in self.players.items()}
+        }
+        
+    async def _send_game_state_to_player(self, player_id: str, player: Player, 
+                                       delta: Optional[Dict[str, Any]]) -> None:
+        if player.state_version == self.state_tracker.version:
+            return
+            
+        if delta is not None and player.state_version == delta['base_version']:
+            sent = await player.send_message(MessageType.GAME_STATE_DELTA, delta)
+        else:
+            sent = await player.send_message(MessageType.GAME_UPDATE, self.state_tracker.snapshot())
+            
+        if sent:
+            player.state_version = self.state_tracker.version
+            
+    async def handle_state_request(self, player: Player) -> None:
+        self.state_tracker.update(self._create_game_state_data())
+        
+        if await player.send_message(MessageType.GAME_UPDATE, self.state_tracker.snapshot()):
+            player.state_version = self.state_tracker.version
+
+    async def end_game(self, winner_id: str) -> None:
+        self.game_state = GameState.GAME_OVER
+        self._cancel_deadline()
+        # Desde el game_start, no desde que se creó la sala: el lobby no es parte de la partida
+        # y una sala reutilizada acumularía las anteriores.
+        duration = time.monotonic() - self.match_started_at
+        log_event(logger, logging.INFO, 'game_over', room_id=self.room_id, winner=winner_id,
+                  seed=self.seed, duration=duration)
+        self._record_match_result(winner_id, duration)
+        
+        for player_id, player in list(self.players.items()):
+            await self._send_game_over_message(player_id, player, winner_id)
+            
+    def _record_match_result(self, winner_id: str, duration: float) -> None:
+        loser_id = self._find_opponent_id(winner_id)
+        if self.stats_store is None or loser_id is None:
+            return
+            
+        winner, loser = self.players[winner_id], self.players[loser_id]
+        if winner.stats_id == loser.stats_id:
+            # Dos ventanas del mismo cliente jugando entre sí: no cuenta para el ranking.
+            return
+            
+        self.stats_store.record_match({
+            'room_id': self.room_id,
+            'seed': str(self.seed),
+            'winner_id': winner.stats_id,
+            'loser_id': loser.stats_id,
+            'winner_is_ai': winner.is_ai,
+            'loser_is_ai': loser.is_ai,
+            'winner_shots': winner.shots_fired,
+            'winner_hits': winner.shots_hit,
+            'loser_shots': loser.shots_fired,
+            'loser_hits': loser.shots_hit,
+            'duration': duration,
+            'finished_at': time.time()
+        })
+            
+    async def _send_game_over_message(self, player_id: str, player: Player, winner_id: str) -> None:
+        is_winner = player_id == winner_id
+        message = GAME_MESSAGES['WINNER'] if is_winner else GAME_MESSAGES['LOSER']
+        
+        await player.send_message(MessageType.GAME_OVER, {
+            'winner': winner_id,
+            'is_winner': is_winner,
+            'message': message
+        })
+
+    def all_players_ready(self) -> bool:
+        return (len(self.players) == MAX_PLAYERS and 
+                all(player.ships_placed for player in self.players.values()))
\ No newline at end of file
@@ -0,0 +1,68 @@
+import copy
+from typing import Dict, Optional, Any, List, Tuple
+
+_MISSING = object()
+
+
+class GameStateTracker:
+    """Versiona el estado de la partida y calcula deltas entre versiones.
+
+    Cada cambio real del estado incrementa la versión. Un delta solo contiene
+    los campos que cambiaron respecto de la versión anterior (``changes``) y las
+    rutas de claves que desaparecieron (``removed``).
+    """
+
+    def __init__(self) -> None:
+        self.version = 0
+        self._last_state: Optional[Dict[str, Any]] = None
+
+    def update(self, new_state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        previous_version = self.version
+
+        if self._last_state is None:
+            changes, removed = copy.deepcopy(new_state), []
+        else:
+            changes, removed = self._diff(self._last_state, new_state)
+            if not changes and not removed:
+                return None
+
+        self.version += 1
+        self._last_state = copy.deepcopy(new_state)
+        return self._create_delta(previous_version, changes, removed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = copy.deepcopy(self._last_state) if self._last_state is not None else {}
+        state['version'] = self.version
+        return state
+
+    def _create_delta(self, base_version: int, changes: Dict[str, Any],
+                      removed: List[List[str]]) -> Dict[str, Any]:
+        return {
+            'version': self.version,
+            'base_version': base_version,
+            'changes': changes,
+            'removed': removed
+        }
+
+    @classmethod
+    def _diff(cls, old: Dict[str, Any], new: Dict[str, Any],
+              path: Tuple[str, ...] = ()) -> Tuple[Dict[str, Any], List[List[str]]]:
+        changes: Dict[str, Any] = {}
+        removed: List[List[str]] = []
+
+        for key, new_value in new.items():
+            old_value = old.get(key, _MISSING)
+            if isinstance(old_value, dict) and isinstance(new_value, dict):
+                nested_changes, nested_removed = cls._diff(old_value, new_value, path + (key,))
+                if nested_changes:
+                    changes[key] = nested_changes
+                removed.extend(nested_removed)
+            elif old_value is _MISSING or old_value != new_value:
+                changes[key] = copy.deepcopy(new_value)
+
+        for key in old:
+            if key not in new:
+                removed.append(list(path + (key,)))
+
+        return changes, removed
+
@@ -0,0 +1,85 @@
+import bisect
+import sys
+import os
+from typing import Dict, Optional, Any, List, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import *
+
+
+def expected_score(rating: float, opponent_rating: float) -> float:
+    return 1 / (1 + 10 ** ((opponent_rating - rating) / ELO_SCALE))
+
+
+class Leaderboard:
+    """Ratings Elo en memoria con el ranking ordenado siempre a mano.
+
+    ``_ranking`` es una lista ordenada de ``(-rating, player_id)``: cada partida
+    saca y vuelve a insertar solo a sus dos jugadores con ``bisect``, así el
+    puesto de un jugador se busca en O(log n) sin recorrer el historial. El
+    top-N ya armado queda en caché hasta que una partida toque esos puestos.
+    """
+
+    def __init__(self, k_factor: float = ELO_K_FACTOR, initial_rating: float = ELO_INITIAL_RATING):
+        self.k_factor = k_factor
+        self.initial_rating = initial_rating
+        self.ratings: Dict[str, float] = {}
+        self.games: Dict[str, int] = {}
+        self._ranking: List[Tuple[float, str]] = []
+        self._top_cache: Dict[int, List[Dict[str, Any]]] = {}
+
+    def load(self, rows: List[Tuple[str, float, int]]) -> None:
+        self.ratings = {player_id: rating for player_id, rating, _ in rows}
+        self.games = {player_id: games for player_id, _, games in rows}
+        self._ranking = sorted((-rating, player_id) for player_id, rating in self.ratings.items())
+        self._top_cache.clear()
+
+    def rating(self, player_id: str) -> float:
+        return self.ratings.get(player_id, self.initial_rating)
+
+    def record_result(self, winner_id: str, loser_id: str) -> Tuple[float, float]:
+        winner_rating, loser_rating = self.rating(winner_id), self.rating(loser_id)
+        change = self.k_factor * (1 - expected_score(winner_rating, loser_rating))
+
+        first_changed = min(self._update(winner_id, winner_rating + change),
+                            self._update(loser_id, loser_rating - change))
+        self._invalidate_top(first_changed)
+        return self.ratings[winner_id], self.ratings[loser_id]
+
+    def rank(self, player_id: str) -> Optional[int]:
+        if player_id not in self.ratings:
+            return None
+        return bisect.bisect_left(self._ranking, (-self.ratings[player_id], player_id)) + 1
+
+    def top(self, count: int = LEADERBOARD_TOP_SIZE) -> List[Dict[str, Any]]:
+        if count not in self._top_cache:
+            self._top_cache[count] = [
+                {'rank': position, 'player_id': player_id, 'rating': round(-negative_rating),
+                 'games': self.games.get(player_id, 0)}
+                for position, (negative_rating, player_id) in enumerate(self._ranking[:count], start=1)
+            ]
+        return self._top_cache[count]
+
+    def entry(self, player_id: str) -> Optional[Dict[str, Any]]:
+        rank = self.rank(player_id)
+        if rank is None:
+            return None
+        return {'rank': rank, 'player_id': player_id, 'rating': round(self.ratings[player_id]),
+                'games': self.games.get(player_id, 0)}
+
+    def _update(self, player_id: str, rating: float) -> int:
+        """Mueve a ``player_id`` a su nuevo lugar y devuelve el primer índice del ranking que cambió."""
+        old_position = len(self._ranking)
+        if player_id in self.ratings:
+            old_position = bisect.bisect_left(self._ranking, (-self.ratings[player_id], player_id))
+            del self._ranking[old_position]
+
+        new_position = bisect.bisect_left(self._ranking, (-rating, player_id))
+        self._ranking.insert(new_position, (-rating, player_id))
+        self.ratings[player_id] = rating
+        self.games[player_id] = self.games.get(player_id, 0) + 1
+        return min(old_position, new_position)
+
+    def _invalidate_top(self, position: int) -> None:
+        for count in [count for count in self._top_cache if position < count]:
+            del self._top_cache[count]
@@ -1,29 +1,73 @@
 import asyncio
 import json
+import secrets
+import time
 import sys
 import os
 from typing import List, Dict, Optional, Any
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'game', 'classes'))
 from ship import Ship
+from placement_index import get_placement_index
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from constants import *
 from classes.enums import MessageType
+from classes.token_bucket import TokenBucket
+from classes.structured_logging import get_logger
+
+logger = get_logger('player')
 
 class Player:
     
-    def __init__(self, player_id: str, writer: asyncio.StreamWriter):
+    is_ai = False
+    
+    def __init__(self, player_id: str, writer: asyncio.StreamWriter, channel: Optional[int] = None,
+                 stats_id: Optional[str] = None):
         self.player_id = player_id
+        # Clave de estadísticas y rating: sale del id fijo del cliente o, si no mandó, de la sesión.
+        self.stats_id = stats_id or player_id
         self.writer = writer
+        self.channel = channel
+        self.resume_token = secrets.token_urlsafe(RESUME_TOKEN_BYTES)
         self.ships_placed = False
         self.grid = self._initialize_grid()
         self.ships = []
+        self.occupied_mask = 0
+        self.shots_fired = 0
+        self.shots_hit = 0
+        self.missed_turns = 0
+        self.state_version: Optional[int] = None
+        self.last_activity = time.monotonic()
+        self.message_bucket = TokenBucket(RATE_LIMIT_MESSAGES_PER_SECOND, RATE_LIMIT_BURST)
+        self.error_bucket = TokenBucket(ERROR_REPLIES_PER_SECOND, ERROR_REPLY_BURST)
+        self.last_drain_latency = 0.0
+        self.max_drain_latency = 0.0
+        
+    def touch(self) -> None:
+        self.last_activity = time.monotonic()
+        
+    def is_connection_closed(self) -> bool:
+        return self.writer.is_closing()
         
     def _initialize_grid(self) -> List[List[int]]:
         return [[CELL_EMPTY for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
     
+    def to_snapshot(self) -> Dict[str, Any]:
+        return {
+            'ships_placed': self.ships_placed,
+            'grid': self.grid,
+            'ships': [{
+                'name': ship.ship_type,
+                'positions': [list(position) for position in ship.positions],
+                'hits': sorted(list(hit) for hit in ship.hits)
+            } for ship in self.ships]
+        }
+    
     async def send_message(self, message_type: MessageType, data: Optional[Any] = None) -> bool:
+        if self.is_connection_closed():
+            return False
+            
         try:
             message = self._create_message(message_type, data)
             await self._send_raw_message(message)
@@ -31,33 +75,54 @@ class Player:
         except (ConnectionResetError, BrokenPipeError):
             return False
         except Exception:
+            logger.exception('send_failed', extra={'fields': {'player_id': self.player_id,
+                                                              'message_type': message_type.value}})
             return False
             
+    async def send_bounded_error(self, error_message: str) -> bool:
+        if not self.error_bucket.consume():
+            return False
+        return await self.send_message(MessageType.ERROR, {'error': error_message})
+        
     def _create_message(self, message_type: MessageType, data: Optional[Any]) -> str:
         message = {
             'type': message_type.value,
             'data': data
         }
+        if self.channel is not None:
+            message['channel'] = self.channel
         return json.dumps(message) + JSON_MESSAGE_DELIMITER
         
     async def _send_raw_message(self, message: str) -> None:
         self.writer.write(message.encode(UTF8_ENCODING))
+        started = time.perf_counter()
         await self.writer.drain()
+        self.last_drain_latency = time.perf_counter() - started
+        self.max_drain_latency = max(self.max_drain_latency, self.last_drain_latency)
+        
+    def write_queue_depth(self) -> int:
+        transport = self.writer.transport
+        return transport.get_write_buffer_size() if transport is not None else 0
         
     def place_ship(self, positions: List[tuple]) -> None:
         valid_positions = self._validate_ship_positions(positions)
-        
-        if valid_positions:
-            self._create_and_add_ship(valid_positions)
+        self._create_and_add_ship(valid_positions)
              
     def _validate_ship_positions(self, positions: List[tuple]) -> List[tuple]:
-        valid_positions = []
-        for x, y in positions:
-            if self._is_valid_position(x, y):
-                self.grid[y][x] = CELL_SHIP
-                valid_positions.append((x, y))
+        placement_index = get_placement_index(GRID_SIZE)
+        cells = [tuple(position) for position in positions]
+        
+        if not placement_index.is_legal(cells):
+            raise ValueError(ERROR_MESSAGES_SHIP['INVALID_PLACEMENT'])
             
-        return valid_positions
+        mask = placement_index.mask_for(cells)
+        if mask & self.occupied_mask:
+            raise ValueError(ERROR_MESSAGES_SHIP['OVERLAPPING_PLACEMENT'])
+            
+        self.occupied_mask |= mask
+        for x, y in cells:
+            self.grid[y][x] = CELL_SHIP
+        return cells
         
     def _is_valid_position(self, x: int, y: int) -> bool:
         return MIN_COORDINATE <= x < GRID_SIZE and MIN_COORDINATE <= y < GRID_SIZE
@@ -114,18 +179,34 @@ class Player:
         }
         
     def _process_already_hit(self, x: int, y: int) -> Dict[str, Any]:
+        # ``repeat`` marca que la celda ya había recibido un disparo: no es un acierto nuevo.
         current_cell = self.grid[y][x]
         
         if current_cell == CELL_HIT:
             ship = self.find_ship_containing(x, y)
             if ship and ship.is_sunk():
-                return self._create_sunk_ship_result(ship)
+                result = self._create_sunk_ship_result(ship)
             else:
-                return {'result': SHOT_RESULT_HIT}
-        elif current_cell == CELL_WATER_HIT:
-            return {'result': SHOT_RESULT_MISS}
+                result = {'result': SHOT_RESULT_HIT}
         else:
-            return {'result': SHOT_RESULT_MISS}
+            result = {'result': SHOT_RESULT_MISS}
+        result['repeat'] = True
+        return result
+    
+    def shots_received(self) -> List[List[Any]]:
+        """Disparos recibidos como ``[x, y, resultado]``, tal como los vio quien disparó."""
+        shots = []
+        for y, row in enumerate(self.grid):
+            for x, cell in enumerate(row):
+                if cell == CELL_WATER_HIT:
+                    shots.append([x, y, SHOT_RESULT_MISS])
+                elif cell == CELL_HIT:
+                    ship = self.find_ship_containing(x, y)
+                    shots.append([x, y, SHOT_RESULT_SUNK if ship and ship.is_sunk() else SHOT_RESULT_HIT])
+        return shots
+        
+    def sunk_ships(self) -> List[Dict[str, Any]]:
+        return [self._create_sunk_ship_result(ship)['ship_info'] for ship in self.ships if ship.is_sunk()]
     
     def all_ships_sunk(self) -> bool:
         if not self.ships:
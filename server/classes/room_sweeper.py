@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import sys
+import time
+import os
+from enum import Enum
+from typing import Dict, Optional, Any, List, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import *
+from classes.structured_logging import get_logger, log_event
+from classes.stats_store import StatsStore
+from classes.leaderboard import Leaderboard
+from classes.timer_wheel import TimerWheel, TimerHandle
+
+logger = get_logger('sweeper')
+
+
+class RoomSweeper:
+    """Recolector periódico de salas inactivas y conexiones abandonadas.
+
+    Una sala se considera inactiva cuando ningún jugador envió mensajes durante
+    más tiempo que el límite de su fase (``ROOM_IDLE_TIMEOUTS``). Una conexión
+    se considera abandonada cuando el transporte ya se está cerrando o cuando el
+    cliente dejó de leer y su buffer de escritura supera el umbral configurado.
+    """
+
+    def __init__(self, server: Any, interval: float = ROOM_SWEEP_INTERVAL,
+                 idle_timeouts: Optional[Dict[str, float]] = None):
+        self.server = server
+        self.interval = interval
+        self.idle_timeouts = idle_timeouts or ROOM_IDLE_TIMEOUTS
+        self.task: Optional[asyncio.Task] = None
+        self.rooms_evicted = 0
+        self.connections_evicted = 0
+        self.bytes_reclaimed = 0
+
+    def start(self) -> None:
+        if self.task is None:
+            self.task = asyncio.create_task(self._sweep_forever())
+
+    async def stop(self) -> None:
+        if self.task is None:
+            return
+
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.sweep()
+
+    async def sweep(self) -> Dict[str, int]:
+        now = time.monotonic()
+        idle_rooms = self._find_idle_rooms(now)
+        abandoned_players = self._find_abandoned_players(idle_rooms)
+
+        reclaimed = 0
+        for room in idle_rooms:
+            reclaimed += self._estimate_size(room)
+            await self.server.evict_room(room, CONNECTION_ERROR_MESSAGES['ROOM_IDLE'])
+
+        for player in abandoned_players:
+            reclaimed += self._estimate_size(player)
+            await self.server.evict_player(player.player_id)
+
+        report = self._record_sweep(len(idle_rooms), len(abandoned_players), reclaimed)
+        if idle_rooms or abandoned_players:
+            log_event(logger, logging.INFO, 'sweep_completed', rooms=report['rooms'],
+                      connections=report['connections'], reclaimed_kb=round(report['bytes'] / BYTES_PER_KB, 1),
+                      total_reclaimed_kb=round(self.bytes_reclaimed / BYTES_PER_KB, 1))
+        return report
+
+    def _find_idle_rooms(self, now: float) -> List[Any]:
+        idle_rooms = []
+        for room in list(self.server.rooms.values()):
+            timeout = self.idle_timeouts.get(room.game_state.value)
+            if timeout is not None and now - room.last_activity > timeout:
+                idle_rooms.append(room)
+        return idle_rooms
+
+    def _find_abandoned_players(self, evicted_rooms: List[Any]) -> List[Any]:
+        evicted_ids = {room.room_id for room in evicted_rooms}
+        abandoned = []
+        for player_id, player in list(self.server.players.items()):
+            room = self.server.player_rooms.get(player_id)
+            if room is not None and room.room_id in evicted_ids:
+                continue
+            if player_id in self.server.suspended_players:
+                continue
+            if self._is_abandoned(player):
+                abandoned.append(player)
+        return abandoned
+
+    def _is_abandoned(self, player: Any) -> bool:
+        if player.is_connection_closed():
+            return True
+        return player.write_queue_depth() > ABANDONED_WRITE_BUFFER_BYTES
+
+    def _record_sweep(self, rooms: int, connections: int, reclaimed: int) -> Dict[str, int]:
+        self.rooms_evicted += rooms
+        self.connections_evicted += connections
+        self.bytes_reclaimed += reclaimed
+        return {'rooms': rooms, 'connections': connections, 'bytes': reclaimed}
+
+    def _estimate_size(self, obj: Any) -> int:
+        seen = set()
+        pending: List[Any] = [obj]
+        total = 0
+
+        while pending:
+            current = pending.pop()
+            if id(current) in seen or self._is_runtime_object(current):
+                continue
+            seen.add(id(current))
+            total += sys.getsizeof(current)
+            pending.extend(self._referenced_objects(current))
+
+        return total
+
+    def _referenced_objects(self, obj: Any) -> Tuple[Any, ...]:
+        if isinstance(obj, dict):
+            return tuple(obj.keys()) + tuple(obj.values())
+        if isinstance(obj, (list, tuple, set, frozenset)):
+            return tuple(obj)
+        if hasattr(obj, '__dict__'):
+            return (obj.__dict__,)
+        return ()
+
+    def _is_runtime_object(self, obj: Any) -> bool:
+        # Lo compartido entre salas (estadísticas, ranking, rueda de timers) no se libera
+        # al desalojar una: contarlo inflaría los bytes y haría el recorrido crecer con el ranking.
+        return isinstance(obj, (asyncio.StreamWriter, asyncio.StreamReader, asyncio.BaseTransport,
+                                asyncio.AbstractEventLoop, asyncio.Future, Enum, type,
+                                StatsStore, Leaderboard, TimerWheel, TimerHandle))
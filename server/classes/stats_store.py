@@ -0,0 +1,200 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import sys
+import os
+from collections import defaultdict
+from contextlib import closing
+from typing import Dict, Optional, Any, List, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import *
+from classes.leaderboard import Leaderboard
+from classes.structured_logging import get_logger, log_event
+
+logger = get_logger('stats')
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS matches (
+        match_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        room_id TEXT NOT NULL,
+        seed TEXT,
+        winner_id TEXT NOT NULL,
+        loser_id TEXT NOT NULL,
+        winner_shots INTEGER NOT NULL,
+        winner_hits INTEGER NOT NULL,
+        loser_shots INTEGER NOT NULL,
+        loser_hits INTEGER NOT NULL,
+        duration REAL NOT NULL,
+        finished_at REAL NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS player_stats (
+        player_id TEXT PRIMARY KEY,
+        games INTEGER NOT NULL DEFAULT 0,
+        wins INTEGER NOT NULL DEFAULT 0,
+        shots INTEGER NOT NULL DEFAULT 0,
+        hits INTEGER NOT NULL DEFAULT 0,
+        last_played REAL
+    )""",
+    """CREATE TABLE IF NOT EXISTS ratings (
+        player_id TEXT PRIMARY KEY,
+        rating REAL NOT NULL,
+        games INTEGER NOT NULL
+    )"""
+)
+MATCH_COLUMNS = ('room_id', 'seed', 'winner_id', 'loser_id', 'winner_shots', 'winner_hits',
+                 'loser_shots', 'loser_hits', 'duration', 'finished_at')
+STOP = object()
+
+
+class StatsStore:
+    """Resultados de partidas y estadísticas por jugador en SQLite (modo WAL).
+
+    El event loop solo encola el resultado con ``record_match``; un hilo
+    escritor junta lo que haya en la cola (hasta ``batch_size``) y lo guarda
+    en una sola transacción, así una ráfaga de partidas terminando a la vez
+    cuesta un commit y nunca bloquea el juego. Las lecturas abren su propia
+    conexión: con WAL no esperan al escritor.
+
+    Los ratings Elo viven en ``leaderboard``: se cargan al arrancar y se
+    actualizan en memoria al registrar cada partida; la base solo guarda el
+    último valor de cada jugador para el próximo arranque.
+    """
+
+    def __init__(self, path: str = STATS_DB_PATH, batch_size: int = STATS_BATCH_SIZE,
+                 flush_interval: float = STATS_FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.thread: Optional[threading.Thread] = None
+        self.matches_written = 0
+        self.batches_written = 0
+        self.leaderboard = Leaderboard()
+
+    def start(self) -> 'StatsStore':
+        if self.thread is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with closing(self._connect()) as connection, connection:
+                connection.execute('PRAGMA journal_mode=WAL')
+                for statement in SCHEMA:
+                    connection.execute(statement)
+                self.leaderboard.load(connection.execute('SELECT player_id, rating, games FROM ratings').fetchall())
+            self.thread = threading.Thread(target=self._write_forever, name='stats-writer', daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Guarda lo pendiente y termina el hilo escritor (bloqueante)."""
+        if self.thread is None:
+            return
+        self.queue.put(STOP)
+        self.thread.join()
+        self.thread = None
+
+    def record_match(self, result: Dict[str, Any]) -> None:
+        if not (result.get('winner_is_ai') or result.get('loser_is_ai')):
+            self.leaderboard.record_result(result['winner_id'], result['loser_id'])
+            result['ratings'] = [(player_id, self.leaderboard.ratings[player_id], self.leaderboard.games[player_id])
+                                 for player_id in (result['winner_id'], result['loser_id'])]
+        self.queue.put(result)
+
+    def player_stats(self, player_id: str) -> Optional[Dict[str, Any]]:
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                'SELECT player_id, games, wins, shots, hits FROM player_stats WHERE player_id = ?',
+                (player_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        stats = dict(zip(('player_id', 'games', 'wins', 'shots', 'hits'), row))
+        stats['accuracy'] = stats['hits'] / stats['shots'] if stats['shots'] else 0.0
+        return stats
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=STATS_BUSY_TIMEOUT)
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    def _write_forever(self) -> None:
+        connection = self._connect()
+        try:
+            running = True
+            while running:
+                batch, running = self._next_batch()
+                if batch:
+                    self._write_batch(connection, batch)
+        finally:
+            connection.close()
+
+    def _next_batch(self) -> Tuple[List[Dict[str, Any]], bool]:
+        try:
+            first = self.queue.get(timeout=self.flush_interval)
+        except queue.Empty:
+            return [], True
+        if first is STOP:
+            return [], False
+
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is STOP:
+                return batch, False
+            batch.append(item)
+        return batch, True
+
+    def _write_batch(self, connection: sqlite3.Connection, batch: List[Dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        try:
+            with connection:
+                connection.executemany(
+                    f"INSERT INTO matches ({', '.join(MATCH_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' for _ in MATCH_COLUMNS)})",
+                    [tuple(result.get(column) for column in MATCH_COLUMNS) for result in batch]
+                )
+                self._update_player_stats(connection, batch)
+                self._save_ratings(connection, batch)
+        except sqlite3.Error as e:
+            log_event(logger, logging.ERROR, 'stats_write_failed', matches=len(batch), error=str(e))
+            return
+
+        self.matches_written += len(batch)
+        self.batches_written += 1
+        log_event(logger, logging.DEBUG, 'stats_batch_written', matches=len(batch),
+                  ms=(time.perf_counter() - started) * 1000)
+
+    def _update_player_stats(self, connection: sqlite3.Connection, batch: List[Dict[str, Any]]) -> None:
+        totals: Dict[str, Dict[str, Any]] = defaultdict(lambda: {'games': 0, 'wins': 0, 'shots': 0, 'hits': 0})
+        for result in batch:
+            for side in ('winner', 'loser'):
+                if result.get(f'{side}_is_ai'):
+                    continue
+                player = totals[result[f'{side}_id']]
+                player['games'] += 1
+                player['wins'] += side == 'winner'
+                player['shots'] += result[f'{side}_shots']
+                player['hits'] += result[f'{side}_hits']
+                player['last_played'] = result['finished_at']
+
+        rows = [(player['games'], player['wins'], player['shots'], player['hits'], player['last_played'], player_id)
+                for player_id, player in totals.items()]
+        connection.executemany('INSERT OR IGNORE INTO player_stats (player_id) VALUES (?)',
+                               [(row[-1],) for row in rows])
+        connection.executemany(
+            'UPDATE player_stats SET games = games + ?, wins = wins + ?, shots = shots + ?, '
+            'hits = hits + ?, last_played = ? WHERE player_id = ?',
+            rows
+        )
+
+    def _save_ratings(self, connection: sqlite3.Connection, batch: List[Dict[str, Any]]) -> None:
+        latest = {player_id: (rating, games)
+                  for result in batch for player_id, rating, games in result.get('ratings', ())}
+        connection.executemany('INSERT OR REPLACE INTO ratings (player_id, rating, games) VALUES (?, ?, ?)',
+                               [(player_id, rating, games) for player_id, (rating, games) in latest.items()])
@@ -0,0 +1,196 @@
+import collections
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import os
+import threading
+import time
+from typing import Dict, Optional, Any, List
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import *
+
+
+def get_logger(component: str) -> logging.Logger:
+    return logging.getLogger(f"{LOGGER_NAME}.{component}")
+
+
+def log_event(logger: logging.Logger, level: int, event: str, **fields: Any) -> None:
+    """Registra ``event`` con ``fields`` como atributos estructurados del registro."""
+    if logger.isEnabledFor(level):
+        logger.log(level, event, extra={'fields': fields})
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Serializa cada registro como un objeto JSON en una sola línea."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': round(record.created, 6),
+            'level': record.levelname,
+            'logger': record.name,
+            'event': record.getMessage()
+        }
+        entry.update(getattr(record, 'fields', None) or {})
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class MessageTypeSampler(logging.Filter):
+    """Deja pasar uno de cada N registros según el ``message_type`` del evento.
+
+    Los tipos sin tasa configurada, los registros de nivel WARNING o mayor y
+    los spans de trazas pasan siempre. El conteo es determinista para no pagar un ``random`` por
+    mensaje en los caminos calientes.
+    """
+
+    def __init__(self, sample_rates: Optional[Dict[str, int]] = None):
+        super().__init__()
+        self.sample_rates = dict(sample_rates if sample_rates is not None else LOG_SAMPLE_RATES)
+        self.seen: Dict[str, int] = collections.Counter()
+        self.dropped: Dict[str, int] = collections.Counter()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or record.name == TRACE_LOGGER_NAME:
+            return True
+
+        message_type = (getattr(record, 'fields', None) or {}).get('message_type')
+        rate = self.sample_rates.get(message_type)
+        if not rate or rate <= 1:
+            return True
+
+        self.seen[message_type] += 1
+        if self.seen[message_type] % rate == 1:
+            record.fields['sample_rate'] = rate
+            return True
+        self.dropped[message_type] += 1
+        return False
+
+
+class ExcludeLoggerFilter(logging.Filter):
+    """Inverso de ``logging.Filter``: descarta los registros del logger ``name`` y sus hijos."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not super().filter(record)
+
+
+class RingBufferHandler(logging.Handler):
+    """Conserva las últimas ``capacity`` líneas formateadas para volcarlas a pedido."""
+
+    def __init__(self, capacity: int = LOG_RING_BUFFER_SIZE):
+        super().__init__()
+        self.records = collections.deque(maxlen=capacity)
+        self._dump_lock = threading.Lock()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.records.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+    def recent(self) -> List[str]:
+        return list(self.records)
+
+    def dump(self, path: Optional[str] = None) -> str:
+        if path is None:
+            os.makedirs(LOG_DUMP_DIR, exist_ok=True)
+            path = os.path.join(LOG_DUMP_DIR, f"recent-{time.strftime('%Y%m%d-%H%M%S')}.jsonl")
+
+        with self._dump_lock, open(path, 'w', encoding=UTF8_ENCODING) as dump_file:
+            for line in self.recent():
+                dump_file.write(line + JSON_MESSAGE_DELIMITER)
+        return path
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que conserva los campos estructurados del registro.
+
+    El ``prepare`` de la librería estándar aplana el registro con el formatter
+    por defecto; aquí solo se resuelve el mensaje y la traza de la excepción
+    para que el JSON se arme en el hilo del listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class LoggingPipeline:
+    """Cola de logging del servidor: el event loop solo encola y un hilo escribe.
+
+    El muestreo por tipo de mensaje se aplica antes de encolar, así los
+    registros descartados no cuestan más que el filtro.
+    """
+
+    def __init__(self, level: int = logging.INFO, log_path: Optional[str] = None,
+                 sample_rates: Optional[Dict[str, int]] = None,
+                 ring_size: int = LOG_RING_BUFFER_SIZE, trace_path: Optional[str] = None):
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.sampler = MessageTypeSampler(sample_rates)
+        self.ring_buffer = RingBufferHandler(ring_size)
+        self.output = self._create_output_handler(log_path)
+        self.trace_output = self._create_trace_handler(trace_path)
+        self.logger = logging.getLogger(LOGGER_NAME)
+        self.trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
+        self.level = level
+        self.queue_handler = StructuredQueueHandler(self.queue)
+        self.queue_handler.addFilter(self.sampler)
+        handlers = [self.output, self.ring_buffer] + ([self.trace_output] if self.trace_output else [])
+        self.listener = logging.handlers.QueueListener(
+            self.queue, *handlers, respect_handler_level=True
+        )
+
+    def _create_output_handler(self, log_path: Optional[str]) -> logging.Handler:
+        if log_path:
+            handler: logging.Handler = logging.FileHandler(log_path, encoding=UTF8_ENCODING)
+        else:
+            handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(JsonLineFormatter())
+        handler.addFilter(ExcludeLoggerFilter(TRACE_LOGGER_NAME))
+        self.ring_buffer.setFormatter(JsonLineFormatter())
+        return handler
+
+    def _create_trace_handler(self, trace_path: Optional[str]) -> Optional[logging.Handler]:
+        if not trace_path:
+            return None
+
+        handler = logging.FileHandler(trace_path, encoding=UTF8_ENCODING)
+        handler.setFormatter(JsonLineFormatter())
+        handler.addFilter(logging.Filter(TRACE_LOGGER_NAME))
+        return handler
+
+    def start(self) -> 'LoggingPipeline':
+        self.logger.setLevel(self.level)
+        self.trace_logger.setLevel(logging.INFO if self.trace_output else TRACE_DISABLED_LEVEL)
+        self.logger.addHandler(self.queue_handler)
+        self.logger.propagate = False
+        self.listener.start()
+        return self
+
+    def stop(self) -> None:
+        self.logger.removeHandler(self.queue_handler)
+        self.logger.propagate = True
+        self.listener.stop()
+        self.output.close()
+        if self.trace_output:
+            self.trace_output.close()
+
+    def dump_recent(self, path: Optional[str] = None) -> str:
+        return self.ring_buffer.dump(path)
+
+
+def setup_logging(level: int = logging.INFO, log_path: Optional[str] = None,
+                  sample_rates: Optional[Dict[str, int]] = None,
+                  trace_path: Optional[str] = None) -> LoggingPipeline:
+    return LoggingPipeline(level, log_path, sample_rates, trace_path=trace_path).start()
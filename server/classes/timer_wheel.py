@@ -0,0 +1,114 @@
+import asyncio
+import inspect
+import logging
+import math
+import sys
+import os
+from typing import Callable, Optional, Any, List, Set
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import *
+from classes.structured_logging import get_logger, log_event
+
+logger = get_logger('timers')
+
+
+class TimerHandle:
+    __slots__ = ('expires_tick', 'callback', 'cancelled')
+
+    def __init__(self, expires_tick: int, callback: Callable[[], Any]):
+        self.expires_tick = expires_tick
+        self.callback = callback
+        self.cancelled = False
+
+
+class TimerWheel:
+    """Rueda de temporizadores con hash: una sola tarea de asyncio para todas las salas.
+
+    Cada temporizador cae en la ranura ``tick_de_vencimiento % slots``; en cada
+    tick solo se revisa esa ranura, así programar y cancelar cuestan O(1) y el
+    event loop ve un único ``sleep`` por tick sin importar cuántas salas haya.
+    La precisión es de un tick (``TIMER_WHEEL_TICK``), de sobra para plazos de
+    turno de varios segundos. Si el callback devuelve una corrutina se lanza
+    como tarea.
+    """
+
+    def __init__(self, tick: float = TIMER_WHEEL_TICK, slots: int = TIMER_WHEEL_SLOTS):
+        self.tick = tick
+        self.slots: List[Set[TimerHandle]] = [set() for _ in range(slots)]
+        self.current_tick = 0
+        self.pending = 0
+        self.fired = 0
+        self.task: Optional[asyncio.Task] = None
+        self._callback_tasks: Set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        if self.task is None:
+            self.task = asyncio.create_task(self._turn_forever())
+
+    async def stop(self) -> None:
+        if self.task is None:
+            return
+
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+        for task in list(self._callback_tasks):
+            task.cancel()
+
+    def schedule(self, delay: float, callback: Callable[[], Any]) -> TimerHandle:
+        handle = TimerHandle(self.current_tick + max(1, math.ceil(delay / self.tick)), callback)
+        self.slots[handle.expires_tick % len(self.slots)].add(handle)
+        self.pending += 1
+        return handle
+
+    def cancel(self, handle: Optional[TimerHandle]) -> None:
+        if handle is None or handle.cancelled:
+            return
+        handle.cancelled = True
+        slot = self.slots[handle.expires_tick % len(self.slots)]
+        if handle in slot:
+            slot.discard(handle)
+            self.pending -= 1
+
+    def advance(self) -> int:
+        """Avanza un tick y dispara lo que vence en él; devuelve cuántos disparó."""
+        self.current_tick += 1
+        slot = self.slots[self.current_tick % len(self.slots)]
+        due = [handle for handle in slot if handle.expires_tick <= self.current_tick]
+        for handle in due:
+            slot.discard(handle)
+            self.pending -= 1
+            handle.cancelled = True
+            self._fire(handle)
+        self.fired += len(due)
+        return len(due)
+
+    def _fire(self, handle: TimerHandle) -> None:
+        try:
+            result = handle.callback()
+        except Exception:
+            logger.exception('timer_callback_failed')
+            return
+
+        if inspect.isawaitable(result):
+            task = asyncio.ensure_future(result)
+            self._callback_tasks.add(task)
+            task.add_done_callback(self._callback_finished)
+
+    def _callback_finished(self, task: asyncio.Task) -> None:
+        self._callback_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            log_event(logger, logging.ERROR, 'timer_callback_failed', error=repr(task.exception()))
+
+    async def _turn_forever(self) -> None:
+        loop = asyncio.get_running_loop()
+        started = loop.time() - self.current_tick * self.tick
+        while True:
+            await asyncio.sleep(max(0.0, started + (self.current_tick + 1) * self.tick - loop.time()))
+            target_tick = int((loop.time() - started) / self.tick)
+            while self.current_tick < target_tick:
+                self.advance()
@@ -0,0 +1,51 @@
+import logging
+import time
+import sys
+import os
+from contextlib import contextmanager
+from typing import Dict, Optional, Any, Iterator
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from constants import TRACE_LOGGER_NAME, TRACE_ID_MAX_LENGTH
+
+trace_logger = logging.getLogger(TRACE_LOGGER_NAME)
+
+
+def extract_trace_id(message: Dict[str, Any]) -> Optional[str]:
+    trace_id = message.get('trace_id')
+    if isinstance(trace_id, str) and 0 < len(trace_id) <= TRACE_ID_MAX_LENGTH:
+        return trace_id
+    return None
+
+
+def tracing_enabled() -> bool:
+    return trace_logger.isEnabledFor(logging.INFO)
+
+
+def record_span(trace_id: Optional[str], name: str, start: float, duration: float, **attrs: Any) -> None:
+    """Exporta un span terminado; ``start`` es hora de pared para cruzarlo con el cliente."""
+    if not trace_id or not tracing_enabled():
+        return
+
+    trace_logger.info('span', extra={'fields': {
+        'trace_id': trace_id,
+        'name': name,
+        'side': 'server',
+        'start': start,
+        'duration_ms': duration * 1000,
+        **attrs
+    }})
+
+
+@contextmanager
+def trace_span(trace_id: Optional[str], name: str, **attrs: Any) -> Iterator[None]:
+    if not trace_id or not tracing_enabled():
+        yield
+        return
+
+    start = time.time()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(trace_id, name, start, time.perf_counter() - started, **attrs)
@@ -7,8 +7,31 @@ DEFAULT_HOST_LOCALHOST = "localhost"
 DEFAULT_HOST_LOOPBACK = "127.0.0.1"
 NETWORK_BUFFER_SIZE = 1024
 NETWORK_TIMEOUT = 1.0
+MAX_FRAME_SIZE = 4 * 1024
+SERVER_LISTEN_BACKLOG = 1024
+
+ADMIN_SOCKET_NAME = 'battleship-admin-{port}.sock'
+ADMIN_SOCKET_MODE = 0o600
+ADMIN_TRAVERSAL_BATCH = 100
+ADMIN_PROFILE_TOP = 15
+
+DRAIN_DEADLINE = 300.0
+DRAIN_POLL_INTERVAL = 0.5
+DRAIN_SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots')
+
+STATS_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'stats.sqlite3')
+STATS_BATCH_SIZE = 200
+STATS_FLUSH_INTERVAL = 0.5
+STATS_BUSY_TIMEOUT = 5.0
+
+ELO_INITIAL_RATING = 1500.0
+ELO_K_FACTOR = 32.0
+ELO_SCALE = 400.0
+LEADERBOARD_TOP_SIZE = 10
+LEADERBOARD_MAX_SIZE = 50
 
 SERVER_READ_TIMEOUT = 1.0
+HANDSHAKE_TIMEOUT = 10.0
 SERVER_CLOSE_TIMEOUT = 5
 JSON_DECODE_MAX_RETRIES = 3
 CONNECTION_CHECK_INTERVAL = 1.0
@@ -30,19 +53,78 @@ CELL_HIT = 2
 CELL_WATER_HIT = 3
 
 MAX_PLAYERS = 2
+MAX_ROOMS = 500
+
+ROOM_SWEEP_INTERVAL = 30.0
+ROOM_IDLE_TIMEOUTS = {
+    'waiting_players': 1800.0,
+    'placement_phase': 300.0,
+    'game_over': 60.0
+}
+
+TIMER_WHEEL_TICK = 0.25
+TIMER_WHEEL_SLOTS = 1024
+TURN_TIMEOUT = 30.0
+PLACEMENT_TIMEOUT = 120.0
+MAX_MISSED_TURNS = 3
+RESUME_GRACE_PERIOD = 30.0
+RESUME_TOKEN_BYTES = 16
+CLIENT_ID_PATTERN = r'[A-Za-z0-9_-]{16,64}'
+STATS_ID_LENGTH = 12
+LATENCY_REPORT_FIELDS = ('samples', 'srtt_ms', 'jitter_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms')
+
+ABANDONED_WRITE_BUFFER_BYTES = 256 * 1024
+BYTES_PER_KB = 1024
+TCP_KEEPALIVE_IDLE = 60
+TCP_KEEPALIVE_INTERVAL = 10
+TCP_KEEPALIVE_PROBES = 3
 
 MIN_PORT_NUMBER = 1
 MAX_PORT_NUMBER = 65535
 MIN_COORDINATE = 0
 MAX_COORDINATE = 9
 
+RATE_LIMIT_MESSAGES_PER_SECOND = 20.0
+RATE_LIMIT_BURST = 40
+RATE_LIMIT_MAX_DROPPED = 200
+MAX_CHANNELS_PER_CONNECTION = 1024
+CHANNEL_OPEN_PER_SECOND = 10.0
+CHANNEL_OPEN_BURST = 20
+MAX_CHANNEL_ID = 1 << 16
+ERROR_REPLIES_PER_SECOND = 1.0
+ERROR_REPLY_BURST = 3
+
+BOMB_ATTACK_AREA_SIZE = 2
+AIR_STRIKE_WIDTH = 5
+MAX_BOMB_TARGETS = BOMB_ATTACK_AREA_SIZE * BOMB_ATTACK_AREA_SIZE
+MAX_AIR_STRIKE_TARGETS = AIR_STRIKE_WIDTH
+AVAILABLE_BOMBS = 2
+AVAILABLE_AIR_STRIKES = 1
+
+AI_PLAYER_ID_PREFIX = 'ia-'
+AI_MOVE_DELAY = 0.6
+AI_HIT_WEIGHT = 40
+
 MESSAGE_TYPE_MAX_LENGTH = 50
 ERROR_MESSAGE_MAX_LENGTH = 200
 PLAYER_ID_LENGTH = 8
 
 UUID_SHORT_LENGTH = 8
+ROOM_SEED_BITS = 64
+TRACE_ID_MAX_LENGTH = 32
+
+UVLOOP_ENV_VAR = 'BATTLESHIP_UVLOOP'
+ENV_TRUE_VALUES = ('1', 'true', 'yes', 's', 'si')
 
 LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOGGER_NAME = 'battleship'
+TRACE_LOGGER_NAME = f'{LOGGER_NAME}.trace'
+TRACE_DISABLED_LEVEL = 100
+LOG_RING_BUFFER_SIZE = 2000
+LOG_DUMP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
+LOG_SAMPLE_RATES = {
+    'shot': 10
+}
 
 DEBUG_NETWORK = False
 DEBUG_GAME_STATE = False
@@ -69,9 +151,22 @@ SHOT_RESULTS = {
 
 LOCALHOST_HOST = "localhost"
 CONNECTION_ERROR_MESSAGES = {
-    'SERVER_FULL': "Servidor lleno. Máximo 2 jugadores.",
+    'SERVER_FULL': "Servidor lleno. No hay salas disponibles.",
+    'ROOM_IDLE': 'Sala cerrada por inactividad',
+    'RATE_LIMITED': 'Demasiados mensajes, intenta más despacio',
+    'INVALID_TARGETS': 'Objetivos de ataque inválidos',
+    'FRAME_TOO_LARGE': 'Mensaje demasiado grande',
+    'SERVER_DRAINING': 'El servidor se está reiniciando, vuelve a conectarte en unos segundos',
+    'ADMIN_KICKED': 'Un administrador te desconectó del servidor',
+    'ROOM_CLOSED_BY_ADMIN': 'Un administrador cerró la sala',
+    'INVALID_CHANNEL': 'Canal inválido o ya abierto',
+    'UNKNOWN_CHANNEL': 'Canal inexistente',
+    'AI_UNAVAILABLE': 'La IA no está disponible en este servidor',
+    'AI_ROOM_BUSY': 'Solo se puede jugar contra la IA mientras esperas rival',
+    'LEADERBOARD_UNAVAILABLE': 'El ranking no está disponible en este servidor',
     'NOT_YOUR_TURN': 'No es tu turno',
     'SHIPS_PLACEMENT_ERROR': 'Error colocando barcos',
+    'RESUME_REJECTED': 'No hay una partida para reanudar con ese token',
     'OPPONENT_DISCONNECTED': 'Tu oponente se ha desconectado'
 }
 GAME_MESSAGES = {
@@ -86,7 +181,9 @@ SHIP_ORIENTATION_HORIZONTAL = True
 SHIP_ORIENTATION_VERTICAL = False
 ERROR_MESSAGES_SHIP = {
     'EMPTY_POSITIONS': "Las posiciones no pueden estar vacías",
-    'MISSING_INIT_PARAMS': "Debe proporcionar 'size' o 'positions' para inicializar el barco"
+    'MISSING_INIT_PARAMS': "Debe proporcionar 'size' o 'positions' para inicializar el barco",
+    'INVALID_PLACEMENT': "El barco debe ocupar casillas seguidas en línea recta dentro del tablero",
+    'OVERLAPPING_PLACEMENT': "El barco se superpone con otro ya colocado"
 }
 
 THREAD_DAEMON_MODE = True
@@ -97,6 +194,13 @@ MESSAGE_TYPES = {
     'PLAYERS_READY': 'players_ready',
     'GAME_START': 'game_start',
     'GAME_UPDATE': 'game_update',
+    'GAME_STATE_DELTA': 'game_state_delta',
+    'STATE_REQUEST': 'state_request',
+    'PLAY_VS_AI': 'play_vs_ai',
+    'JOIN': 'join',
+    'CHANNEL_OPEN': 'channel_open',
+    'CHANNEL_CLOSE': 'channel_close',
+    'CHANNEL_CLOSED': 'channel_closed',
     'SHOT_RESULT': 'shot_result',
     'GAME_OVER': 'game_over',
     'PLAYER_DISCONNECT': 'player_disconnect',
@@ -1,22 +1,122 @@
+import argparse
 import asyncio
+import logging
+import signal
+import tempfile
 import sys
 import os
+from typing import Optional
 
 sys.dont_write_bytecode = True
 
 sys.path.append(os.path.join(os.path.dirname(__file__), 'classes'))
 
 from battleship_server import BattleshipServer
+from structured_logging import LoggingPipeline, get_logger, log_event, setup_logging
+from constants import (DEFAULT_HOST_ALL_INTERFACES, DEFAULT_SERVER_PORT, UVLOOP_ENV_VAR, ENV_TRUE_VALUES,
+                       DRAIN_DEADLINE, ADMIN_SOCKET_NAME, STATS_DB_PATH, RESUME_GRACE_PERIOD)
+
+logger = get_logger('main')
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Servidor de Batalla Naval")
+    parser.add_argument('--host', default=DEFAULT_HOST_ALL_INTERFACES)
+    parser.add_argument('--port', type=int, default=DEFAULT_SERVER_PORT)
+    parser.add_argument('--uvloop', action='store_true',
+                        help=f"Usar uvloop como event loop (tambien {UVLOOP_ENV_VAR}=1)")
+    parser.add_argument('--drain-timeout', type=float, default=DRAIN_DEADLINE,
+                        help="Segundos que se esperan a las partidas en curso al recibir SIGTERM")
+    parser.add_argument('--log-level', default='INFO', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'])
+    parser.add_argument('--log-file', default=None,
+                        help="Archivo JSON-lines para los logs (por defecto stderr)")
+    parser.add_argument('--unix-socket', default=None,
+                        help="Además de TCP, aceptar jugadores en este socket Unix (bots en el mismo host)")
+    parser.add_argument('--admin-socket', default=None,
+                        help="Ruta del socket Unix de administración (por defecto en el directorio temporal)")
+    parser.add_argument('--no-admin-socket', action='store_true',
+                        help="No abrir el socket de administración")
+    parser.add_argument('--trace-file', default=None,
+                        help="Archivo JSON-lines donde exportar los spans de las trazas de turno")
+    parser.add_argument('--stats-db', default=STATS_DB_PATH,
+                        help="Base SQLite donde se guardan resultados y estadísticas por jugador")
+    parser.add_argument('--no-stats-db', action='store_true',
+                        help="No guardar resultados de partidas")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Semilla de la que derivan las de cada sala, para repetir una corrida")
+    parser.add_argument('--resume-grace', type=float, default=RESUME_GRACE_PERIOD,
+                        help="Segundos que se guarda el lugar de quien pierde la conexión en partida (0 desactiva)")
+    return parser.parse_args()
+
+def uvloop_requested(args) -> bool:
+    return args.uvloop or os.environ.get(UVLOOP_ENV_VAR, '').lower() in ENV_TRUE_VALUES
+
+def install_event_loop_policy(use_uvloop: bool) -> str:
+    if not use_uvloop:
+        return 'asyncio'
 
-async def main():
-    server = BattleshipServer()
+    try:
+        import uvloop
+    except ImportError:
+        log_event(logger, logging.WARNING, 'uvloop_unavailable')
+        return 'asyncio'
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return 'uvloop'
+
+def admin_socket_path(args) -> Optional[str]:
+    if args.no_admin_socket:
+        return None
+    return args.admin_socket or os.path.join(tempfile.gettempdir(), ADMIN_SOCKET_NAME.format(port=args.port))
+
+def stats_db_path(args) -> Optional[str]:
+    return None if args.no_stats_db else args.stats_db
+
+def install_drain_handler(server: BattleshipServer, drain_timeout: float) -> None:
+    loop = asyncio.get_running_loop()
+    drain = lambda: server.request_drain(drain_timeout)
+
+    try:
+        loop.add_signal_handler(signal.SIGTERM, drain)
+    except (NotImplementedError, AttributeError):
+        signal.signal(signal.SIGTERM, lambda signum, frame: loop.call_soon_threadsafe(drain))
+
+def install_log_dump_handler(pipeline: LoggingPipeline) -> None:
+    if not hasattr(signal, 'SIGUSR1'):
+        return
+
+    loop = asyncio.get_running_loop()
+
+    async def dump() -> None:
+        path = await loop.run_in_executor(None, pipeline.dump_recent)
+        log_event(logger, logging.INFO, 'recent_events_dumped', path=path)
+
+    loop.add_signal_handler(signal.SIGUSR1, lambda: asyncio.create_task(dump()))
+
+async def main(host: str = DEFAULT_HOST_ALL_INTERFACES, port: int = DEFAULT_SERVER_PORT,
+               drain_timeout: float = DRAIN_DEADLINE, pipeline: LoggingPipeline = None,
+               admin_path: Optional[str] = None, unix_path: Optional[str] = None,
+               seed: Optional[int] = None, stats_path: Optional[str] = None,
+               resume_grace: float = RESUME_GRACE_PERIOD):
+    server = BattleshipServer(host, port, admin_socket_path=admin_path, unix_path=unix_path, seed=seed,
+                              stats_path=stats_path, resume_grace=resume_grace)
+    install_drain_handler(server, drain_timeout)
+    if pipeline is not None:
+        install_log_dump_handler(pipeline)
     try:
         await server.start_server()
     except KeyboardInterrupt:
-        print("Servidor detenido por el usuario")
-    except Exception as e:
-        print(f"Error en el servidor: {e}")
+        log_event(logger, logging.INFO, 'server_stopped_by_user')
+    except Exception:
+        logger.exception('server_failed')
         raise
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    args = parse_arguments()
+    pipeline = setup_logging(getattr(logging, args.log_level), args.log_file, trace_path=args.trace_file)
+    try:
+        loop_name = install_event_loop_policy(uvloop_requested(args))
+        log_event(logger, logging.INFO, 'event_loop_selected', event_loop=loop_name)
+        asyncio.run(main(args.host, args.port, args.drain_timeout, pipeline, admin_socket_path(args),
+                         args.unix_socket, args.seed, stats_db_path(args), args.resume_grace))
+    finally:
+        pipeline.stop()
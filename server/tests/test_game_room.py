@@ -0,0 +1,45 @@
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from classes.enums import GameState
+from classes.game_room import GameRoom
+from classes.player import Player
+
+
+class RecordingPlayer(Player):
+    """Jugador sin conexión que guarda lo que le manda la sala."""
+
+    def __init__(self, player_id: str):
+        super().__init__(player_id, writer=None)
+        self.messages = []
+
+    def is_connection_closed(self) -> bool:
+        return False
+
+    async def send_message(self, message_type, data=None) -> bool:
+        self.messages.append((message_type, data))
+        return True
+
+
+def room_in_battle():
+    room = GameRoom(seed=1)
+    shooter, target = RecordingPlayer('a'), RecordingPlayer('b')
+    target.place_ship([(0, 0), (1, 0)])
+    room.players = {shooter.player_id: shooter, target.player_id: target}
+    room.game_state = GameState.BATTLE_PHASE
+    room.current_turn = shooter.player_id
+    return room, shooter
+
+
+def test_repeated_shot_on_hit_cell_counts_once():
+    room, shooter = room_in_battle()
+
+    async def fire_twice():
+        await room.handle_shot('a', {'x': 0, 'y': 0})
+        await room.handle_shot('a', {'x': 0, 'y': 0})
+
+    asyncio.run(fire_twice())
+    assert shooter.shots_fired == 2
+    assert shooter.shots_hit == 1